@@ -0,0 +1,228 @@
+import json
+import math
+import os
+from datetime import datetime
+
+from file_game.cooking_config import Config
+from file_game.cooking_storage import LOG_FILES, Storage
+
+
+def _number(value, default=0):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return default
+    return number if math.isfinite(number) else default
+
+
+def _median(value_counts):
+    """Median of a {value: count} histogram."""
+    total = sum(value_counts.values())
+    if not total:
+        return 0
+    items = sorted((float(value), count) for value, count in value_counts.items())
+    middle = [(total - 1) // 2, total // 2]
+    found = []
+    seen = 0
+    for value, count in items:
+        while len(found) < 2 and middle[len(found)] < seen + count:
+            found.append(value)
+        seen += count
+    return sum(found) / 2
+
+
+def _std(count, total, total_sq):
+    """Sample standard deviation (pandas' default) from running sums."""
+    if count < 2:
+        return float('nan')
+    variance = (total_sq - total * total / count) / (count - 1)
+    return math.sqrt(max(variance, 0))
+
+
+class AggregateCache:
+    """Running totals behind StatsWindow, stored next to the logs.
+
+    Each log's aggregates are saved with a watermark of how far the log has
+    been read (byte offset for CSV files, rowid for SQLite). refresh() only
+    folds in records appended since then; a log that was rewritten is
+    re-aggregated from scratch.
+    """
+    VERSION = 1
+
+    def __init__(self, store=None, file_name=None):
+        self.__store = store or Storage.get_store()
+        self.__file_name = file_name or Config.get_config('AGGREGATE_FILE')
+        self.__state = self.__load()
+
+    def __empty_state(self):
+        return {
+            'version': self.VERSION,
+            'source': self.__store.get_source(),
+            'watermarks': {},
+            'logs': {name: self.__empty(name) for name in LOG_FILES},
+        }
+
+    @staticmethod
+    def __empty(name):
+        if name == 'order_per_session':
+            return {'sessions': 0, 'score_total': 0, 'score_max': None, 'score_counts': {},
+                    'duration_total': 0, 'dish_counts': {}, 'sessions_duration_score': []}
+        if name == 'total_time_per_dish':
+            return {'dishes': {}}  # dish -> {count, total, total_sq, min, max, values}
+        if name == 'ingredient_used':
+            return {'taken': {}}
+        if name == 'keystroke_per_dish':
+            return {'count': 0, 'up': 0, 'down': 0, 'left': 0, 'right': 0,
+                    'total_key': 0, 'total_key_sq': 0, 'min': None, 'max': None, 'values': {}}
+        if name == 'mistake':
+            return {'count': 0, 'types': {}}
+        raise ValueError(f"Unknown log: {name}")
+
+    def __load(self):
+        try:
+            with open(self.__file_name, 'r') as file:
+                state = json.load(file)
+            if state.get('version') == self.VERSION and state.get('source') == self.__store.get_source():
+                return state
+        except (FileNotFoundError, ValueError):
+            pass
+        return self.__empty_state()  # Missing, outdated or built from another store
+
+    def __save(self):
+        temp_name = self.__file_name + ".tmp"
+        try:
+            with open(temp_name, 'w') as file:
+                json.dump(self.__state, file)
+            os.replace(temp_name, self.__file_name)
+        except OSError as e:
+            print(f"Error saving aggregate cache: {e}")
+
+    def refresh(self):
+        """Fold in everything appended to the logs since the last refresh."""
+        changed = False
+        for name in LOG_FILES:
+            watermark = self.__state['watermarks'].get(name)
+            try:
+                records, new_watermark, reset = self.__store.read_new(name, watermark)
+            except Exception as e:
+                print(f"Error reading {name} for aggregates: {e}")
+                continue
+
+            if reset:
+                self.__state['logs'][name] = self.__empty(name)
+            if records:
+                self.__fold(name, self.__state['logs'][name], records)
+            if reset or records or new_watermark != watermark:
+                self.__state['watermarks'][name] = new_watermark
+                changed = True
+
+        if changed:
+            self.__save()
+        return self
+
+    def get(self, name):
+        return self.__state['logs'][name]
+
+    def __fold(self, name, agg, records):
+        if name == 'order_per_session':
+            self.__fold_orders(agg, records)
+        elif name == 'total_time_per_dish':
+            for record in records:
+                dish = agg['dishes'].setdefault(record.get('dish_type'), {
+                    'count': 0, 'total': 0, 'total_sq': 0, 'min': None, 'max': None, 'values': {}})
+                seconds = _number(record.get('preparation_time_seconds'))
+                dish['count'] += 1
+                dish['total'] += seconds
+                dish['total_sq'] += seconds * seconds
+                dish['min'] = seconds if dish['min'] is None else min(dish['min'], seconds)
+                dish['max'] = seconds if dish['max'] is None else max(dish['max'], seconds)
+                key = repr(seconds)
+                dish['values'][key] = dish['values'].get(key, 0) + 1
+        elif name == 'ingredient_used':
+            for record in records:
+                if str(record.get('action', '')).lower() == 'taken':
+                    ingredient = record.get('ingredient')
+                    agg['taken'][ingredient] = agg['taken'].get(ingredient, 0) + int(_number(record.get('quantity')))
+        elif name == 'keystroke_per_dish':
+            for record in records:
+                total_key = int(_number(record.get('total_key')))
+                agg['count'] += 1
+                for key in ('up', 'down', 'left', 'right'):
+                    agg[key] += int(_number(record.get(key)))
+                agg['total_key'] += total_key
+                agg['total_key_sq'] += total_key * total_key
+                agg['min'] = total_key if agg['min'] is None else min(agg['min'], total_key)
+                agg['max'] = total_key if agg['max'] is None else max(agg['max'], total_key)
+                agg['values'][str(total_key)] = agg['values'].get(str(total_key), 0) + 1
+        elif name == 'mistake':
+            for record in records:
+                mistake_type = record.get('mistake_type')
+                agg['count'] += 1
+                agg['types'][mistake_type] = agg['types'].get(mistake_type, 0) + 1
+
+    @staticmethod
+    def __fold_orders(agg, records):
+        summary = ('session_start', 'session_end', 'total_score')
+        for record in records:
+            score = int(_number(record.get('total_score')))
+            agg['sessions'] += 1
+            agg['score_total'] += score
+            agg['score_max'] = score if agg['score_max'] is None else max(agg['score_max'], score)
+            agg['score_counts'][str(score)] = agg['score_counts'].get(str(score), 0) + 1
+
+            try:
+                start = datetime.fromisoformat(str(record.get('session_start')))
+                end = datetime.fromisoformat(str(record.get('session_end')))
+                duration = (end - start).total_seconds()
+            except ValueError:
+                duration = 0
+            agg['duration_total'] += duration
+            agg['sessions_duration_score'].append([duration, score])
+
+            for dish, quantity in record.items():
+                if dish not in summary:
+                    agg['dish_counts'][dish] = agg['dish_counts'].get(dish, 0) + int(_number(quantity))
+
+    # Derived statistics, matching what the StatsWindow used to compute with pandas
+
+    def get_overview(self, dishes=None):
+        """Headline numbers; total_orders only counts the given dishes if a list is passed."""
+        orders = self.get('order_per_session')
+        sessions = orders['sessions']
+        dish_counts = orders['dish_counts']
+        return {
+            'total_sessions': sessions,
+            'total_orders': sum(count for dish, count in dish_counts.items() if dishes is None or dish in dishes),
+            'max_score': orders['score_max'] if orders['score_max'] is not None else 0,
+            'avg_score': orders['score_total'] / sessions if sessions else 0,
+            'total_mistakes': self.get('mistake')['count'],
+            'total_keystrokes': self.get('keystroke_per_dish')['total_key'],
+            'total_time': orders['duration_total'],
+            'avg_time': orders['duration_total'] / sessions if sessions else 0,
+        }
+
+    def get_keystroke_stats(self):
+        keys = self.get('keystroke_per_dish')
+        return {
+            'mean': keys['total_key'] / keys['count'] if keys['count'] else float('nan'),
+            'median': _median(keys['values']) if keys['count'] else float('nan'),
+            'std': _std(keys['count'], keys['total_key'], keys['total_key_sq']),
+            'min': keys['min'],
+            'max': keys['max'],
+            'total': keys['total_key'],
+        }
+
+    def get_prep_time_stats(self):
+        """[(dish, count, mean, median, min, max, std)] sorted by dish, like a pandas groupby."""
+        rows = []
+        for dish_type, dish in sorted(self.get('total_time_per_dish')['dishes'].items()):
+            rows.append((dish_type, dish['count'], dish['total'] / dish['count'], _median(dish['values']),
+                         dish['min'], dish['max'], _std(dish['count'], dish['total'], dish['total_sq'])))
+        return rows
+
+    def get_prep_time_values(self, dish_type):
+        """Every preparation time recorded for a dish, for plots that need the distribution."""
+        values = []
+        for value, count in self.get('total_time_per_dish')['dishes'].get(dish_type, {}).get('values', {}).items():
+            values.extend([float(value)] * count)
+        return values
@@ -1,39 +1,76 @@
 from file_game.cooking_chef import Chef
-from file_game.cooking_zombie import Zombie
+from file_game.cooking_zombie import ZombieHorde
 from file_game.cooking_served import Serving
 from file_game.cooking_ui import *
 from file_game.cooking_tool import *
 from file_game.cooking_groceries import Groceries
-from file_game.cooking_stat import StatsWindow
+from file_game.cooking_render import DirtyRectRenderer
+from file_game.cooking_clock import GameClock, VirtualClock
+from file_game.cooking_startup import StartupTimer
+from file_game.cooking_telemetry import Telemetry
+from file_game.cooking_session import SessionSequence
+from file_game.cooking_scheduler import CookingScheduler
+from file_game.cooking_station import StationLayout
+from file_game.cooking_spatial import SpatialGrid
+from file_game.cooking_flowfield import FlowField
+from file_game.cooking_ingredients import Ingredients
+import os
+import subprocess
+import sys
+
+# The statistics viewer (tkinter, matplotlib, pandas, seaborn) runs in its own process, see open_stats()
+STATS_MODULE = 'file_game.cooking_stat'
+
+# Grid kinds the chef can interact with by pressing Enter
+TOOL_KINDS = tuple(StationLayout.STATION_TYPES) + ('pad', 'fridge', 'red button', 'paper bag')
 
 
 class GameApp:
-    def __init__(self):
+    def __init__(self, headless=False, clock=None):
+        """Create the game.
+
+        headless runs against SDL's dummy video and audio drivers without loading
+        assets, for simulate(). clock is any object with get_ticks(); headless
+        mode defaults to a VirtualClock so simulation is not tied to wall time.
+        """
+        self.__headless = headless
+        if headless:
+            os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+            os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+            if clock is None:
+                clock = VirtualClock()
+        self.__time_source = clock
+        if clock is not None:
+            GameClock.set_source(clock)
+
         pg.init()
         pg.display.set_caption('Apocalypse Cooker')
         self.__screen = pg.display.set_mode((Config.get_config('WIN_SIZE_W'), Config.get_config('WIN_SIZE_H')))
+        Config.convert_assets()  # Images cached before the display existed get the fast blit format
+        if not headless:
+            with StartupTimer.measure('Config.preload()'):
+                Config.preload(progress=lambda done, total: GameUI.draw_loading(self.__screen, done, total))
+        Ingredients.clear_kinds()  # Kinds pick up the converted, preloaded sprites on first use
         self.__kitchen_map = KitchenMap(self.__screen)
 
         self.__chef = Chef()
 
-        self.__zombie1 = Zombie()
+        self.__zombies = ZombieHorde()  # Config 'ZOMBIE_COUNT' zombies
 
         self.__fridge = Fridge(190, 30, self.__chef)
-        self.__pan = Pan(500, 38)
-        self.__plate = Plate(600, 50)
-        self.__cutting_board = CuttingBoard(700, 50)
-        self.__trash = TrashBin(270, 70)
+        self.__stations = StationLayout()  # Pans, boards, plates and bins from Config 'STATION_LAYOUT_FILE'
 
         self.__chef.set_screen(self.__screen)
-        self.__zombie1.set_screen(self.__screen)
+        self.__zombies.set_screen(self.__screen)
 
         self.__held_ingredient = None
         self.__held_plate = None
         self.__held_bag = None
         self.__plate_pick = False
 
-        self.__dropped_ingredient = []
-        self.__dropped_plate = []
+        # Insertion-ordered sets, so a picked up item is removed in O(1)
+        self.__dropped_ingredient = {}
+        self.__dropped_plate = {}
 
         self.__clock = pg.time.Clock()
         self.__game_ui = GameUI()
@@ -45,8 +82,36 @@ class GameApp:
         self.__serving = Serving(945, 150, self.__screen, self.__menu)
         self.__groceries = Groceries(self.__screen)
 
+        # Spatial index of everything with a position, for the proximity checks
+        self.__grid = SpatialGrid()
+        self.__register_fixtures()
+
+        # Paths for the zombies around the counters, stove, fridge and stations
+        self.__flow_field = None
+        if Config.get_config('ZOMBIE_PATHFINDING'):
+            obstacles = self.__kitchen_map.get_obstacle_rects() + self.__stations.get_rects()
+            self.__flow_field = FlowField(obstacles + [self.__fridge.get_rect()])
+
         self.__final_score = 0
 
+        # Optional renderer that only pushes changed areas to the display
+        use_dirty_rects = Config.get_config('DIRTY_RECTS') and not headless
+        self.__renderer = DirtyRectRenderer(self.__screen) if use_dirty_rects else None
+
+        # Fraction of a simulation step that has elapsed since the last update(), used to smooth rendering
+        self.__interpolation = 1.0
+
+        self.__stats_process = None
+        self.__first_frame_drawn = False
+
+    def open_stats(self):
+        """Launch the statistics viewer as a separate process so its Tk loop never blocks the game."""
+        if self.__stats_process is not None and self.__stats_process.poll() is None:
+            return  # Already open
+        Telemetry.flush()  # The viewer reads the logs from the store, make sure it sees everything so far
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.__stats_process = subprocess.Popen([sys.executable, '-m', STATS_MODULE], cwd=project_root)
+
     def handle_events(self):
         """Handle user input"""
         for event in pg.event.get():
@@ -83,42 +148,43 @@ class GameApp:
 
                 elif event.key == pg.K_RETURN:
                     # If chef gets attack, drop the ingredient
-                    tool = self.is_near_tool()
+                    tool, station = self.is_near_tool()
 
                     # First try to pick up dropped items if not holding anything
                     if self.__held_ingredient is None and self.__held_plate is None:
                         # Try to pick up dropped plate first (since it might contain ingredients)
-                        for plate in self.__dropped_plate[:]:
-                            if self.is_near_dropped_item(plate.get_position()):
-                                self.__held_plate = plate
-                                self.__dropped_plate.remove(plate)
-                                break
+                        plate = self.get_nearest_dropped_item('dropped plate')
+                        if plate is not None:
+                            self.__held_plate = plate
+                            del self.__dropped_plate[plate]
+                            self.__grid.remove(plate)
 
                         # If no plate was picked up, try to pick up ingredient
                         if self.__held_plate is None:
-                            for ingredient in self.__dropped_ingredient[:]:
-                                if self.is_near_dropped_item(ingredient.get_position()):
-                                    self.__held_ingredient = ingredient
-                                    self.__dropped_ingredient.remove(ingredient)
-                                    break
+                            ingredient = self.get_nearest_dropped_item('dropped ingredient')
+                            if ingredient is not None:
+                                self.__held_ingredient = ingredient
+                                del self.__dropped_ingredient[ingredient]
+                                self.__grid.remove(ingredient)
 
                     # Handle held ingredient
                     if self.__held_ingredient:
+                        # A full station leaves the ingredient in the chef's hands
                         if tool == 'pan':
-                            self.__pan.put_ingredient_in_pan(self.__held_ingredient)
-                            self.__held_ingredient = None
+                            if station.put_ingredient_in_pan(self.__held_ingredient):
+                                self.__held_ingredient = None
 
-                        elif tool == 'cut':
-                            self.__cutting_board.put_ingredient_in_cutting_board(self.__held_ingredient)
-                            self.__cutting_board.cook_ingredients()
-                            self.__held_ingredient = None
+                        elif tool == 'cutting_board':
+                            if station.put_ingredient_in_cutting_board(self.__held_ingredient):
+                                station.cook_ingredients()
+                                self.__held_ingredient = None
 
                         elif tool == 'plate':
-                            self.__plate.add_ingredient(self.__held_ingredient)
-                            self.__held_ingredient = None
+                            if station.add_ingredient(self.__held_ingredient):
+                                self.__held_ingredient = None
 
                         elif tool == 'trash':
-                            self.__trash.throw_into_bin(self.__held_ingredient)
+                            station.throw_into_bin(self.__held_ingredient)
                             self.__held_ingredient = None
 
                         elif tool == 'pad':
@@ -146,6 +212,7 @@ class GameApp:
                             else:
                                 self.__serving.serve()
                         elif tool == 'trash':
+                            self.__held_plate.clear()
                             self.__held_plate = None
 
                     # Handle held bag
@@ -156,16 +223,13 @@ class GameApp:
 
                     # Handle empty hands (interact with tools)
                     else:
-                        if tool == 'pan' and self.__pan.is_ready_to_pick():
-                            self.__held_ingredient = self.__pan.get_cooked_ingredients()
-
-                        elif tool == 'cut' and self.__cutting_board.is_ready_to_pick():
-                            self.__held_ingredient = self.__cutting_board.get_cooked_ingredients()
+                        if tool in ('pan', 'cutting_board') and station.is_ready_to_pick():
+                            self.__held_ingredient = station.get_cooked_ingredients()
 
                         elif tool == 'plate':
                             if not self.__plate_pick:
                                 self.__plate_pick = True
-                                self.__held_plate = self.__plate.pick_up_plate()
+                                self.__held_plate = station.pick_up_plate()
                             else:
                                 self.__plate_pick = False
 
@@ -188,19 +252,25 @@ class GameApp:
 
     def restart_game(self):
         """Reset game state to restart"""
+        SessionSequence.new_session()  # One id shared by every logger of this session
         GameUI.game_over = False
         self.__chef.reset()
-        self.__zombie1.reset()
+        self.__zombies.reset()
+        Ingredients.release(self.__held_ingredient)
         self.__held_ingredient = None
         self.__menu.reset()
+        for ingredient in self.__dropped_ingredient:
+            self.__grid.remove(ingredient)
+            Ingredients.release(ingredient)
         self.__dropped_ingredient.clear()
         self.__game_ui.reset()
-        self.__plate.clear()
-        self.__pan.clear()
-        self.__cutting_board.clear()
+        self.__stations.clear()
+        CookingScheduler.clear()
         self.__fridge.reset()
         self.__start_game = True
         self.__final_score = 0
+        if self.__renderer:
+            self.__renderer.invalidate()  # The start or game over screen covered everything
 
     def drop_food_to_the_world(self):
         """Drop the held ingredient"""
@@ -210,7 +280,8 @@ class GameApp:
             # Store the absolute position, not relative to chef
             dropped_food.set_position((chef_x, chef_y))
 
-            self.__dropped_ingredient.append(dropped_food)
+            self.__dropped_ingredient[dropped_food] = None
+            self.__grid.insert(dropped_food, 'dropped ingredient', chef_x, chef_y)
             self.__held_ingredient = None
 
     def drop_all_to_the_world(self):
@@ -220,74 +291,68 @@ class GameApp:
             # Store the absolute position, not relative to chef
             dropped_plate.set_position((chef_x, chef_y))
 
-            self.__dropped_plate.append(dropped_plate)
+            self.__dropped_plate[dropped_plate] = None
+            self.__grid.insert(dropped_plate, 'dropped plate', chef_x, chef_y)
             self.__held_plate = None
 
-    def is_near_dropped_item(self, item_position):
+    def __register_fixtures(self):
+        """File the chef, the stations and the fixed kitchen tools in the grid."""
+        self.__grid.insert(self.__chef, 'chef', *self.__chef.get_rect())
+        for station_type, station in self.__stations.get_layout():
+            self.__grid.insert(station, station_type, *station.get_position())
+        self.__grid.insert(self.__serving, 'pad', *self.__serving.get_position())
+        self.__grid.insert(self.__fridge, 'fridge', *self.__fridge.get_position())
+        self.__grid.insert('red button', 'red button', *self.__groceries.get_red_button_position())
+
+    def __sync_bag(self):
+        """Keep the paper bag's grid entry in step with the groceries, it is only there while on the floor."""
+        position = self.__groceries.get_bag_position() if self.__groceries.has_active_bag() else None
+        if position is None:
+            self.__grid.remove('paper bag')
+        elif self.__grid.contains('paper bag'):
+            self.__grid.move('paper bag', *position)
+        else:
+            self.__grid.insert('paper bag', 'paper bag', *position)
+
+    def get_nearest_dropped_item(self, kind):
+        """The closest 'dropped plate' or 'dropped ingredient' the chef can reach, or None."""
         chef_x, chef_y = self.__chef.get_position()
-        # Increase the pickup radius slightly to make it easier
-        distance = ((chef_x - item_position[0]) ** 2 + (chef_y - item_position[1]) ** 2) ** 0.5
-        return distance < 75
+        # Slightly bigger than the tool radius to make pickups easier
+        item, item_kind, distance = self.__grid.nearest(chef_x, chef_y, 75, (kind,))
+        return item
 
     def is_near_tool(self):
-        tools = {
-            'pan': self.__pan,
-            'cut': self.__cutting_board,
-            'plate': self.__plate,
-            'trash': self.__trash,
-            'pad': self.__serving,
-            'fridge': self.__fridge,
-            'red button': self.__groceries.get_red_button_position(),
-        }
-
-        # Special handling for paper bag if it exists
-        if self.__groceries.has_active_bag() and not self.__groceries.is_bag_carried():
-            tools['paper bag'] = self.__groceries.get_bag_position()
-
+        """Nearest tool within reach as (name, tool), or (None, None). For stations the name
+        is the station type from the layout and tool is that particular station."""
+        self.__sync_bag()
         chef_x, chef_y = self.__chef.get_position()
-
-        # Find nearest tool
-        nearest_tool = None
-        min_distance = float('inf')
-
-        for tool_name, tool in tools.items():
-            if tool is None:
-                continue
-
-            # Handle both tool objects and position tuples
-            if hasattr(tool, 'get_position'):
-                tool_x, tool_y = tool.get_position()
-            else:  # For paper bag position tuple
-                tool_x, tool_y = tool
-
-            distance = ((chef_x - tool_x) ** 2 + (chef_y - tool_y) ** 2) ** 0.5
-
-            if distance < min_distance:
-                min_distance = distance
-                nearest_tool = tool_name
-
-        return nearest_tool if min_distance <= 100 else None
+        tool, kind, distance = self.__grid.nearest(chef_x, chef_y, 100, TOOL_KINDS)
+        return (kind, tool) if tool is not None else (None, None)
 
     def update(self):
         """Update game logic"""
 
         self.__chef.move()
-        self.__zombie1.chase_player(self.__chef)
-        if self.__zombie1.attack(self.__chef):
+        self.__grid.move(self.__chef, *self.__chef.get_position())
+        if self.__flow_field is not None:
+            self.__flow_field.update(*self.__chef.get_rect().center)  # Only searches when the chef changed tile
+        # No grid here: nothing in the game queries the 'zombie' layer, filing it would only cost a sort per step
+        if self.__zombies.step(self.__chef, flow_field=self.__flow_field):
             if self.__held_ingredient:
                 self.drop_food_to_the_world()
             if self.__held_plate:
                 self.drop_all_to_the_world()
 
-        self.__pan.fry_ingredients()
+        CookingScheduler.run_due()  # Finishes whatever is done cooking on any tool
         self.__menu.update()
-        self.__kitchen_map.update()
         self.__serving.update()
+        self.__game_ui.update_time()  # Ends the session on timeout even when nothing is rendered
 
     def render(self):
         """Render game objects"""
 
         if GameUI.game_over:
+            self.__kitchen_map.update()  # Overlay is drawn on the bare kitchen every frame
             self.__final_score = self.__menu.get_score()
             restart_button, exit_button = GameUI.draw_game_over(self.__screen, self.__final_score)
             self.__start_game = False
@@ -296,6 +361,7 @@ class GameApp:
                 if event.type == pg.QUIT:
                     self.__menu.save_to_order_per_session(force_save=True)
                     self.__menu.save_to_time_per_dish()
+                    Telemetry.close()
                     pg.quit()
                     Config.get_sound("click").play()
                     exit()
@@ -311,6 +377,7 @@ class GameApp:
                         self.__menu.save_to_order_per_session(force_save=True)
                         self.__menu.save_to_time_per_dish()
                         self.__chef.save_keystrokes_to_csv()
+                        Telemetry.flush(wait=False)  # Session over, write it out in the background
                         self.restart_game()
                         return
 
@@ -322,12 +389,14 @@ class GameApp:
                         self.__menu.save_to_order_per_session(force_save=True)
                         self.__menu.save_to_time_per_dish()
                         self.__chef.save_keystrokes_to_csv()
+                        Telemetry.close()
                         pg.quit()
                         exit()
             return
 
         elif not self.__start_game:
             start, stat, exit_ = GameUI.draw_start_game(self.__screen)
+            self.__on_frame_drawn()
 
             for event in pg.event.get():
                 if event.type == pg.QUIT:
@@ -350,7 +419,7 @@ class GameApp:
                         # sounds play
                         Config.get_sound("click").play()
 
-                        StatsWindow()
+                        self.open_stats()
 
                     elif exit_.collidepoint(mouse_pos):
                         # sounds play
@@ -360,6 +429,7 @@ class GameApp:
                         self.__menu.save_to_order_per_session(force_save=True)
                         self.__menu.save_to_time_per_dish()
                         self.__chef.save_keystrokes_to_csv()
+                        Telemetry.close()
                         self.__start_game = False
                         GameUI.game_over = False
                         self.__running = False
@@ -367,58 +437,138 @@ class GameApp:
             return
 
         elif self.__start_game:
-            self.__fridge.draw(self.__screen)
-            self.__trash.draw(self.__screen)
-            self.__plate.draw(self.__screen)
-            self.__pan.draw(self.__screen)
-            self.__cutting_board.draw(self.__screen)
+            if self.__renderer:
+                self.__renderer.begin_frame(self.__kitchen_map.get_background())
+            else:
+                self.__kitchen_map.update()
 
-            self.__serving.draw_pad()
+            # Every draw call reports the rects it touched for the dirty-rect renderer
+            drawn = [self.__fridge.draw(self.__screen)]
+            drawn += self.__stations.draw(self.__screen)
+            drawn += [
+                self.__serving.draw_pad(),
 
-            self.__chef.draw()
-            self.__zombie1.draw()
+                self.__chef.draw(self.__interpolation),
+                self.__zombies.draw(self.__interpolation),
 
-            self.__groceries.draw_red_button()
-            self.__groceries.draw_bag()
+                self.__groceries.draw_red_button(),
+                self.__groceries.draw_bag(),
+            ]
 
             if self.__held_ingredient:
-                x, y = self.__chef.get_position()
-                self.__screen.blit(self.__held_ingredient.images, (x, y + 25))
+                x, y = self.__chef.get_interpolated_position(self.__interpolation)
+                drawn.append(self.__screen.blit(self.__held_ingredient.images, (x, y + 25)))
 
             for ingredient in self.__dropped_ingredient:
                 x, y = ingredient.get_position()
-                ingredient.draw_at(self.__screen, x + 10, y)
+                drawn.append(ingredient.draw_at(self.__screen, x + 10, y))
 
             for plate in self.__dropped_plate:
                 x, y = plate.get_position()
-                plate.draw_at(self.__screen, x + 10, y)
+                drawn.append(plate.draw_at(self.__screen, x + 10, y))
 
             if self.__held_plate:
-                x, y = self.__chef.get_position()
+                x, y = self.__chef.get_interpolated_position(self.__interpolation)
                 self.__held_plate.set_position((x + 10, y))
-                self.__held_plate.draw(self.__screen)
+                drawn.append(self.__held_plate.draw(self.__screen))
 
             if self.__held_bag:
-                x, y = self.__chef.get_position()
-                self.__screen.blit(self.__groceries.get_bag_image(), (x + 10, y))
+                x, y = self.__chef.get_interpolated_position(self.__interpolation)
+                drawn.append(self.__screen.blit(self.__groceries.get_bag_image(), (x + 10, y)))
+
+            drawn.append(self.__menu.draw(self.__screen))
+            drawn.append(self.__menu.draw_score(self.__screen))
+            drawn.append(self.__game_ui.draw_timer(self.__screen))
+            drawn.append(self.__serving.draw_feedback())
 
-            self.__menu.draw(self.__screen)
-            self.__menu.draw_score(self.__screen)
-            self.__game_ui.draw_timer(self.__screen)
-            self.__serving.draw_feedback()
+            if self.__renderer:
+                self.__renderer.add(drawn)
+                self.__renderer.end_frame()
+            else:
+                pg.display.flip()
+
+    def simulate(self, step_ms=None, max_steps=None, policy=None):
+        """Play one session without rendering, as fast as the CPU allows.
+
+        Each step runs policy(app, step), handles queued input events and calls
+        update(), then advances the virtual clock by step_ms. Returns a summary
+        of the finished session.
+        """
+        if not isinstance(self.__time_source, VirtualClock):
+            raise RuntimeError("simulate() needs a VirtualClock, create GameApp(headless=True)")
+
+        step_ms = step_ms or 1000 // Config.get_config('FPS')
+        self.restart_game()
+
+        steps = 0
+        while not GameUI.game_over and (max_steps is None or steps < max_steps):
+            if policy:
+                policy(self, steps)
+            self.handle_events()
+            self.update()
+            self.__time_source.advance(step_ms)
+            steps += 1
+
+        return {
+            'score': self.__menu.get_score(),
+            'steps': steps,
+            'duration_ms': steps * step_ms,
+            'timed_out': self.__game_ui.update_time() == 0,
+        }
 
-            pg.display.flip()
+    def __on_frame_drawn(self):
+        """Print the startup report once, when the first frame reaches the screen."""
+        if self.__first_frame_drawn:
+            return
+        self.__first_frame_drawn = True
+        if Config.get_config('STARTUP_REPORT'):
+            print(StartupTimer.report())
 
     def run(self):
+        """Main loop: fixed-rate simulation steps, rendering as often as the frame rate allows.
+
+        Game time comes from a VirtualClock advanced by exactly one step per
+        update(), so movement and cooking timers stay in sync whatever the
+        render rate. When frames are too slow, at most MAX_CATCH_UP_STEPS are
+        run per frame and the remaining backlog is dropped, so the game slows
+        down instead of spiralling.
+        """
+        step_ms = 1000 / Config.get_config('TICK_RATE')
+        max_catch_up_steps = Config.get_config('MAX_CATCH_UP_STEPS')
+
+        if not isinstance(self.__time_source, VirtualClock):
+            self.__time_source = VirtualClock(GameClock.get_ticks())
+            GameClock.set_source(self.__time_source)
+
+        accumulator = 0.0
+        self.__clock.tick()
         while self.__running:
-            if not self.__start_game and not GameUI.game_over:
-                self.render()
-            else:
+            frame_ms = self.__clock.tick(Config.get_config('FPS'))
+
+            # The start and game over screens read their button clicks from the event queue in render(),
+            # so handle_events() must not drain it and nothing is simulated behind them
+            if GameUI.game_over or not self.__start_game:
+                accumulator = 0.0
                 self.render()
-                self.handle_events()
+                continue
+
+            accumulator += frame_ms
+            self.handle_events()
+
+            steps = 0
+            while accumulator >= step_ms and steps < max_catch_up_steps:
                 self.update()
-            self.__clock.tick(Config.get_config('FPS'))
+                self.__time_source.advance(step_ms)
+                accumulator -= step_ms
+                steps += 1
+
+            if accumulator >= step_ms:
+                accumulator %= step_ms  # Drop the backlog we could not catch up on
+
+            self.__interpolation = accumulator / step_ms
+            self.render()
 
+        Telemetry.close()
         pg.quit()
 
 
@@ -0,0 +1,212 @@
+import argparse
+import math
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pygame as pg
+
+from file_game.cooking_chef import Chef
+from file_game.cooking_config import Config
+from file_game.cooking_ingredients import Ingredients
+from file_game.cooking_served import Serving
+from file_game.cooking_spatial import SpatialGrid
+from file_game.cooking_tool import CookingSlot, Pan, Plate
+from file_game.cooking_zombie import Zombie, ZombieHorde
+
+# Micro-benchmarks for the game's hot paths. They run without a display:
+#   python -m file_game.cooking_bench spatial --items 5000 --zombies 500
+#   python -m file_game.cooking_bench memory --counts 10000 100000
+
+
+def _timed(function, repeat):
+    """Average milliseconds per call of function() over repeat calls."""
+    start = time.perf_counter()
+    for i in range(repeat):
+        function(i)
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def bench_spatial(items=5000, zombies=500, queries=2000, seed=0):
+    """Proximity queries with a linear scan (the old GameApp code) against SpatialGrid."""
+    rng = np.random.default_rng(seed)
+    width, height = Config.get_config('WIN_SIZE_W'), Config.get_config('WIN_SIZE_H')
+    zombie_width, zombie_height = Config.get_config('ZOMBIE_SIZE')
+
+    dropped = [(object(), (float(x), float(y))) for x, y in rng.uniform(0, (width, height), (items, 2))]
+    zombie_positions = rng.uniform(-50, (width + 50, height + 50), (zombies, 2))
+    chefs = [(float(x), float(y)) for x, y in rng.uniform(0, (width, height), (queries, 2))]
+    chef_width, chef_height = Config.get_config('CHARACTER_SIZE') // 2, Config.get_config('CHARACTER_SIZE')
+
+    results = []
+
+    # Nearest dropped item within 75 px. The old loop stopped at the first item in range,
+    # so it is only as slow as a full scan when the chef is not near anything.
+    def scan_dropped(i):
+        chef_x, chef_y = chefs[i]
+        best, best_distance = None, 75
+        for item, (x, y) in dropped:
+            distance = ((chef_x - x) ** 2 + (chef_y - y) ** 2) ** 0.5
+            if distance < best_distance:
+                best, best_distance = item, distance
+        return best
+
+    grid = SpatialGrid()
+    start = time.perf_counter()
+    for item, (x, y) in dropped:
+        grid.insert(item, 'dropped ingredient', x, y)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    def grid_dropped(i):
+        return grid.nearest(chefs[i][0], chefs[i][1], 75, ('dropped ingredient',))
+
+    results.append((f"nearest of {items} dropped items", _timed(scan_dropped, queries),
+                    _timed(grid_dropped, queries), f"built in {build_ms:.1f} ms"))
+
+    # Zombies touching a rect, the old per-zombie colliderect loop against the grid layer.
+    # For the single chef rect ZombieHorde.step uses one vectorized test over the horde instead,
+    # which beats both; the layer pays off for queries about other things (dropped items here).
+    zombie_rects = [pg.Rect(int(x), int(y), zombie_width, zombie_height) for x, y in zombie_positions]
+
+    def scan_zombies(i):
+        chef_rect = pg.Rect(int(chefs[i][0]), int(chefs[i][1]), chef_width, chef_height)
+        return [rect for rect in zombie_rects if rect.colliderect(chef_rect)]
+
+    start = time.perf_counter()
+    grid.set_layer('zombie', zombie_positions, zombie_width, zombie_height)
+    layer_ms = (time.perf_counter() - start) * 1000
+
+    def grid_zombies(i):
+        return grid.query_rect((chefs[i][0], chefs[i][1], chef_width, chef_height), ('zombie',))
+
+    results.append((f"{zombies} zombies in a rect", _timed(scan_zombies, queries),
+                    _timed(grid_zombies, queries), f"set_layer {layer_ms:.3f} ms per step"))
+
+    # Zombies near each dropped item: the all-pairs check the grid is for
+    sample = dropped[:min(items, 200)]
+
+    def scan_pairs(i):
+        x, y = sample[i % len(sample)][1]
+        distance = np.hypot(zombie_positions[:, 0] - x, zombie_positions[:, 1] - y)
+        return int(np.argmin(distance)) if distance.min() <= 75 else None
+
+    def grid_pairs(i):
+        x, y = sample[i % len(sample)][1]
+        return grid.nearest(x, y, 75, ('zombie',))
+
+    results.append((f"zombie nearest to an item", _timed(scan_pairs, queries),
+                    _timed(grid_pairs, queries), "scan is vectorized NumPy"))
+
+    # Moving every dropped item a little, as if they were all being pushed around
+    def grid_moves(i):
+        item, (x, y) = dropped[i % items]
+        grid.move(item, x + math.sin(i), y + math.cos(i))
+
+    results.append((f"move one of {items} items", float('nan'), _timed(grid_moves, queries), ""))
+    return results
+
+
+def _allocated(build, count):
+    """Bytes per item allocated by build(i) for count items, kept alive until measured."""
+    items = [None] * count  # Allocated up front so the holding list is not counted
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    for i in range(count):
+        items[i] = build(i)
+    used = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    return used / count, items
+
+
+def _slot_names(cls):
+    """Attribute names behind every __slots__ entry of cls and its bases, mangled where needed."""
+    names = []
+    for owner in reversed(cls.__mro__):
+        for name in owner.__dict__.get('__slots__', ()):
+            if name.startswith('__') and not name.endswith('__'):
+                name = f"_{owner.__name__.lstrip('_')}{name}"
+            names.append(name)
+    return names
+
+
+def _dict_layout_bytes(instances):
+    """Bytes per instance of the same objects laid out the old way, with a per-instance __dict__.
+
+    Each instance gets a twin of a plain class with the same attributes, set in the
+    same order so the twins share dict keys the way instances of the old class did.
+    The attribute values are shared, so this only measures the object and its dict.
+    """
+    cls = type(instances[0])
+    twin_class = type(cls.__name__ + 'Dict', (), {})
+    names = [name for name in _slot_names(cls) if hasattr(instances[0], name)]
+
+    def twin(i):
+        copy = twin_class()
+        for name in names:
+            setattr(copy, name, getattr(instances[i], name))
+        return copy
+
+    return _allocated(twin, len(instances))[0]
+
+
+def bench_memory(counts=(10000, 100000)):
+    """Bytes per entity with the old __dict__ layout against the __slots__ classes."""
+    ingredient = Ingredients(0, 0, 'egg')
+    entities = [
+        ('Ingredients', lambda i: Ingredients(i, i, 'egg')),
+        ('Plate', lambda i: Plate(i, i)),
+        ('Pan', lambda i: Pan(i, i)),
+        ('Chef', lambda i: Chef()),
+        ('Zombie', lambda i: Zombie()),
+        ('Serving', lambda i: Serving(i, i, None, None)),
+    ]
+
+    results = []
+    for count in counts:
+        for name, build in entities:
+            after, instances = _allocated(build, count)
+            # The owned values (tuples, lists, rects) are the same in both layouts
+            before = after - sys.getsizeof(instances[0]) + _dict_layout_bytes(instances)
+            results.append((name, count, before, after))
+            del instances
+
+        # Items cooking on a tool: the old 4-element list against a CookingSlot
+        before = _allocated(lambda i: [ingredient, i, None, None], count)[0]
+        after = _allocated(lambda i: CookingSlot(ingredient, i), count)[0]
+        results.append(('cooking item', count, before, after))
+
+        # A Zombie object per zombie against one row of the ZombieHorde arrays
+        before = _allocated(lambda i: Zombie(), count)[0]
+        after = ZombieHorde(count).get_nbytes() / count
+        results.append(('Zombie -> ZombieHorde row', count, before, after))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks for the game's hot paths.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    spatial = commands.add_parser('spatial', help="proximity queries: linear scan against SpatialGrid")
+    spatial.add_argument('--items', type=int, default=5000, help="dropped items on the floor")
+    spatial.add_argument('--zombies', type=int, default=500)
+    spatial.add_argument('--queries', type=int, default=2000)
+    spatial.add_argument('--seed', type=int, default=0)
+    memory = commands.add_parser('memory', help="bytes per entity: __dict__ layout against __slots__")
+    memory.add_argument('--counts', type=int, nargs='+', default=[10000, 100000])
+    args = parser.parse_args()
+
+    if args.command == 'spatial':
+        results = bench_spatial(args.items, args.zombies, args.queries, args.seed)
+        print(f"{'query':<36}{'scan ms':>10}{'grid ms':>10}{'speedup':>9}")
+        for name, scan_ms, grid_ms, note in results:
+            speedup = scan_ms / grid_ms if grid_ms and not math.isnan(scan_ms) else float('nan')
+            print(f"{name:<36}{scan_ms:>10.4f}{grid_ms:>10.4f}{speedup:>8.1f}x  {note}")
+
+    elif args.command == 'memory':
+        print(f"{'entity':<28}{'count':>8}{'before B':>10}{'after B':>10}{'saved':>8}")
+        for name, count, before, after in bench_memory(args.counts):
+            print(f"{name:<28}{count:>8}{before:>10.0f}{after:>10.0f}{1 - after / before:>8.0%}")
+
+
+if __name__ == '__main__':
+    main()
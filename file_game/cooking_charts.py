@@ -0,0 +1,202 @@
+from matplotlib.artist import setp
+from matplotlib.figure import Figure
+from matplotlib.ticker import NullFormatter
+import numpy as np
+import pandas as pd
+import seaborn as sns
+
+# Figures for the stats screens. They are built with the object-oriented Figure API rather than
+# pyplot, so they can be made off the Tk thread and by the offline report with any backend.
+
+DISH_COLUMNS = ['sandwich', 'egg fried', 'chicken fried', 'lamb fried', 'chicken drumstick fried']
+
+
+def overview_figure(orders, mistakes, keystrokes):
+    """Summary charts from the order, mistake and keystroke aggregates of an AggregateCache."""
+    fig = Figure(figsize=(10, 8))
+    gs = fig.add_gridspec(2, 2)
+
+    # Score distribution (if available)
+    ax1 = fig.add_subplot(gs[0, 0])
+    if orders['score_counts']:
+        scores = [int(score) for score in orders['score_counts']]
+        ax1.hist(scores, bins=10, weights=list(orders['score_counts'].values()),
+                 color='skyblue', edgecolor='black')
+        ax1.set_title('Score Distribution per Session')
+        ax1.set_xlabel('Score')
+        ax1.set_ylabel('Frequency')
+    else:
+        ax1.text(0.5, 0.5, 'No score data available', ha='center', va='center')
+        ax1.set_axis_off()
+
+    # Time vs Score (if available)
+    ax2 = fig.add_subplot(gs[0, 1])
+    if orders['sessions_duration_score']:
+        durations, scores = zip(*orders['sessions_duration_score'])
+        ax2.scatter(durations, scores, alpha=0.6)
+        ax2.set_title('Session Duration vs Score')
+        ax2.set_xlabel('Duration (seconds)')
+        ax2.set_ylabel('Score')
+    else:
+        ax2.text(0.5, 0.5, 'No duration/score data', ha='center', va='center')
+        ax2.set_axis_off()
+
+    # Mistake types (if available)
+    ax3 = fig.add_subplot(gs[1, 0])
+    if mistakes['types']:
+        mistake_counts = pd.Series(mistakes['types']).sort_values(ascending=False)
+        ax3.bar(mistake_counts.index, mistake_counts.values, color='salmon')
+        ax3.set_title('Mistake Types')
+        ax3.tick_params(axis='x', rotation=45)
+    else:
+        ax3.text(0.5, 0.5, 'No mistake data', ha='center', va='center')
+        ax3.set_axis_off()
+
+    # Keystroke distribution (if available)
+    ax4 = fig.add_subplot(gs[1, 1])
+    if keystrokes['count']:
+        keystroke_totals = pd.Series({col: keystrokes[col] for col in ['up', 'down', 'left', 'right']})
+        ax4.pie(keystroke_totals, labels=keystroke_totals.index, autopct='%1.1f%%')
+        ax4.set_title('Keystroke Distribution')
+    else:
+        ax4.text(0.5, 0.5, 'No keystroke data', ha='center', va='center')
+        ax4.set_axis_off()
+
+    fig.tight_layout(pad=3.0)
+    return fig
+
+
+def keystroke_figure(df, key_stats):
+    x = range(1, len(df) + 1)
+
+    # Create figure with custom grid layout
+    fig = Figure(figsize=(10, 8), dpi=100)
+    gs = fig.add_gridspec(2, 2, width_ratios=[3, 1], height_ratios=[1, 1])
+
+    # Top-left: Total keystrokes trend
+    ax1 = fig.add_subplot(gs[0, 0])
+    ax1.plot(x, df['total_key'], marker='o', color='steelblue', linewidth=2)
+    ax1.set_ylabel('Total Keystrokes')
+    ax1.set_title('Total Keystrokes Trend')
+    ax1.set_xticks(x)
+    ax1.set_xticklabels(df['id'].astype(str), rotation=90)
+    ax1.xaxis.set_major_formatter(NullFormatter())
+    ax1.grid(True, linestyle='--', alpha=0.6)
+
+    # Top-right: Statistics table
+    ax2 = fig.add_subplot(gs[0, 1])
+    ax2.axis('off')  # Hide axes for table
+
+    stats_data = [
+        ["Mean", f"{key_stats['mean']:.2f}"],
+        ["Median", f"{key_stats['median']:.2f}"],
+        ["Std Dev", f"{key_stats['std']:.2f}"],
+        ["Min", f"{key_stats['min']}"],
+        ["Max", f"{key_stats['max']}"],
+        ["Total", f"{key_stats['total']}"]
+    ]
+
+    table = ax2.table(
+        cellText=stats_data,
+        colLabels=["Statistic", "Value"],
+        loc='center',
+        cellLoc='center',
+        colWidths=[0.4, 0.4]
+    )
+    table.auto_set_font_size(False)
+    table.set_fontsize(10)
+    table.scale(1, 1.5)
+
+    # Bottom: Individual key trends (full width)
+    ax3 = fig.add_subplot(gs[1, :])
+    ax3.plot(x, df['up'], marker='o', label='Up', color='skyblue')
+    ax3.plot(x, df['down'], marker='o', label='Down', color='salmon')
+    ax3.plot(x, df['left'], marker='o', label='Left', color='lightgreen')
+    ax3.plot(x, df['right'], marker='o', label='Right', color='orange')
+    ax3.set_xlabel('Dish ID')
+    ax3.set_ylabel('Keystroke Count')
+    ax3.set_title('Keystroke Trends by Direction')
+    ax3.legend()
+    ax3.grid(True, linestyle='--', alpha=0.6)
+
+    fig.tight_layout(pad=3.0)
+    return fig
+
+
+def order_figure(df):
+    """Order value per dish against session duration; df needs a duration_sec column."""
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    markers = ['o', 's', 'D', '^', 'v']
+    colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd']
+
+    for i, dish in enumerate(DISH_COLUMNS):
+        ax.scatter(
+            x=df['duration_sec'],
+            y=df[dish] * df['total_score'],
+            label=dish.title(),
+            marker=markers[i],
+            color=colors[i],
+            s=100,
+            alpha=0.7,
+            edgecolors='w'
+        )
+        z = np.polyfit(df['duration_sec'], df[dish] * df['total_score'], 1)
+        p = np.poly1d(z)
+        ax.plot(df['duration_sec'], p(df['duration_sec']), '--', alpha=0.3)
+
+    ax.set_title('Order Patterns by Session Duration', pad=20)
+    ax.set_xlabel('Session Duration (seconds)')
+    ax.set_ylabel('Order Value (Count × Score)')
+    ax.grid(True, linestyle=':', alpha=0.3)
+    ax.legend(title="Dish Types")
+    return fig
+
+
+def mistake_figure(mistake_counts):
+    fig = Figure(figsize=(8, 5))  # Slightly shorter height
+    ax = fig.subplots()
+    ax.bar(mistake_counts.index, mistake_counts.values, color='salmon', edgecolor='black')
+
+    ax.set_title('Mistakes Made', pad=15)
+    ax.set_xlabel('Mistake Type')
+    ax.set_ylabel('Count')
+
+    # Rotate x-axis labels if they're long
+    if any(len(str(x)) > 10 for x in mistake_counts.index):
+        setp(ax.get_xticklabels(), rotation=45, ha='right')
+    return fig
+
+
+def ingredient_figure(total_taken):
+    fig = Figure(figsize=(6, 6))  # Increased figure size
+    ax = fig.subplots()
+
+    # Define pastel colors using the Pastel1 colormap
+    colors = sns.color_palette("pastel", n_colors=len(total_taken))
+
+    ax.pie(
+        total_taken.values,
+        labels=total_taken.index,
+        autopct='%1.1f%%',
+        startangle=90,
+        textprops={'fontsize': 10},  # Increased font size
+        colors=colors,
+        wedgeprops={'linewidth': 1, 'edgecolor': 'white'}  # Better visual separation
+    )
+    ax.set_title('Ingredients Taken', fontsize=12, pad=20)
+    return fig
+
+
+def prep_time_figure(df):
+    fig = Figure(figsize=(6, 5))
+    ax = fig.subplots()
+    sns.boxplot(data=df, x='dish_type', y='preparation_time_seconds', hue='dish_type', legend=False,
+                ax=ax, palette="husl")
+    ax.set_title('Preparation Time Range by Dish Type')
+    ax.set_xlabel('')
+    ax.set_ylabel('Time (seconds)')
+    setp(ax.get_xticklabels(), rotation=45, ha='right')
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+    return fig
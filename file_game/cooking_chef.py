@@ -1,19 +1,23 @@
 from datetime import datetime
 import time
-import csv
-import os
 import pygame as pg
 from file_game.cooking_config import Config
 from file_game.cooking_ui import GameUI
+from file_game.cooking_telemetry import Telemetry
+from file_game.cooking_session import SessionSequence
 
 
 class Chef:
+    __slots__ = ('__position', '__speed', '__screen', '__max_health', '__chef_health', '__health_bar_width',
+                 '__health_bar_height', '__health_bar_color', '__background_color', '__held_plate', 'movement',
+                 '__key_states', '__key_initial_press', '__chef_sprite_original', '__chef_sprite', '__chef_rect',
+                 '__previous_position', '__facing_left', '__keystrokes', '__last_log_time', '__keystroke_file')
+
     def __init__(self):
         self.__position = (Config.get_config('WIN_SIZE_W') // 2, Config.get_config('WIN_SIZE_H') // 2)  # Center position
         self.__speed = 10
         self.__screen = None
 
-        self.__font = pg.font.Font(None, 24)
         self.__max_health = 100
         self.__chef_health = self.__max_health
         self.__health_bar_width = 130
@@ -37,9 +41,10 @@ class Chef:
             pg.K_d: False
         }
 
-        self.__chef_sprite_original = pg.transform.scale(pg.image.load("images/player.png"), (40, 80))
+        self.__chef_sprite_original = Config.get_asset("images/player.png", (40, 80))
         self.__chef_sprite = self.__chef_sprite_original
         self.__chef_rect = self.__chef_sprite.get_rect(center=self.__position)
+        self.__previous_position = self.__chef_rect.topleft  # Where the last simulation step started
 
         self.__facing_left = False
 
@@ -51,9 +56,12 @@ class Chef:
         }
         self.__last_log_time = time.time()
 
+        self.__keystroke_file = "game_data/keystroke_per_dish.csv"
+
     def reset(self):
         self.__position = (Config.get_config('WIN_SIZE_W') // 2, Config.get_config('WIN_SIZE_H') // 2)
         self.__chef_rect.topleft = self.__position
+        self.__previous_position = self.__chef_rect.topleft
         self.__chef_health = self.__max_health
         self.__chef_sprite = self.__chef_sprite_original
         self.__facing_left = False
@@ -65,13 +73,16 @@ class Chef:
             self.__key_initial_press[key] = False
             self.__keystrokes[key] = 0
 
-    def draw(self):
+    def draw(self, alpha=1.0):
+        """Draw the chef, interpolated by alpha between the last two simulation steps."""
         if self.__screen:
-            self.__screen.blit(self.__chef_sprite, self.__chef_rect.topleft)  # Draw sprite
-            self.draw_health_bar()
+            sprite_rect = self.__screen.blit(self.__chef_sprite, self.get_interpolated_position(alpha))  # Draw sprite
+            return [sprite_rect, self.draw_health_bar()]
 
     def move(self):
         """Update chef's position and sprite orientation"""
+        self.__previous_position = self.__chef_rect.topleft
+
         if self.movement['UP']:
             self.__chef_rect.y -= self.__speed
 
@@ -95,6 +106,11 @@ class Chef:
         """Get the current position of the chef"""
         return self.__position
 
+    def get_interpolated_position(self, alpha):
+        """Position blended between the previous and current simulation step, for rendering."""
+        (prev_x, prev_y), (x, y) = self.__previous_position, self.__chef_rect.topleft
+        return round(prev_x + (x - prev_x) * alpha), round(prev_y + (y - prev_y) * alpha)
+
     def set_screen(self, screen):
         self.__screen = screen
 
@@ -134,11 +150,12 @@ class Chef:
 
     def update_sprite(self, flip=False):
         """Flip sprite when changing direction"""
-        self.__chef_sprite = pg.transform.flip(self.__chef_sprite_original, flip, False)
+        self.__chef_sprite = Config.get_asset("images/player.png", (40, 80), flip_x=flip)
 
     def draw_health_bar(self):
         x, y = 10, 500
-        pg.draw.rect(self.__screen, self.__background_color, (x, y, self.__health_bar_width, self.__health_bar_height))
+        bar_rect = pg.draw.rect(self.__screen, self.__background_color,
+                                (x, y, self.__health_bar_width, self.__health_bar_height))
 
         # Calculate the width of the health bar based on the player's current health
         health_width = (self.__chef_health / self.__max_health) * self.__health_bar_width
@@ -148,8 +165,8 @@ class Chef:
 
         # Draw the filled rectangle representing the player's health
         pg.draw.rect(self.__screen, self.__health_bar_color, (x, y, health_width, self.__health_bar_height))
-        text = self.__font.render(f"Health", True, Config.get_config('BLACK'))
-        self.__screen.blit(text, (x + 140, y - 4))
+        text = Config.render_text("Health", Config.get_config('BLACK'), size=24)
+        return bar_rect.union(self.__screen.blit(text, (x + 140, y - 4)))
 
     def take_damage(self, damage):
         self.__chef_health = max(0, self.__chef_health - damage)
@@ -160,58 +177,31 @@ class Chef:
         return self.__chef_rect
 
     def save_keystrokes_to_csv(self):
-        """Save keystrokes to a CSV file with timestamp and movement data.
+        """Queue the keystrokes of this session for the CSV log.
 
-        Creates a new file if it doesn't exist, or appends to existing file.
-        Logs only when the specified time interval has passed.
+        The row is written by the telemetry thread, so this never touches the disk.
         """
-        filename = "game_data/keystroke_per_dish.csv"
-        try:
-            current = datetime.now()
-            file_exists = os.path.exists(filename)
-
-            # Initialize last_id
-            last_id = 0
-            records = []
-
-            # Read existing records if file exists
-            if file_exists and os.path.getsize(filename) > 0:
-                with open(filename, 'r', newline='') as csvfile:
-                    reader = csv.DictReader(csvfile)
-                    records = list(reader)
-                    ids = [int(record['id']) for record in records if 'id' in record and record['id'].isdigit()]
-                    if records:
-                        last_id = max(int(record.get('id', record.get(' id', '0')).strip()) for record in records)
-
-            # Open file in append mode
-            with open(filename, 'a', newline='') as csvfile:
-                fieldnames = [
-                    'timestamp',
-                    'up',
-                    'down',
-                    'left',
-                    'right',
-                    'total_key',
-                    'id',
-                ]
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-
-                if not file_exists or os.path.getsize(filename) == 0:
-                    writer.writeheader()
-
-                record = {
-                    'id': last_id + 1,
-                    'timestamp': current.strftime("%Y-%m-%d %H:%M:%S"),
-                    'up': self.__keystrokes[pg.K_w],
-                    'down': self.__keystrokes[pg.K_s],
-                    'left': self.__keystrokes[pg.K_a],
-                    'right': self.__keystrokes[pg.K_d],
-                    'total_key': sum(self.__keystrokes.values())
-                }
-
-                self.__last_log_time = current
-                print("Saving KEYSTROKE data:", record)  # Debug print
-                writer.writerow(record)
-
-        except Exception as e:
-            print(f"Unexpected KEYSTROKE error: {e}")
+        current = datetime.now()
+        fieldnames = [
+            'timestamp',
+            'up',
+            'down',
+            'left',
+            'right',
+            'total_key',
+            'id',
+        ]
+
+        record = {
+            'id': SessionSequence.next_value('keystroke'),
+            'timestamp': current.strftime("%Y-%m-%d %H:%M:%S"),
+            'up': self.__keystrokes[pg.K_w],
+            'down': self.__keystrokes[pg.K_s],
+            'left': self.__keystrokes[pg.K_a],
+            'right': self.__keystrokes[pg.K_d],
+            'total_key': sum(self.__keystrokes.values())
+        }
+
+        self.__last_log_time = current
+        print("Saving KEYSTROKE data:", record)  # Debug print
+        Telemetry.log(self.__keystroke_file, fieldnames, record)
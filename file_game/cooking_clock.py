@@ -0,0 +1,36 @@
+import pygame as pg
+
+
+class GameClock:
+    """Single source of game time in milliseconds.
+
+    Defaults to pygame's tick counter. Any object with a get_ticks() method
+    can be installed instead, e.g. a VirtualClock for headless simulation.
+    """
+    __SOURCE = pg.time
+
+    @classmethod
+    def get_ticks(cls):
+        return cls.__SOURCE.get_ticks()
+
+    @classmethod
+    def set_source(cls, source):
+        cls.__SOURCE = source
+
+    @classmethod
+    def reset_source(cls):
+        cls.__SOURCE = pg.time
+
+
+class VirtualClock:
+    """Deterministic clock that only moves when advanced."""
+
+    def __init__(self, start_ms=0):
+        self.__now = start_ms
+
+    def get_ticks(self):
+        return int(self.__now)  # Fractional steps accumulate, callers always see whole milliseconds
+
+    def advance(self, milliseconds):
+        self.__now += milliseconds
+        return self.__now
@@ -0,0 +1,79 @@
+import argparse
+import csv
+import os
+import shutil
+
+
+def find_replayed_rows(rows):
+    """Split mistake rows into kept rows and rows that are replays.
+
+    The old Menu.save_to_mistake() re-appended a Menu's whole mistake list on
+    every new mistake, so the file is a series of blocks, each one being a
+    replay of some Menu's earlier rows followed by one new row. Several Menu
+    instances (the game's and the trash bin's) can interleave their blocks.
+    A block is only treated as a replay when it repeats a previous stream
+    in full, so genuine repeated mistakes elsewhere are kept.
+    """
+    streams_by_first_row = {}  # First row -> streams (lists of rows) starting with it
+    kept = []
+    i = 0
+    while i < len(rows):
+        row = rows[i]
+        replayed = None
+        for stream in reversed(streams_by_first_row.get(row, [])):
+            if rows[i:i + len(stream)] == stream:
+                replayed = stream
+                break
+
+        if replayed is None:
+            # A new stream, its first row is new data
+            streams_by_first_row.setdefault(row, []).append([row])
+            kept.append(row)
+            i += 1
+            continue
+
+        i += len(replayed)
+        if i < len(rows):
+            # The row after the replay is the new mistake of this block
+            replayed.append(rows[i])
+            kept.append(rows[i])
+            i += 1
+
+    return kept
+
+
+def compact_mistake_log(file_name="game_data/mistake.csv", backup=True):
+    """Rewrite the mistake log without replayed rows; returns (rows before, rows after)."""
+    with open(file_name, 'r', newline='') as csv_file:
+        reader = csv.reader(csv_file)
+        header = next(reader, None)
+        rows = [tuple(row) for row in reader if row]
+
+    kept = find_replayed_rows(rows)
+
+    if backup:
+        shutil.copyfile(file_name, file_name + ".bak")
+
+    temp_name = file_name + ".tmp"
+    with open(temp_name, 'w', newline='') as csv_file:
+        writer = csv.writer(csv_file)
+        if header:
+            writer.writerow(header)
+        writer.writerows(kept)
+    os.replace(temp_name, file_name)  # Atomic, a crash never leaves a half-written log
+
+    return len(rows), len(kept)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Remove rows duplicated by the old quadratic mistake logging.")
+    parser.add_argument('file', nargs='?', default="game_data/mistake.csv", help="mistake log to compact")
+    parser.add_argument('--no-backup', action='store_true', help="do not keep a .bak copy of the original")
+    args = parser.parse_args()
+
+    before, after = compact_mistake_log(args.file, backup=not args.no_backup)
+    print(f"{args.file}: {before} rows -> {after} rows ({before - after} duplicates removed)")
+
+
+if __name__ == '__main__':
+    main()
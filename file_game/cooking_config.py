@@ -1,4 +1,26 @@
+import os
 import pygame as pg
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+class SilentSound:
+    """Stand-in for pg.mixer.Sound when a sound is missing or audio was not loaded."""
+
+    def play(self, *args, **kwargs):
+        return None
+
+    def stop(self):
+        pass
+
+    def fadeout(self, time):
+        pass
+
+    def set_volume(self, value):
+        pass
+
+    def get_volume(self):
+        return 0.0
 
 
 class Config:
@@ -9,7 +31,9 @@ class Config:
         'GRID_SIZE_H': 44,
         'GRID_COUNT_W': 64,
         'GRID_COUNT_H': 33,
-        'FPS': 60,
+        'FPS': 60,  # Render rate cap
+        'TICK_RATE': 60,  # Simulation steps per second, independent of the render rate
+        'MAX_CATCH_UP_STEPS': 5,  # Most simulation steps run in one frame before the backlog is dropped
         'BLACK': (0, 0, 0),
         'WHITE': (255, 255, 255),
         'GREEN': (119, 206, 112),
@@ -23,12 +47,120 @@ class Config:
         'BACKGROUND': (249, 234, 211),
         'CHARACTER_SIZE': 100,
 
+        # Startup
+        'STARTUP_REPORT': False,  # Print per-import startup timings after the first frame
+        'PRELOAD_WORKERS': 4,  # Threads used by Config.preload() to decode images and sounds
+        'TEXT_CACHE_SIZE': 256,  # Rendered text surfaces kept by Config.render_text()
+
+        # Telemetry (game_data logs)
+        'TELEMETRY_BUFFER_SIZE': 4096,  # Ring buffer capacity; the oldest records are dropped when full
+        'TELEMETRY_FLUSH_SIZE': 64,  # Wake the writer thread once this many records are waiting
+        'TELEMETRY_FLUSH_SECONDS': 2.0,  # Otherwise write whatever is waiting this often
+
+        'SEQUENCE_FILE': "game_data/sequences.json",  # Persistent session and log id counters
+        'RECIPE_FILE': "game_data/recipes.csv",  # (tool, input) -> output, duration and sounds for Pan/CuttingBoard
+        'STATION_LAYOUT_FILE': "game_data/stations.csv",  # Kitchen stations; game_data/stations_event.csv has 4 pans, 2 boards
+
+        # Storage of the game_data logs: 'csv' (the original files) or 'sqlite'
+        'STORAGE_BACKEND': 'csv',
+        'DATA_DIR': os.path.join(os.path.dirname(__file__), '..', 'game_data'),
+        'SQLITE_FILE': os.path.join(os.path.dirname(__file__), '..', 'game_data', 'cooking.db'),
+        'AGGREGATE_FILE': os.path.join(os.path.dirname(__file__), '..', 'game_data', 'aggregates.json'),  # StatsWindow totals
+
+        # Zombies
+        'ZOMBIE_COUNT': 1,  # Size of the ZombieHorde, raise it for endless night
+        'ZOMBIE_SIZE': (30, 70),
+        'ZOMBIE_SPEED': 2,  # Pixels per simulation step
+        'ZOMBIE_SPAWN_DELAY': 3000,  # ms before the first zombie starts chasing
+        'ZOMBIE_SPAWN_STAGGER': 0,  # Extra ms before each following zombie starts
+        'ZOMBIE_ATTACK_COOLDOWN': 1000,  # ms between two attacks of the same zombie
+        'ZOMBIE_DAMAGE': 10,
+        'ZOMBIE_PATHFINDING': True,  # Walk around the kitchen furniture with a FlowField instead of straight at the chef
+
+        # Rendering
+        'DIRTY_RECTS': False,  # Update only changed screen areas instead of flipping the whole window
+
         "paper bag": "images/paperbag.png",
         "red button": "images/red_button.png",
     }
 
+    # Ingredient type -> sprite path, scaled to the ingredient size by load_images()
+    __INGREDIENT_IMAGES = {
+        "lamb": "images/simply cooked/Raw food/lamb3.png",
+        "lamb fried": "images/simply cooked/Cooked food/lamb1.png",
+
+        "bread": "images/simply cooked/Cooked food/bread1.png",
+        "bread sliced": "images/simply cooked/Cooked food/bread_sliced.png",
+        "leek": "images/FarmVeggies/Leek.png",
+
+        "egg": "images/simply cooked/Raw food/egg3.png",
+        "egg fried": "images/simply cooked/Cooked food/egg1.png",
+
+        "chicken": "images/simply cooked/Raw food/chiken3.png",
+        "chicken fried": "images/simply cooked/Cooked food/chiken1.png",
+
+        "chicken to slice": "images/simply cooked/Raw food/chiken3.png",
+        "chicken sliced": "images/simply cooked/Raw food/drumstick3.png",
+        "chicken rotten": "images/simply cooked/Rotten food/chiken_rotten.png",
+
+        "chicken drumstick fried": "images/simply cooked/Cooked food/drumstick1.png",
+        "chicken drumstick rotten": "images/simply cooked/Rotten food/drumstick_rotten.png",
+
+        "pork": "images/simply cooked/Raw food/pork3.png",
+        "pork fried": "images/simply cooked/Cooked food/pork1.png",
+
+        "fish": "images/simply cooked/Raw food/fish3.png",
+        "fish fried": "images/simply cooked/Cooked food/fish1.png",
+
+        "sandwich": "images/simply cooked/Cooked food/sandwich1.png",
+        "tomato": "images/FarmVeggies/Tomato.png",
+        "tomato sliced": "images/FarmVeggies/Tomatoslice.png",
+
+        "cheese": "images/simply cooked/Cooked food/chees1.png",
+        "cheese sliced": "images/simply cooked/Cooked food/cheese_slice.png",
+
+        "lettuce": "images/FarmVeggies/lettuce.png",
+        "lettuce sliced": "images/FarmVeggies/lettuceslice.png",
+
+    }
+
+    # Sprites drawn through get_asset() that preload() decodes up front
+    __PRELOAD_IMAGES = [
+        "images/Background.png",
+        "images/title.png",
+        "images/start.png",
+        "images/stat.png",
+        "images/exit.png",
+        "images/Decoration/blooddrip.png",
+        "images/countertop.png",
+        "images/stove.png",
+        "images/fridge.png",
+        "images/pan.png",
+        "images/cutting.png",
+        "images/plate.png",
+        "images/trashbin.png",
+        "images/player.png",
+        "images/Zombie_1/Walk_still.png",
+        "images/paperbag.png",
+        "images/red_button.png",
+    ]
+
+    __SOUND_PATHS = {
+        "click": "sounds/click.mp3",
+        "game_start": "sounds/game_start_song.mp3",
+        "trash": "sounds/trash.mp3",
+        "cutting": "sounds/cutting.mp3",
+        "finish_cooking": "sounds/finishcooking.mp3",
+        "served": "sounds/handbell.mp3",
+        "pan_cooking": "sounds/pan.mp3"
+    }
+
     __IMAGE_CACHE = {}
 
+    # Every decoded/transformed surface, keyed by (path, size, rotate, flip_x, flip_y)
+    __ASSET_CACHE = {}
+    __ASSET_STATS = {'hits': 0, 'misses': 0, 'disk_loads': 0}
+
     @classmethod
     def get_config(cls, key, default=None):
         return cls.__ALL_CONFIGS.get(key, default)
@@ -36,99 +168,216 @@ class Config:
     @classmethod
     def load_images(cls):
         """Pre-loads and caches all ingredient images."""
-        image_paths = {
-            "lamb": "images/simply cooked/Raw food/lamb3.png",
-            "lamb fried": "images/simply cooked/Cooked food/lamb1.png",
 
-            "bread": "images/simply cooked/Cooked food/bread1.png",
-            "bread sliced": "images/simply cooked/Cooked food/bread_sliced.png",
-            "leek": "images/FarmVeggies/Leek.png",
+        size = (cls.get_config('GRID_SIZE_W') * 2, cls.get_config('GRID_SIZE_W') * 2)
+        for ingredient, path in cls.__INGREDIENT_IMAGES.items():
+            cls.__IMAGE_CACHE[ingredient] = cls.get_asset(path, size)
 
-            "egg": "images/simply cooked/Raw food/egg3.png",
-            "egg fried": "images/simply cooked/Cooked food/egg1.png",
+    @classmethod
+    def get_image(cls, ingredient_type):
+        """Retrieve an image from the cache."""
+        return cls.__IMAGE_CACHE.get(ingredient_type, pg.Surface((50, 50)))  # Default placeholder
 
-            "chicken": "images/simply cooked/Raw food/chiken3.png",
-            "chicken fried": "images/simply cooked/Cooked food/chiken1.png",
+    @classmethod
+    def get_asset(cls, path, size=None, rotate=0, flip_x=False, flip_y=False):
+        """Retrieve an image from the asset registry, loading it on first use.
 
-            "chicken to slice": "images/simply cooked/Raw food/chiken3.png",
-            "chicken sliced": "images/simply cooked/Raw food/drumstick3.png",
-            "chicken rotten": "images/simply cooked/Rotten food/chiken_rotten.png",
+        Transforms are applied in the order rotate, scale, flip and every
+        variant is cached separately, so draw methods can call this per frame.
+        """
+        key = (path, tuple(size) if size else None, rotate, flip_x, flip_y)
+        surface = cls.__ASSET_CACHE.get(key)
+        if surface is not None:
+            cls.__ASSET_STATS['hits'] += 1
+            return surface
 
-            "chicken drumstick fried": "images/simply cooked/Cooked food/drumstick1.png",
-            "chicken drumstick rotten": "images/simply cooked/Rotten food/drumstick_rotten.png",
+        cls.__ASSET_STATS['misses'] += 1
+        surface = cls.__load_asset(path)
+        if surface is None:
+            print(f"Warning: Image not found at {path}, using placeholder.")
+            surface = pg.Surface(key[1] or (50, 50))  # Placeholder
+        else:
+            if rotate:
+                surface = pg.transform.rotate(surface, rotate)
+            if size:
+                surface = pg.transform.scale(surface, size)
+            if flip_x or flip_y:
+                surface = pg.transform.flip(surface, flip_x, flip_y)
+            surface = cls.__optimize_surface(surface)
 
-            "pork": "images/simply cooked/Raw food/pork3.png",
-            "pork fried": "images/simply cooked/Cooked food/pork1.png",
+        cls.__ASSET_CACHE[key] = surface
+        return surface
 
-            "fish": "images/simply cooked/Raw food/fish3.png",
-            "fish fried": "images/simply cooked/Cooked food/fish1.png",
+    @classmethod
+    def __load_asset(cls, path):
+        """Decode an untransformed image from disk once and keep it as the base variant."""
+        base_key = (path, None, 0, False, False)
+        if base_key in cls.__ASSET_CACHE:
+            return cls.__ASSET_CACHE[base_key]
 
-            "sandwich": "images/simply cooked/Cooked food/sandwich1.png",
-            "tomato": "images/FarmVeggies/Tomato.png",
-            "tomato sliced": "images/FarmVeggies/Tomatoslice.png",
+        try:
+            surface = pg.image.load(path)
+        except (FileNotFoundError, pg.error):
+            return None
+        return cls.__store_base_asset(path, surface)
 
-            "cheese": "images/simply cooked/Cooked food/chees1.png",
-            "cheese sliced": "images/simply cooked/Cooked food/cheese_slice.png",
+    @classmethod
+    def __store_base_asset(cls, path, surface):
+        cls.__ASSET_STATS['disk_loads'] += 1
+        surface = cls.__optimize_surface(surface)
+        cls.__ASSET_CACHE[(path, None, 0, False, False)] = surface
+        return surface
 
-            "lettuce": "images/FarmVeggies/lettuce.png",
-            "lettuce sliced": "images/FarmVeggies/lettuceslice.png",
+    @staticmethod
+    def __optimize_surface(surface):
+        """Convert to the display pixel format so blits take the fast path."""
+        if pg.display.get_surface() is None:
+            return surface  # No display yet, convert_assets() will handle it later
+        if surface.get_flags() & pg.SRCALPHA:
+            return surface.convert_alpha()
+        return surface.convert()
 
-        }
+    @classmethod
+    def convert_assets(cls):
+        """Convert every cached surface after the display has been created."""
+        converted = {}
+        for key, surface in list(cls.__ASSET_CACHE.items()):
+            converted[id(surface)] = cls.__ASSET_CACHE[key] = cls.__optimize_surface(surface)
 
-        for ingredient, path in image_paths.items():
-            try:
-                image = pg.image.load(path)
-                scaled_image = pg.transform.scale(
-                    image,
-                    (cls.get_config('GRID_SIZE_W') * 2, cls.get_config('GRID_SIZE_W') * 2)
-                )
-                cls.__IMAGE_CACHE[ingredient] = scaled_image
-            except FileNotFoundError:
-                print(f"Warning: Image not found for {ingredient}, using placeholder.")
-                cls.__IMAGE_CACHE[ingredient] = pg.Surface((50, 50))  # Placeholder
+        for ingredient, surface in cls.__IMAGE_CACHE.items():
+            cls.__IMAGE_CACHE[ingredient] = converted.get(id(surface), surface)
 
     @classmethod
-    def get_image(cls, ingredient_type):
-        """Retrieve an image from the cache."""
-        return cls.__IMAGE_CACHE.get(ingredient_type, pg.Surface((50, 50)))  # Default placeholder
+    def get_asset_stats(cls):
+        """Return cache hit/miss counters and the number of disk loads."""
+        return dict(cls.__ASSET_STATS, cached=len(cls.__ASSET_CACHE))
+
+    @classmethod
+    def reset_asset_stats(cls):
+        for key in cls.__ASSET_STATS:
+            cls.__ASSET_STATS[key] = 0
+
+    __FONT_CACHE = {}
+    __TEXT_CACHE = OrderedDict()  # Least recently used entries first
+
+    @classmethod
+    def get_font(cls, name=None, size=24, bold=False):
+        """Retrieve a font from the cache, creating it on first use.
+
+        name=None uses pygame's default font directly, skipping the system font lookup.
+        """
+        key = (name, size, bold)
+        font = cls.__FONT_CACHE.get(key)
+        if font is None:
+            if name is None:
+                font = pg.font.Font(None, size)
+                font.set_bold(bold)
+            else:
+                font = pg.font.SysFont(name, size, bold=bold)
+            cls.__FONT_CACHE[key] = font
+        return font
+
+    @classmethod
+    def render_text(cls, text, color, name=None, size=24, bold=False, antialias=True):
+        """Render text with a cached font, reusing the surface while the text is unchanged."""
+        key = (text, tuple(color), name, size, bold, antialias)
+        surface = cls.__TEXT_CACHE.get(key)
+        if surface is not None:
+            cls.__TEXT_CACHE.move_to_end(key)
+            return surface
+
+        surface = cls.get_font(name, size, bold).render(text, antialias, color)
+        cls.__TEXT_CACHE[key] = surface
+        if len(cls.__TEXT_CACHE) > cls.get_config('TEXT_CACHE_SIZE'):
+            cls.__TEXT_CACHE.popitem(last=False)  # Evict the least recently used text
+        return surface
 
     __SOUND_CACHE = {}
+    __SILENT_SOUND = SilentSound()
+
+    @classmethod
+    def __init_mixer(cls):
+        """Initialise the mixer, returning False when no audio device is available."""
+        if pg.mixer.get_init():
+            return True
+        try:
+            pg.mixer.init()
+        except pg.error as e:
+            print(f"Warning: Audio unavailable ({e}), sounds are muted")
+            return False
+        return True
 
     @classmethod
     def load_sounds(cls):
         """Pre-loads and caches all sounds"""
-        if not pg.mixer.get_init():
-            pg.mixer.init()
+        if not cls.__init_mixer():
+            return
 
-        sound_paths = {
-            "click": "sounds/click.mp3",
-            "game_start": "sounds/game_start_song.mp3",
-            "trash": "sounds/trash.mp3",
-            "cutting": "sounds/cutting.mp3",
-            "finish_cooking": "sounds/finishcooking.mp3",
-            "served": "sounds/handbell.mp3",
-            "pan_cooking": "sounds/pan.mp3"
-        }
-
-        for name, path in sound_paths.items():
+        for name, path in cls.__SOUND_PATHS.items():
             try:
                 sound = pg.mixer.Sound(path)
-                # Set the volume for the sound
-                if name == "game_start":
-                    sound.set_volume(0.3)
-
-                cls.__SOUND_CACHE[name] = sound
             except (FileNotFoundError, pg.error):
-                print(f"Warning: Sound not found for {name}")
-                # Create empty sounds as fallback
-                cls.__SOUND_CACHE[name] = pg.mixer.Sound(buffer=bytes(44))
+                sound = None
+            cls.__store_sound(name, sound)
+
+    @classmethod
+    def __store_sound(cls, name, sound):
+        if sound is None:
+            print(f"Warning: Sound not found for {name}")
+            sound = SilentSound()  # Empty fallback keeps callers free of None checks
+
+        # Set the volume for the sound
+        if name == "game_start":
+            sound.set_volume(0.3)
+
+        cls.__SOUND_CACHE[name] = sound
 
     @classmethod
     def get_sound(cls, sound_name):
         """Retrieve a sounds from the cache"""
-        return cls.__SOUND_CACHE.get(sound_name, cls.__SOUND_CACHE.get("error"))  # Fallback to error sounds
+        return cls.__SOUND_CACHE.get(sound_name, cls.__SILENT_SOUND)  # Silent if missing or not preloaded
+
+    @classmethod
+    def preload(cls, progress=None, images=True, sounds=True):
+        """Decode images and sounds concurrently in a thread pool.
+
+        progress is called as progress(done, total) on the calling thread after
+        each file finishes, so it can safely draw a loading screen. Headless
+        tests and tools can skip this entirely; get_image() and get_sound()
+        then return placeholders.
+        """
+        if sounds and not cls.__init_mixer():
+            sounds = False
+
+        with ThreadPoolExecutor(max_workers=cls.get_config('PRELOAD_WORKERS')) as pool:
+            jobs = {}
+            if images:
+                image_paths = set(cls.__INGREDIENT_IMAGES.values()) | set(cls.__PRELOAD_IMAGES)
+                for path in sorted(image_paths):
+                    jobs[pool.submit(pg.image.load, path)] = ("image", path)
+            if sounds:
+                for name, path in cls.__SOUND_PATHS.items():
+                    jobs[pool.submit(pg.mixer.Sound, path)] = ("sound", name)
+
+            total = len(jobs)
+            if progress:
+                progress(0, total)
+
+            for done, future in enumerate(as_completed(jobs), start=1):
+                kind, key = jobs[future]
+                try:
+                    result = future.result()
+                except (FileNotFoundError, pg.error):
+                    result = None
+
+                # Caching and display conversion stay on the calling thread
+                if kind == "sound":
+                    cls.__store_sound(key, result)
+                elif result is not None:
+                    cls.__store_base_asset(key, result)
 
+                if progress:
+                    progress(done, total)
 
-# Ensure images are loaded before using them
-Config.load_images()
-Config.load_sounds()
+        if images:
+            cls.load_images()  # Scaled ingredient sprites, built from the decoded images without disk access
@@ -0,0 +1,135 @@
+import math
+from collections import deque
+
+import numpy as np
+
+from file_game.cooking_config import Config
+
+
+class FlowField:
+    """Shortest paths to one target over the kitchen tile grid, shared by every zombie.
+
+    The grid uses Config 'GRID_SIZE_W' x 'GRID_SIZE_H' tiles and reaches a
+    margin past the window so zombies spawning off screen are on it too.
+    Tiles covered by an obstacle rect are blocked. update() runs one BFS
+    from the target's tile, only when the target moved to another tile,
+    and records for every tile the next tile on a shortest path (8-way,
+    without cutting blocked corners). sample() then gives any number of
+    zombies their next waypoint with a single array lookup.
+    """
+    NEIGHBOURS = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (1, -1), (-1, 1), (1, 1)]
+    TARGET_POCKET = 2  # Blocked tiles this close to the target are walkable, the chef can stand over furniture
+
+    def __init__(self, obstacles=(), cell_width=None, cell_height=None, margin=(66, 88)):
+        self.__cell_width = cell_width or Config.get_config('GRID_SIZE_W')
+        self.__cell_height = cell_height or Config.get_config('GRID_SIZE_H')
+        self.__origin = (-margin[0], -margin[1])
+        self.__columns = math.ceil((Config.get_config('WIN_SIZE_W') + 2 * margin[0]) / self.__cell_width)
+        self.__rows = math.ceil((Config.get_config('WIN_SIZE_H') + 2 * margin[1]) / self.__cell_height)
+
+        # Pixel centre of every tile, indexed by flat tile number (row * columns + column)
+        column_centres = self.__origin[0] + (np.arange(self.__columns) + 0.5) * self.__cell_width
+        row_centres = self.__origin[1] + (np.arange(self.__rows) + 0.5) * self.__cell_height
+        self.__centres = np.stack(np.meshgrid(column_centres, row_centres), axis=-1).reshape(-1, 2)
+
+        self.__blocked = np.zeros(self.__rows * self.__columns, dtype=bool)
+        self.__distance = np.full(self.__rows * self.__columns, -1, dtype=np.int32)  # -1: unreachable
+        self.__next = np.full(self.__rows * self.__columns, -1, dtype=np.int64)  # Next tile towards the target
+        self.__target = None
+        self.__updates = 0
+        self.set_obstacles(obstacles)
+
+    def set_obstacles(self, rects):
+        """Block every tile a rect (x, y, width, height) touches, and recompute on the next update()."""
+        blocked = np.zeros((self.__rows, self.__columns), dtype=bool)
+        for rect in rects:
+            x, y, width, height = rect[0], rect[1], rect[2], rect[3]
+            c0, r0 = self.__tile_xy(x, y)
+            c1, r1 = self.__tile_xy(x + width - 1, y + height - 1)
+            blocked[r0:r1 + 1, c0:c1 + 1] = True
+        self.__blocked = blocked.ravel()
+        self.__target = None
+
+    def __tile_xy(self, x, y):
+        """(column, row) of a pixel, clamped to the grid."""
+        column = int((x - self.__origin[0]) // self.__cell_width)
+        row = int((y - self.__origin[1]) // self.__cell_height)
+        return min(max(column, 0), self.__columns - 1), min(max(row, 0), self.__rows - 1)
+
+    def get_tile(self, x, y):
+        column, row = self.__tile_xy(x, y)
+        return row * self.__columns + column
+
+    def update(self, target_x, target_y):
+        """Point the field at (target_x, target_y). Returns True if it had to be recomputed."""
+        target = self.get_tile(target_x, target_y)
+        if target == self.__target:
+            return False
+        self.__target = target
+        self.__search(target)
+        self.__updates += 1
+        return True
+
+    def __search(self, target):
+        columns, rows = self.__columns, self.__rows
+        blocked = self.__blocked.tolist()
+        distance = [-1] * (columns * rows)
+        next_tile = [-1] * (columns * rows)
+        distance[target] = 0
+        target_row, target_column = divmod(target, columns)
+        pocket = self.TARGET_POCKET
+
+        queue = deque([target])
+        while queue:
+            tile = queue.popleft()
+            row, column = divmod(tile, columns)
+            step = distance[tile] + 1
+            # Out of the target's own tile the search may cross blocked tiles near it, so a
+            # chef standing over a counter or the bin can still be reached from the open floor
+            in_pocket = tile == target or blocked[tile]
+            for dx, dy in self.NEIGHBOURS:
+                nx, ny = column + dx, row + dy
+                if not (0 <= nx < columns and 0 <= ny < rows):
+                    continue
+                neighbour = ny * columns + nx
+                if distance[neighbour] != -1:
+                    continue
+                if blocked[neighbour]:
+                    if not (in_pocket and abs(nx - target_column) <= pocket and abs(ny - target_row) <= pocket):
+                        continue
+                # No diagonal steps between two blocked tiles' corners
+                elif dx and dy and not in_pocket and (blocked[row * columns + nx] or blocked[ny * columns + column]):
+                    continue
+                distance[neighbour] = step
+                next_tile[neighbour] = tile  # From the neighbour, this tile is one step closer
+                queue.append(neighbour)
+
+        self.__distance = np.array(distance, dtype=np.int32)
+        self.__next = np.array(next_tile, dtype=np.int64)
+
+    def sample(self, points):
+        """Next waypoint for each (x, y) row of points.
+
+        Returns (waypoints, valid). waypoints is an (N, 2) array of tile
+        centres; valid is False where the point is on the target tile or
+        has no path, and the caller should head straight for the target.
+        """
+        points = np.asarray(points, dtype=float)
+        columns = np.clip(((points[:, 0] - self.__origin[0]) // self.__cell_width).astype(np.int64),
+                          0, self.__columns - 1)
+        rows = np.clip(((points[:, 1] - self.__origin[1]) // self.__cell_height).astype(np.int64),
+                       0, self.__rows - 1)
+        next_tile = self.__next[rows * self.__columns + columns]
+        valid = next_tile >= 0
+        return self.__centres[np.where(valid, next_tile, 0)], valid
+
+    def get_distance(self, x, y):
+        """Steps from (x, y) to the target, or -1 if there is no path."""
+        return int(self.__distance[self.get_tile(x, y)])
+
+    def is_blocked(self, x, y):
+        return bool(self.__blocked[self.get_tile(x, y)])
+
+    def get_update_count(self):
+        """How many times the field was recomputed, to check it only happens on tile changes."""
+        return self.__updates
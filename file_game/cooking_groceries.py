@@ -10,22 +10,9 @@ class Groceries:
         self.__bag_carried = False
         self.__bag_spawn = False
 
-        # Load images with error handling
-        try:
-            self.__button_img = pg.image.load(Config.get_config('red button')).convert_alpha()
-            self.__button_img = pg.transform.scale(self.__button_img, (100, 100))
-        except:
-            print("Error loading button image - creating placeholder")
-            self.__button_img = pg.Surface((100, 100))
-            self.__button_img.fill((255, 0, 0))  # Red placeholder
-
-        try:
-            self.__bag_img = pg.image.load(Config.get_config('paper bag')).convert_alpha()
-            self.__bag_img = pg.transform.scale(self.__bag_img, (60, 80))  # Smaller for carrying
-        except:
-            print("Error loading bag image - creating placeholder")
-            self.__bag_img = pg.Surface((60, 80))
-            self.__bag_img.fill((200, 150, 100))  # Brown placeholder
+        # Images come from the shared asset registry, which substitutes a placeholder if missing
+        self.__button_img = Config.get_asset(Config.get_config('red button'), (100, 100))
+        self.__bag_img = Config.get_asset(Config.get_config('paper bag'), (60, 80))  # Smaller for carrying
 
         self.button_rect = pg.Rect(915, 300, 100, 100)
 
@@ -42,7 +29,7 @@ class Groceries:
 
     def draw_red_button(self):
         """Draw the red button on screen"""
-        self.__screen.blit(self.__button_img, self.button_rect)
+        return self.__screen.blit(self.__button_img, self.button_rect)
 
     def generate_contents(self):
         groceries = ["lamb", "bread", "egg", "chicken", "tomato", "lettuce", "cheese", "pork", "fish"]
@@ -51,8 +38,8 @@ class Groceries:
     def draw_bag(self):
         """Draw the bag at its position or carried by chef"""
         if self.__active_bag and not self.__bag_carried:
-            self.__screen.blit(self.__active_bag['image'],
-                               self.__active_bag['rect'])
+            return self.__screen.blit(self.__active_bag['image'],
+                                      self.__active_bag['rect'])
 
     def pick_up_bag(self, chef_pos):
         """Check if chef can pick up the bag"""
@@ -87,8 +74,8 @@ class Groceries:
 
         # Add each grocery item to the fridge
         for item in self.__active_bag['contents']:
-            # Create ingredient and add to fridge
-            fridge.put_ingredient_in_fridge(Ingredients(0, 0, item))
+            # The fridge counts it and hands the ingredient back to the pool
+            fridge.put_ingredient_in_fridge(Ingredients.acquire(0, 0, item))
 
         # Play sound effect when adding to fridge
         try:
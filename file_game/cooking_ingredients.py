@@ -1,12 +1,70 @@
+from collections import namedtuple
+
 from file_game.cooking_config import Config
 
+# What every ingredient of one type shares. Cook rules live in RecipeBook, keyed by the same name.
+IngredientKind = namedtuple('IngredientKind', 'name image')
+
 
 class Ingredients:
+    """One ingredient in the kitchen: a position and a shared IngredientKind.
+
+    The kinds are flyweights, one per type, so the sprite is looked up once
+    instead of per instance. Instances are small __slots__ records; create
+    them with acquire() and hand them back with release() when they leave
+    the game (trashed, served, put back in the fridge), so long sessions
+    reuse the same few objects instead of feeding the garbage collector.
+    """
+    __slots__ = ('__position', '__kind', '__pooled')
+
+    __KINDS = {}  # Ingredient type -> IngredientKind
+    __POOL = []  # Released instances, ready for acquire()
+    POOL_LIMIT = 256
+
     def __init__(self, x, y, ingredient_type):
         self.__position = (x, y)
-        self.__ingredient_type = ingredient_type
-        self.images = Config.get_image(ingredient_type)
-        self.__time_used = 0
+        self.__kind = self.get_kind(ingredient_type)
+        self.__pooled = False
+
+    @classmethod
+    def get_kind(cls, ingredient_type):
+        kind = cls.__KINDS.get(ingredient_type)
+        if kind is None:
+            kind = cls.__KINDS[ingredient_type] = IngredientKind(ingredient_type, Config.get_image(ingredient_type))
+        return kind
+
+    @classmethod
+    def clear_kinds(cls):
+        """Forget the cached kinds, after Config has (re)loaded or converted the images."""
+        cls.__KINDS.clear()
+
+    @classmethod
+    def acquire(cls, x, y, ingredient_type):
+        """An ingredient from the pool, or a new one if the pool is empty."""
+        if not cls.__POOL:
+            return cls(x, y, ingredient_type)
+        ingredient = cls.__POOL.pop()
+        ingredient.__position = (x, y)
+        ingredient.__kind = cls.get_kind(ingredient_type)
+        ingredient.__pooled = False
+        return ingredient
+
+    @classmethod
+    def release(cls, ingredient):
+        """Return an ingredient nothing refers to any more. Releasing twice is a no-op."""
+        if ingredient is None or ingredient.__pooled:
+            return
+        ingredient.__pooled = True
+        if len(cls.__POOL) < cls.POOL_LIMIT:
+            cls.__POOL.append(ingredient)
+
+    @classmethod
+    def get_pool_size(cls):
+        return len(cls.__POOL)
+
+    @property
+    def images(self):
+        return self.__kind.image
 
     def get_position(self):
         return self.__position
@@ -16,16 +74,15 @@ class Ingredients:
 
     def draw(self, screen):
         """Draw ingredient at its default position."""
-        self.draw_at(screen, self.__position[0] * Config.get_config('GRID_SIZE_W'),
+        return self.draw_at(screen, self.__position[0] * Config.get_config('GRID_SIZE_W'),
                      self.__position[1] * Config.get_config('GRID_SIZE_H'))
 
     def get_type(self):
-        return self.__ingredient_type
+        return self.__kind.name
 
     def set_type(self, ingredient_type):
-        self.__ingredient_type = ingredient_type
-        self.images = Config.get_image(ingredient_type)
+        self.__kind = self.get_kind(ingredient_type)
 
     def draw_at(self, screen, x, y):
         """Draw ingredient at a specific position (e.g., inside the fridge)."""
-        screen.blit(self.images, (x, y))  # Directly use self.__image to draw
+        return screen.blit(self.__kind.image, (x, y))
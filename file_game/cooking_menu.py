@@ -1,10 +1,11 @@
-import os
 from file_game.cooking_config import Config
+from file_game.cooking_clock import GameClock
+from file_game.cooking_telemetry import Telemetry
+from file_game.cooking_session import SessionSequence
 from file_game.cooking_ui import GameUI
 import pygame as pg
 import random
 from collections import deque
-import csv
 from datetime import datetime
 
 
@@ -13,8 +14,6 @@ class Menu:
                     "fish fried", "pork fried"]
 
     def __init__(self, max_orders=3):
-        self.__font_menu = pg.font.Font(None, 14)
-        self.__font_score = pg.font.Font(None, 42)
         self.__orders = deque()
         self.__max_orders = max_orders
         self.__serving_pad = None
@@ -27,6 +26,7 @@ class Menu:
 
         # Tracking mistakes
         self.__detailed_mistakes = []
+        self.__saved_mistakes = 0  # How many of this session's mistakes are already in the journal
         self.__current_mistakes = 0
 
         self.__dish_preparation_times = []
@@ -34,22 +34,7 @@ class Menu:
         self.__images = {
             item: pg.transform.scale(Config.get_image(item), (90, 90)) for item in self.__MENU_ITEMS
         }
-        self.__csv_file = "game_data/total_time_per_dish.csv"
-        self.__session_id = self.__get_next_session_id()
-
-    def __get_next_session_id(self):
-        if not os.path.exists(self.__csv_file):
-            return 1
-
-        session_ids = []
-        with open(self.__csv_file, 'r') as file:
-            reader = csv.DictReader(file)  # <-- This ensures rows are dictionaries
-            for row in reader:
-                sid = row.get('session_id', '').strip()
-                if sid.isdigit():
-                    session_ids.append(int(sid))
-
-        return max(session_ids, default=0) + 1
+        self.__session_id = SessionSequence.current_session_id()
 
     def log_mistake(self, mistake_type="unknown", extra_info=None):
         self.__current_mistakes += 1
@@ -82,9 +67,9 @@ class Menu:
         for order in list(self.__orders):
             if order["name"] == prepared_type:
                 # Calculate points
-                current_time = pg.time.get_ticks()
+                current_time = GameClock.get_ticks()
                 elapsed_time = (current_time - order["start_time"]) / 1000
-                time_remaining = order["duration"] - (pg.time.get_ticks() - order["start_time"])
+                time_remaining = order["duration"] - (GameClock.get_ticks() - order["start_time"])
                 time_bonus = max(0, time_remaining // 1000)
 
                 # Track dish preparation time
@@ -116,12 +101,13 @@ class Menu:
         self.__score = 0
         self.__menu_appearance = {item: 0 for item in self.__MENU_ITEMS}
         self.__successful_orders = {item: 0 for item in self.__MENU_ITEMS}
-        self.__session_id = self.__get_next_session_id()
+        self.__session_id = SessionSequence.current_session_id()
         self.__session_start_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         self.__dish_preparation_times = []
 
         self.__current_mistakes = 0
         self.__detailed_mistakes = []
+        self.__saved_mistakes = 0
 
     def add_order(self):
         """Add a new random menu item to the queue."""
@@ -131,7 +117,7 @@ class Menu:
 
             order = {
                 "name": menu_item,
-                "start_time": pg.time.get_ticks(),
+                "start_time": GameClock.get_ticks(),
                 "duration": 60000,  # 60 seconds to complete
                 "position": (800 - len(self.__orders) * 150, 450)
             }
@@ -139,7 +125,7 @@ class Menu:
 
     def update(self):
         """Remove expired orders and add new ones"""
-        current_time = pg.time.get_ticks()
+        current_time = GameClock.get_ticks()
         while self.__orders and current_time - self.__orders[0]["start_time"] >= self.__orders[0]["duration"]:
             self.__orders.popleft()  # Remove expired order
             if not GameUI.game_over:
@@ -150,15 +136,16 @@ class Menu:
 
     def draw_score(self, screen):
         """Display current score on screen"""
-        score_text = self.__font_score.render(f"Score: {self.__score}", True, Config.get_config('BLACK'))
-        screen.blit(score_text, (10, 460))
+        score_text = Config.render_text(f"Score: {self.__score}", Config.get_config('BLACK'), size=42)
+        return screen.blit(score_text, (10, 460))
 
     def get_score(self):
         return self.__score
 
     def draw(self, screen):
         """Render the menu orders."""
-        current_time = pg.time.get_ticks()
+        current_time = GameClock.get_ticks()
+        drawn = []
 
         for i, order in enumerate(self.__orders):
             rect_x = 800 - i * 250  # Move each order left
@@ -166,13 +153,13 @@ class Menu:
             order_width = 150
             order_height = 150
 
-            pg.draw.rect(screen, Config.get_config('WHITE'), (rect_x, rect_y, 150, 150), border_radius=15)
+            drawn.append(pg.draw.rect(screen, Config.get_config('WHITE'), (rect_x, rect_y, 150, 150), border_radius=15))
 
             if order["name"] in self.__images:
                 screen.blit(self.__images[order["name"]], (rect_x + 27, rect_y + 10))
 
             # Draw order name
-            text = self.__font_menu.render(order["name"], True, Config.get_config('BLACK'))
+            text = Config.render_text(order["name"], Config.get_config('BLACK'), size=14)
             screen.blit(text, (rect_x + 50, rect_y + 110))
 
             time_elapsed = current_time - order["start_time"]
@@ -194,27 +181,20 @@ class Menu:
                          (bar_x, bar_y, int(bar_width * progress), bar_height),
                          border_radius=4)
 
+        return drawn
+
     def save_to_mistake(self):
+        """Append the mistakes not yet journaled, so each one is written exactly once."""
         file_name = "game_data/mistake.csv"
-        try:
-            file_exist = os.path.exists(file_name)
-
-            with open(file_name, 'a', newline='') as csv_file:
-                fieldnames = ['timestamp', 'mistake_type', 'info']
-                writer = csv.DictWriter(csv_file, fieldnames=fieldnames)
-
-                if not file_exist:
-                    writer.writeheader()
+        fieldnames = ['timestamp', 'mistake_type', 'info']
 
-                for mistake in self.__detailed_mistakes:
-                    writer.writerow({
-                        'timestamp': mistake['timestamp'],
-                        'mistake_type': mistake['type'],
-                        'info': mistake['info']
-                    })
-
-        except Exception as e:
-            print(f"Error saving detailed mistake log: {e}")
+        for mistake in self.__detailed_mistakes[self.__saved_mistakes:]:
+            Telemetry.log(file_name, fieldnames, {
+                'timestamp': mistake['timestamp'],
+                'mistake_type': mistake['type'],
+                'info': mistake['info']
+            })
+        self.__saved_mistakes = len(self.__detailed_mistakes)
 
     def save_to_order_per_session(self, force_save=False):
         """Save statistics to CSV, with option to force immediate save"""
@@ -223,59 +203,36 @@ class Menu:
             return
 
         filename = "game_data/order_per_session.csv"
-        try:
-            file_exists = os.path.exists(filename)
-
-            with open(filename, 'a', newline='') as csvfile:
-                fieldnames = ['session_start', 'session_end', 'total_score'] + self.__MENU_ITEMS
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-
-                if not file_exists:
-                    writer.writeheader()
+        fieldnames = ['session_start', 'session_end', 'total_score'] + self.__MENU_ITEMS
 
-                record = {
-                    'session_start': self.__session_start_time,
-                    'session_end': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    'total_score': self.__score,
-                }
-
-                # Add counts for each menu item
-                for item in self.__MENU_ITEMS:
-                    record[item] = self.__successful_orders[item]
+        record = {
+            'session_start': self.__session_start_time,
+            'session_end': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'total_score': self.__score,
+        }
 
-                print("Saving session data:", record)  # Debug print
-                writer.writerow(record)
+        # Add counts for each menu item
+        for item in self.__MENU_ITEMS:
+            record[item] = self.__successful_orders[item]
 
-        except Exception as e:
-            print(f"Error saving menu statistics: {e}")
+        print("Saving session data:", record)  # Debug print
+        Telemetry.log(filename, fieldnames, record)
 
     def save_to_time_per_dish(self):
         file_name = "game_data/total_time_per_dish.csv"
-        try:
-            file_exist = os.path.exists(file_name)
-
-            with open(file_name, 'a', newline='') as csv_file:
-                fieldnames = ['timestamp', 'session_id', 'dish_type', 'preparation_time_seconds']
-                writer = csv.DictWriter(csv_file, fieldnames=fieldnames)
-
-                if not file_exist:
-                    writer.writeheader()
-
-                # Write all tracked preparation times to the CSV
-                for record in self.__dish_preparation_times:
-                    data = {
-                        'timestamp': record['timestamp'],
-                        'session_id': self.__session_id,
-                        'dish_type': record['dish_type'],
-                        'preparation_time_seconds': record['preparation_time_seconds']
-                    }
-                    writer.writerow(data)
-
-                # Add debug print
-                print(f"Saved {len(self.__dish_preparation_times)} dish preparation records to CSV")
-
-                # Clear the preparation times after saving
-                self.__dish_preparation_times = []
-
-        except Exception as e:
-            print(f"Error saving dish preparation time log: {e}")
\ No newline at end of file
+        fieldnames = ['timestamp', 'session_id', 'dish_type', 'preparation_time_seconds']
+
+        # Queue all tracked preparation times for the CSV
+        for record in self.__dish_preparation_times:
+            Telemetry.log(file_name, fieldnames, {
+                'timestamp': record['timestamp'],
+                'session_id': self.__session_id,
+                'dish_type': record['dish_type'],
+                'preparation_time_seconds': record['preparation_time_seconds']
+            })
+
+        # Add debug print
+        print(f"Saved {len(self.__dish_preparation_times)} dish preparation records to CSV")
+
+        # Clear the preparation times after saving
+        self.__dish_preparation_times = []
\ No newline at end of file
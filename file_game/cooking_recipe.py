@@ -0,0 +1,65 @@
+import csv
+from collections import namedtuple
+
+from file_game.cooking_config import Config
+
+# duration is in seconds; sound plays once when the output is ready, loop_sound while it cooks
+Recipe = namedtuple('Recipe', ['tool', 'input', 'output', 'duration', 'sound', 'loop_sound'])
+
+
+class RecipeBook:
+    """Every tool transformation, read once from Config 'RECIPE_FILE'.
+
+    The rows are compiled into a dict keyed by (tool, input type), so the
+    equipment looks up what happens to an ingredient with one hash lookup
+    instead of comparing its type against each known dish. New dishes only
+    need a row in the file.
+    """
+    __recipes = None
+    __products = None
+
+    @classmethod
+    def get_recipe(cls, tool, ingredient_type):
+        """The Recipe for an ingredient on a tool, or None if the tool does nothing with it."""
+        return cls.__load().get((tool, ingredient_type))
+
+    @classmethod
+    def is_product(cls, ingredient_type):
+        """True for types a tool produces, i.e. ready to be taken off it."""
+        cls.__load()
+        return ingredient_type in cls.__products
+
+    @classmethod
+    def get_recipes(cls):
+        return list(cls.__load().values())
+
+    @classmethod
+    def reload(cls):
+        """Read the recipe file again, e.g. after editing it."""
+        cls.__recipes = None
+        return cls.__load()
+
+    @classmethod
+    def __load(cls):
+        if cls.__recipes is not None:
+            return cls.__recipes
+
+        recipes = {}
+        file_name = Config.get_config('RECIPE_FILE')
+        try:
+            with open(file_name, 'r', newline='') as file:
+                for row in csv.DictReader(file):
+                    try:
+                        recipe = Recipe(row['tool'].strip(), row['input'].strip(), row['output'].strip(),
+                                        float(row['duration']), (row.get('sound') or '').strip() or None,
+                                        (row.get('loop_sound') or '').strip() or None)
+                    except (KeyError, ValueError, AttributeError) as e:
+                        print(f"Skipping bad recipe row {row}: {e}")
+                        continue
+                    recipes[(recipe.tool, recipe.input)] = recipe
+        except FileNotFoundError:
+            print(f"Recipe file not found: {file_name}")
+
+        cls.__products = {recipe.output for recipe in recipes.values()}
+        cls.__recipes = recipes
+        return recipes
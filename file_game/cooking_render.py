@@ -0,0 +1,53 @@
+import pygame as pg
+
+
+class DirtyRectRenderer:
+    """Pushes only the screen areas that changed to the display.
+
+    Each frame the areas drawn last frame are restored from the static
+    background, the drawables redraw themselves and report the rects they
+    touched, and pg.display.update() is called with the old and new rects.
+    """
+
+    def __init__(self, screen):
+        self.__screen = screen
+        self.__previous_rects = []
+        self.__current_rects = []
+        self.__full_redraw = True
+
+    def invalidate(self):
+        """Repaint and flip the whole screen on the next frame (e.g. after a menu overlay)."""
+        self.__full_redraw = True
+
+    def begin_frame(self, background):
+        """Erase last frame's drawables by restoring the background underneath them."""
+        if self.__full_redraw:
+            self.__screen.blit(background, (0, 0))
+        else:
+            for rect in self.__previous_rects:
+                self.__screen.blit(background, rect, rect)
+        self.__current_rects = []
+
+    def add(self, drawn):
+        """Record what a draw call returned: a Rect, a list of Rects or None."""
+        if drawn is None:
+            return
+        if isinstance(drawn, pg.Rect):
+            if drawn.width and drawn.height:
+                self.__current_rects.append(drawn)
+            return
+        for item in drawn:
+            self.add(item)
+
+    def end_frame(self):
+        """Send the changed areas to the display."""
+        if self.__full_redraw:
+            pg.display.flip()
+            self.__full_redraw = False
+        else:
+            pg.display.update(self.__previous_rects + self.__current_rects)
+        self.__previous_rects = self.__current_rects
+
+    def get_dirty_area(self):
+        """Pixels covered by the rects of the last frame, for profiling."""
+        return sum(rect.width * rect.height for rect in self.__previous_rects)
@@ -0,0 +1,185 @@
+import argparse
+import html
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import pandas as pd
+
+from file_game import cooking_charts
+from file_game.cooking_aggregates import AggregateCache
+from file_game.cooking_config import Config
+from file_game.cooking_storage import Storage
+
+# Offline version of the StatsWindow: reads the logs of one or more kiosks, computes the same
+# aggregates and renders every chart to PNG with the Agg canvas, plus an index.html per kiosk.
+# Nothing here touches Tk or pyplot, so it runs from cron on a machine without a display.
+
+CHARTS = {
+    'overview': cooking_charts.overview_figure,
+    'keystrokes': cooking_charts.keystroke_figure,
+    'orders': cooking_charts.order_figure,
+    'mistakes': cooking_charts.mistake_figure,
+    'ingredients': cooking_charts.ingredient_figure,
+    'prep_time': cooking_charts.prep_time_figure,
+}
+
+CHART_TITLES = {
+    'overview': "Overall Statistics",
+    'keystrokes': "Keystrokes",
+    'orders': "Orders",
+    'mistakes': "Mistakes",
+    'ingredients': "Ingredients Used",
+    'prep_time': "Time per Dish",
+}
+
+
+def render_chart(chart, args, file_name, dpi=100):
+    """Runs in a worker process: build one figure and write it as a PNG."""
+    figure = CHARTS[chart](*args)
+    FigureCanvasAgg(figure)
+    figure.savefig(file_name, dpi=dpi)
+    return file_name
+
+
+class KioskReport:
+    """Logs and aggregates of one kiosk, read once and shared by all its charts."""
+
+    def __init__(self, name, store, aggregate_file=None):
+        self.name = name
+        self.__aggregates = AggregateCache(store, aggregate_file).refresh()
+        self.__frames = {log: store.read(log) for log in
+                         ('keystroke_per_dish', 'order_per_session', 'mistake', 'ingredient_used')}
+        self.__prep_time = pd.DataFrame(self.__aggregates.get_prep_time_stats(),
+                                        columns=['dish_type', 'count', 'mean', 'median', 'min', 'max', 'std'])
+
+    def get_overview(self):
+        return self.__aggregates.get_overview(cooking_charts.DISH_COLUMNS)
+
+    def get_chart_args(self):
+        """{chart: arguments for its figure builder}, leaving out charts that have no data."""
+        aggregates = self.__aggregates
+        charts = {
+            'overview': (aggregates.get('order_per_session'), aggregates.get('mistake'),
+                         aggregates.get('keystroke_per_dish')),
+        }
+
+        keystrokes = self.__frames['keystroke_per_dish']
+        if not keystrokes.empty:
+            charts['keystrokes'] = (keystrokes, aggregates.get_keystroke_stats())
+
+        orders = self.__frames['order_per_session']
+        if not orders.empty:
+            orders = orders.copy()
+            orders['duration_sec'] = (pd.to_datetime(orders['session_end']) -
+                                      pd.to_datetime(orders['session_start'])).dt.total_seconds()
+            charts['orders'] = (orders,)
+
+        mistake_counts = pd.Series(aggregates.get('mistake')['types'], dtype=int).sort_values(ascending=False)
+        if not mistake_counts.empty:
+            charts['mistakes'] = (mistake_counts,)
+
+        total_taken = pd.Series(aggregates.get('ingredient_used')['taken'], dtype=int).sort_index()
+        if not total_taken.empty:
+            charts['ingredients'] = (total_taken,)
+
+        if not self.__prep_time.empty:
+            # Only the distribution goes to the worker, not the whole log
+            prep_times = pd.DataFrame([(dish, seconds) for dish in self.__prep_time['dish_type']
+                                       for seconds in aggregates.get_prep_time_values(dish)],
+                                      columns=['dish_type', 'preparation_time_seconds'])
+            charts['prep_time'] = (prep_times,)
+        return charts
+
+    def write_index(self, output_dir, charts):
+        overview = self.get_overview()
+        rows = [
+            ("Total Sessions", overview['total_sessions']),
+            ("Total Orders", overview['total_orders']),
+            ("Highest Score", overview['max_score']),
+            ("Average Score", f"{overview['avg_score']:.1f}"),
+            ("Total Mistakes", overview['total_mistakes']),
+            ("Total Keystrokes", overview['total_keystrokes']),
+            ("Total Play Time", f"{overview['total_time'] / 3600:.1f} hours"),
+            ("Average Session", f"{overview['avg_time'] / 60:.1f} minutes"),
+        ]
+        parts = [
+            f"<html><head><meta charset='utf-8'><title>{html.escape(self.name)} report</title></head><body>",
+            f"<h1>{html.escape(self.name)}</h1>",
+            f"<p>Generated {datetime.now().isoformat(timespec='seconds')}</p>",
+            "<table border='1' cellpadding='4'>",
+        ]
+        parts += [f"<tr><th>{label}</th><td>{value}</td></tr>" for label, value in rows]
+        parts.append("</table>")
+        if not self.__prep_time.empty:
+            parts.append("<h2>Preparation Time Statistics</h2>")
+            parts.append(self.__prep_time.to_html(index=False, float_format=lambda x: f"{x:.2f}"))
+        for chart in CHARTS:
+            if chart in charts:
+                parts.append(f"<h2>{CHART_TITLES[chart]}</h2><img src='{chart}.png' alt='{chart}'>")
+        parts.append("</body></html>")
+
+        file_name = os.path.join(output_dir, "index.html")
+        with open(file_name, 'w', encoding='utf-8') as file:
+            file.write("\n".join(parts))
+        return file_name
+
+
+def kiosk_name(data_dir):
+    # A kiosk is usually .../<kiosk>/game_data, so name it after the parent in that case
+    path = os.path.normpath(os.path.abspath(data_dir))
+    name = os.path.basename(path)
+    if name == 'game_data':
+        name = os.path.basename(os.path.dirname(path))
+    return name
+
+
+def generate_reports(data_dirs, output_dir, backend='csv', workers=None, dpi=100):
+    """Write <output_dir>/<kiosk>/ with one PNG per chart and an index.html, for every data dir."""
+    start = time.perf_counter()
+    kiosks = []
+    for data_dir in data_dirs or [None]:
+        name = kiosk_name(data_dir or Config.get_config('DATA_DIR'))
+        store = Storage.create_store(backend, data_dir)
+        aggregate_file = os.path.join(data_dir, "aggregates.json") if data_dir else None
+        kiosks.append((KioskReport(name, store, aggregate_file), {}))
+    print(f"Loaded {len(kiosks)} kiosk(s) in {time.perf_counter() - start:.2f}s")
+
+    # Every chart of every kiosk goes to the same pool, the figures are independent
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = []
+        for report, charts in kiosks:
+            kiosk_dir = os.path.join(output_dir, report.name)
+            os.makedirs(kiosk_dir, exist_ok=True)
+            for chart, args in report.get_chart_args().items():
+                charts[chart] = os.path.join(kiosk_dir, f"{chart}.png")
+                futures.append(executor.submit(render_chart, chart, args, charts[chart], dpi))
+        for future in futures:
+            future.result()
+
+    index_files = [report.write_index(os.path.join(output_dir, report.name), charts)
+                   for report, charts in kiosks]
+    print(f"Rendered {len(futures)} charts in {time.perf_counter() - start:.2f}s")
+    return index_files
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render the statistics charts to PNG/HTML without a display.")
+    parser.add_argument('--data-dir', action='append', default=None,
+                        help="kiosk directory holding the logs, can be given more than once (default: game_data)")
+    parser.add_argument('--output-dir', default=os.path.join("reports", datetime.now().strftime("%Y-%m-%d")),
+                        help="where the reports are written (default: reports/<date>)")
+    parser.add_argument('--backend', choices=['csv', 'sqlite'], default=Config.get_config('STORAGE_BACKEND'),
+                        help="log storage to read from")
+    parser.add_argument('--workers', type=int, default=None, help="processes used for rendering")
+    parser.add_argument('--dpi', type=int, default=100)
+    args = parser.parse_args()
+
+    for file_name in generate_reports(args.data_dir, args.output_dir, args.backend, args.workers, args.dpi):
+        print(file_name)
+
+
+if __name__ == '__main__':
+    main()
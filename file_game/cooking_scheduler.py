@@ -0,0 +1,67 @@
+import heapq
+import itertools
+
+from file_game.cooking_clock import GameClock
+
+
+class CookingScheduler:
+    """Timers for everything cooking, kept in one heap ordered by due time.
+
+    A tool schedules an event when an item goes in, and the game loop calls
+    run_due() once per update, which only pops the events that are due. The
+    cost per update is the same however many items are cooking on however
+    many tools.
+    """
+    __queue = []  # [due_ms, sequence, callback, args]; callback is None once cancelled
+    __sequence = itertools.count()  # Keeps events due at the same time in scheduling order
+    __active = 0
+
+    @classmethod
+    def schedule(cls, delay_ms, callback, *args):
+        """Call callback(*args) delay_ms from now (on GameClock); returns the event for cancel()."""
+        event = [GameClock.get_ticks() + max(delay_ms, 0), next(cls.__sequence), callback, args]
+        heapq.heappush(cls.__queue, event)
+        cls.__active += 1
+        return event
+
+    @classmethod
+    def cancel(cls, event):
+        """Cancel an event that has not run yet. It stays in the heap and is skipped when popped."""
+        if event is not None and event[2] is not None:
+            event[2] = None
+            event[3] = ()
+            cls.__active -= 1
+
+    @classmethod
+    def run_due(cls, now=None):
+        """Run every event that is due, in due order. Returns how many ran."""
+        now = GameClock.get_ticks() if now is None else now
+        queue = cls.__queue
+        ran = 0
+        while queue and queue[0][0] <= now:
+            event = heapq.heappop(queue)
+            callback, args = event[2], event[3]
+            if callback is None:
+                continue
+            event[2] = None  # A late cancel() of an event that already ran is a no-op
+            cls.__active -= 1
+            callback(*args)  # May schedule more events, due ones run in this same call
+            ran += 1
+        return ran
+
+    @classmethod
+    def next_due(cls):
+        """Due time of the next live event, or None if nothing is scheduled."""
+        queue = cls.__queue
+        while queue and queue[0][2] is None:
+            heapq.heappop(queue)
+        return queue[0][0] if queue else None
+
+    @classmethod
+    def pending(cls):
+        return cls.__active
+
+    @classmethod
+    def clear(cls):
+        cls.__queue.clear()
+        cls.__active = 0
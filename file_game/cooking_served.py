@@ -1,7 +1,11 @@
 from file_game.cooking_config import *
+from file_game.cooking_clock import GameClock
 
 
 class Serving:
+    __slots__ = ('__position', '__plates', '__pad_rect', '__screen', '__serve_timer', '__serving', '__menu',
+                 '__current_plate', '__last_serve_time', '__last_serve_success', '__last_serve_points')
+
     def __init__(self, x, y, screen, menu):
         self.__position = (x, y)
         self.__plates = []
@@ -27,7 +31,7 @@ class Serving:
 
         self.__plates.append(plate)
         self.__serving = True
-        self.__serve_timer = pg.time.get_ticks()
+        self.__serve_timer = GameClock.get_ticks()
         return True
 
     def update(self):
@@ -39,7 +43,7 @@ class Serving:
     def draw_pad(self):
         """Enhanced visual feedback with progress bar"""
         # Base pad
-        pg.draw.rect(
+        return pg.draw.rect(
             self.__screen,
             Config.get_config('PASTEL_BLUE'),
             (self.__position[0], self.__position[1], 100, 50),
@@ -53,9 +57,10 @@ class Serving:
 
         served_plate = self.__plates.pop(0)
         points = self.__menu.serve_dish(served_plate)
+        served_plate.clear()  # The dish is gone, its ingredients go back to the pool
 
         # Visual feedback flags
-        self.__last_serve_time = pg.time.get_ticks()
+        self.__last_serve_time = GameClock.get_ticks()
         self.__last_serve_success = points > 0
         self.__last_serve_points = points
 
@@ -64,16 +69,15 @@ class Serving:
     def draw_feedback(self):
         """Draw floating score text"""
         if hasattr(self, '__last_serve_time') and \
-                (pg.time.get_ticks() - self.__last_serve_time) < 1000:
+                (GameClock.get_ticks() - self.__last_serve_time) < 1000:
             text_color = (0, 255, 0) if self.__last_serve_success else (255, 0, 0)
             text = f"+{self.__last_serve_points}" if self.__last_serve_success else "Wrong Order!"
 
-            font = pg.font.Font(None, 24)
-            text_surface = font.render(text, True, text_color)
+            text_surface = Config.render_text(text, text_color, size=24)
 
             # Animate upward
-            y_offset = min(50, (pg.time.get_ticks() - self.__last_serve_time) // 20)
-            self.__screen.blit(
+            y_offset = min(50, (GameClock.get_ticks() - self.__last_serve_time) // 20)
+            return self.__screen.blit(
                 text_surface,
                 (self.__position[0] + 5, self.__position[1] - y_offset)
             )
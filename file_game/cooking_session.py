@@ -0,0 +1,127 @@
+import atexit
+import csv
+import json
+import os
+import threading
+
+from file_game.cooking_config import Config
+
+
+class SessionSequence:
+    """Persistent counters for session ids and log row ids.
+
+    Values live in a small JSON sidecar file, so handing out the next id is
+    O(1) however large the game_data logs grow. The logs are scanned only
+    once, to seed the counters when the sidecar file does not exist yet.
+    Handing out an id never touches the disk: the counters are saved by
+    save(), which the telemetry writer calls before writing each batch, so
+    every id in a written log row is already saved. While not persistent
+    (telemetry off, e.g. headless simulations) the counters only move in
+    memory, so runs that log nothing use up no ids.
+    """
+    __LOCK = threading.Lock()
+    __SAVE_LOCK = threading.Lock()  # Keeps saves in order, without holding __LOCK during the file write
+    __values = None
+    __current_session = None
+    __persistent = True
+    __dirty = False
+
+    # Counter name -> (log file, id column) used to seed it
+    __SEED_SOURCES = {
+        'session': [("game_data/ingredient_used.csv", 'session_id'),
+                    ("game_data/total_time_per_dish.csv", 'session_id')],
+        'keystroke': [("game_data/keystroke_per_dish.csv", 'id')],
+    }
+
+    @classmethod
+    def set_persistent(cls, persistent):
+        """Save counters to the sidecar file, or keep them in memory only."""
+        if not persistent:
+            cls.save()  # Ids handed out so far were meant to be kept
+        with cls.__LOCK:
+            if persistent and not cls.__persistent:
+                cls.__values = None  # Drop the in-memory ids, reload the saved counters
+                cls.__current_session = None
+                cls.__dirty = False
+            cls.__persistent = persistent
+
+    @classmethod
+    def next_value(cls, name):
+        """Allocate the next value of a counter. It is saved by the next save()."""
+        with cls.__LOCK:
+            values = cls.__load()
+            values[name] = values.get(name, 0) + 1
+            cls.__dirty = True
+            return values[name]
+
+    @classmethod
+    def save(cls):
+        """Write the counters to the sidecar file if they changed. Called off the frame thread."""
+        with cls.__SAVE_LOCK:
+            with cls.__LOCK:
+                if not cls.__dirty or not cls.__persistent:
+                    return
+                values = dict(cls.__values)
+                cls.__dirty = False
+            cls.__write(values)
+
+    @classmethod
+    def new_session(cls):
+        """Start a new session; every logger shares its id until the next call."""
+        session_id = cls.next_value('session')
+        cls.__current_session = session_id
+        return session_id
+
+    @classmethod
+    def current_session_id(cls):
+        """The id of the running session, or the id the next session will get if none was started."""
+        if cls.__current_session is not None:
+            return cls.__current_session
+        with cls.__LOCK:
+            return cls.__load().get('session', 0) + 1
+
+    @classmethod
+    def __load(cls):
+        if cls.__values is not None:
+            return cls.__values
+
+        file_name = Config.get_config('SEQUENCE_FILE')
+        try:
+            with open(file_name, 'r') as file:
+                cls.__values = {name: int(value) for name, value in json.load(file).items()}
+        except (FileNotFoundError, ValueError, AttributeError):
+            cls.__values = cls.__seed_from_logs()
+            cls.__dirty = True  # Created by the next save()
+        return cls.__values
+
+    @classmethod
+    def __write(cls, values):
+        file_name = Config.get_config('SEQUENCE_FILE')
+        temp_name = file_name + ".tmp"
+        try:
+            with open(temp_name, 'w') as file:
+                json.dump(values, file, indent=2, sort_keys=True)
+            os.replace(temp_name, file_name)  # Never leaves a half-written counter file
+        except OSError as e:
+            print(f"Error saving session sequence: {e}")
+
+    @classmethod
+    def __seed_from_logs(cls):
+        """One-time scan of the existing logs for the highest id of each counter."""
+        values = {}
+        for name, sources in cls.__SEED_SOURCES.items():
+            highest = 0
+            for file_name, column in sources:
+                if not os.path.exists(file_name):
+                    continue
+                with open(file_name, 'r', newline='') as file:
+                    reader = csv.DictReader(file, skipinitialspace=True)
+                    for row in reader:
+                        value = (row.get(column) or '').strip()
+                        if value.isdigit():
+                            highest = max(highest, int(value))
+            values[name] = highest
+        return values
+
+
+atexit.register(SessionSequence.save)  # Ids handed out after the last telemetry batch
@@ -0,0 +1,75 @@
+import argparse
+import random
+import time
+
+import pygame as pg
+
+from file_game.cooking_app import GameApp
+from file_game.cooking_config import Config
+from file_game.cooking_telemetry import Telemetry
+
+
+MOVEMENT_KEYS = [pg.K_w, pg.K_a, pg.K_s, pg.K_d]
+
+
+def idle_policy(app, step):
+    """The chef stands still."""
+
+
+def random_walk_policy(app, step, change_every=30):
+    """The chef walks in a random direction, changing every few steps."""
+    if step % change_every:
+        return
+    for key in MOVEMENT_KEYS:
+        pg.event.post(pg.event.Event(pg.KEYUP, key=key, mod=0, unicode='', scancode=0))
+    key = random.choice(MOVEMENT_KEYS)
+    pg.event.post(pg.event.Event(pg.KEYDOWN, key=key, mod=0, unicode='', scancode=0))
+
+
+POLICIES = {
+    'idle': idle_policy,
+    'random': random_walk_policy,
+}
+
+
+def run_sessions(sessions, seed=0, step_ms=None, policy='idle', telemetry=False):
+    """Simulate a batch of sessions and return one summary dict per session.
+
+    Telemetry is off by default so simulated play does not end up in game_data.
+    """
+    Telemetry.set_enabled(telemetry)
+    app = GameApp(headless=True)
+    results = []
+    for session in range(sessions):
+        random.seed(seed + session)  # Each session is reproducible on its own
+        result = app.simulate(step_ms=step_ms, policy=POLICIES[policy])
+        result['seed'] = seed + session
+        results.append(result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run headless Apocalypse Cooker sessions on a virtual clock.")
+    parser.add_argument('--sessions', type=int, default=100, help="number of sessions to simulate")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first session")
+    parser.add_argument('--step-ms', type=int, default=1000 // Config.get_config('FPS'),
+                        help="virtual milliseconds per update step")
+    parser.add_argument('--policy', choices=sorted(POLICIES), default='idle', help="how the chef is controlled")
+    parser.add_argument('--telemetry', action='store_true', help="write simulated play to the game_data logs")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = run_sessions(args.sessions, args.seed, args.step_ms, args.policy, args.telemetry)
+    elapsed = time.perf_counter() - start
+
+    scores = [result['score'] for result in results]
+    timed_out = sum(result['timed_out'] for result in results)
+    print(f"Simulated {len(results)} sessions in {elapsed:.1f}s "
+          f"({len(results) / elapsed * 60:.0f} sessions/minute)")
+    print(f"Score: mean {sum(scores) / len(scores):.1f}, min {min(scores)}, max {max(scores)}")
+    print(f"Ended by timer: {timed_out}, ended by zombie: {len(results) - timed_out}")
+    print(f"Mean session length: {sum(r['duration_ms'] for r in results) / len(results) / 1000:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,206 @@
+import math
+
+import numpy as np
+
+from file_game.cooking_config import Config
+
+
+class SpatialGrid:
+    """Uniform grid index over everything that has a position in the kitchen.
+
+    The cells are Config 'GRID_SIZE_W' x 'GRID_SIZE_H' pixels. Single
+    entities (chef, stations, dropped items) are inserted, moved and removed
+    one by one and stored in every cell their rect touches. Array-backed
+    entities such as the ZombieHorde are set as a whole layer each step:
+    their top-left cells are sorted once with NumPy and looked up with
+    searchsorted. Queries only visit the cells around the point or rect,
+    so their cost does not grow with the number of entities elsewhere.
+
+    Positions are top-left corners, like the rest of the game, and
+    distances for nearest() are measured between those corners.
+    """
+
+    def __init__(self, cell_width=None, cell_height=None):
+        self.__cell_width = cell_width or Config.get_config('GRID_SIZE_W')
+        self.__cell_height = cell_height or Config.get_config('GRID_SIZE_H')
+        self.__cells = {}  # kind -> {(cell x, cell y) -> {entity: None}}, an insertion-ordered set per cell
+        self.__entries = {}  # entity -> [kind, x, y, width, height, cells]
+        self.__layers = {}  # kind -> (sorted cell keys, row order, positions, width, height)
+
+    def __cell_range(self, x, y, width, height):
+        cw, ch = self.__cell_width, self.__cell_height
+        return (math.floor(x / cw), math.floor((x + width) / cw),
+                math.floor(y / ch), math.floor((y + height) / ch))
+
+    # Single entities
+
+    def insert(self, entity, kind, x, y, width=0, height=0):
+        """Register a hashable entity (an object, or a name for fixtures that have none)."""
+        if entity in self.__entries:
+            self.remove(entity)
+        x0, x1, y0, y1 = self.__cell_range(x, y, width, height)
+        cells = [(cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1)]
+        kind_cells = self.__cells.setdefault(kind, {})
+        for cell in cells:
+            kind_cells.setdefault(cell, {})[entity] = None
+        self.__entries[entity] = [kind, x, y, width, height, cells]
+
+    def move(self, entity, x, y):
+        """Update an entity's position; only touches the cells if it crossed a cell border."""
+        entry = self.__entries[entity]
+        kind, old_x, old_y, width, height, cells = entry
+        if self.__cell_range(x, y, width, height) == self.__cell_range(old_x, old_y, width, height):
+            entry[1], entry[2] = x, y
+        else:
+            self.insert(entity, kind, x, y, width, height)
+
+    def remove(self, entity):
+        entry = self.__entries.pop(entity, None)
+        if entry is None:
+            return
+        kind_cells = self.__cells[entry[0]]
+        for cell in entry[5]:
+            bucket = kind_cells[cell]
+            del bucket[entity]
+            if not bucket:
+                del kind_cells[cell]
+
+    def contains(self, entity):
+        return entity in self.__entries
+
+    def get_position(self, entity):
+        entry = self.__entries[entity]
+        return entry[1], entry[2]
+
+    # Array-backed layers
+
+    def set_layer(self, kind, positions, width, height):
+        """Replace every entity of a kind with the rows of an (N, 2) position array.
+        Queries return the row index as the entity."""
+        positions = np.asarray(positions, dtype=float)
+        cell_x = np.floor(positions[:, 0] / self.__cell_width).astype(np.int64)
+        cell_y = np.floor(positions[:, 1] / self.__cell_height).astype(np.int64)
+        keys = self.__layer_keys(cell_x, cell_y)
+        order = np.argsort(keys, kind='stable')
+        self.__layers[kind] = (keys[order], order, positions, width, height)
+
+    @staticmethod
+    def __layer_keys(cell_x, cell_y):
+        # One int64 per cell; the offset keeps off-screen (negative) cells distinct
+        return (cell_x + (1 << 20)) * (1 << 21) + (cell_y + (1 << 20))
+
+    def remove_layer(self, kind):
+        self.__layers.pop(kind, None)
+
+    def __layer_candidates(self, kind, x0, x1, y0, y1):
+        """Rows of a layer whose top-left cell is in the cell range."""
+        keys, order, positions, width, height = self.__layers[kind]
+        # The keys of one cell column are consecutive, so each column is a single slice
+        columns = np.arange(x0, x1 + 1)
+        starts = np.searchsorted(keys, self.__layer_keys(columns, y0), side='left')
+        ends = np.searchsorted(keys, self.__layer_keys(columns, y1), side='right')
+        slices = [order[start:end] for start, end in zip(starts.tolist(), ends.tolist()) if end > start]
+        if not slices:
+            return order[:0]
+        return slices[0] if len(slices) == 1 else np.concatenate(slices)
+
+    @staticmethod
+    def __ring(ring, max_x, max_y):
+        """Cell offsets at Chebyshev distance ring from the centre, clipped to +-max_x, +-max_y."""
+        if ring == 0:
+            yield 0, 0
+            return
+        if ring <= max_y:
+            for dx in range(-min(ring, max_x), min(ring, max_x) + 1):
+                yield dx, -ring
+                yield dx, ring
+        if ring <= max_x:
+            inner = min(ring - 1, max_y)
+            for dy in range(-inner, inner + 1):
+                yield -ring, dy
+                yield ring, dy
+
+    # Queries
+
+    def __kind_cells(self, kinds):
+        if kinds is None:
+            return list(self.__cells.values())
+        return [self.__cells[kind] for kind in kinds if kind in self.__cells]
+
+    def nearest(self, x, y, radius, kinds=None):
+        """(entity, kind, distance) of the closest entity within radius of (x, y), optionally
+        only of the given kinds, or (None, None, inf) if there is none."""
+        best = (None, None, float('inf'))
+        cw, ch = self.__cell_width, self.__cell_height
+        center_x, center_y = math.floor(x / cw), math.floor(y / ch)
+        max_x, max_y = math.ceil(radius / cw), math.ceil(radius / ch)
+        cell_step = min(cw, ch)
+
+        # Rings of cells outward from the point. Everything filed beyond ring r is at least
+        # r cells away, so the search stops as soon as the best match is closer than that.
+        kind_cells = self.__kind_cells(kinds)
+        entries = self.__entries
+        seen = set()
+        for ring in range(max(max_x, max_y) + 1 if kind_cells else 0):
+            for dx, dy in self.__ring(ring, max_x, max_y):
+                cell = (center_x + dx, center_y + dy)
+                for cells in kind_cells:
+                    for entity in cells.get(cell, ()):
+                        if entity in seen:
+                            continue
+                        seen.add(entity)
+                        kind, entity_x, entity_y = entries[entity][:3]
+                        distance = math.hypot(entity_x - x, entity_y - y)
+                        if distance <= radius and distance < best[2]:
+                            best = (entity, kind, distance)
+            if best[2] <= ring * cell_step:
+                break
+
+        for kind in self.__layers:
+            if kinds is not None and kind not in kinds:
+                continue
+            rows = self.__layer_candidates(kind, center_x - max_x, center_x + max_x,
+                                           center_y - max_y, center_y + max_y)
+            if not len(rows):
+                continue
+            positions = self.__layers[kind][2][rows]
+            distances = np.hypot(positions[:, 0] - x, positions[:, 1] - y)
+            i = int(np.argmin(distances))
+            if distances[i] <= radius and distances[i] < best[2]:
+                best = (int(rows[i]), kind, float(distances[i]))
+        return best
+
+    def query_rect(self, rect, kinds=None):
+        """[(entity, kind)] for every entity whose rect overlaps rect (anything with x, y, w, h)."""
+        rx, ry, rw, rh = rect[0], rect[1], rect[2], rect[3]
+        found = []
+        x0, x1, y0, y1 = self.__cell_range(rx, ry, rw, rh)
+        seen = set()
+        for cells in self.__kind_cells(kinds):
+            for cx in range(x0, x1 + 1):
+                for cy in range(y0, y1 + 1):
+                    for entity in cells.get((cx, cy), ()):
+                        if entity in seen:
+                            continue
+                        seen.add(entity)
+                        kind, x, y, width, height = self.__entries[entity][:5]
+                        if x <= rx + rw and rx <= x + width and y <= ry + rh and ry <= y + height:
+                            found.append((entity, kind))
+
+        for kind, (keys, order, positions, width, height) in self.__layers.items():
+            if kinds is not None and kind not in kinds:
+                continue
+            # A layer entity is only filed under its top-left cell, so look that far up and left
+            lx0, lx1, ly0, ly1 = self.__cell_range(rx - width, ry - height, rw + width, rh + height)
+            rows = self.__layer_candidates(kind, lx0, lx1, ly0, ly1)
+            if not len(rows):
+                continue
+            x, y = positions[rows, 0], positions[rows, 1]
+            overlap = (x < rx + rw) & (x + width > rx) & (y < ry + rh) & (y + height > ry)
+            found.extend((int(row), kind) for row in rows[overlap])
+        return found
+
+    def clear(self):
+        self.__cells.clear()
+        self.__entries.clear()
+        self.__layers.clear()
@@ -0,0 +1,81 @@
+import importlib
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupTimer:
+    """Records how long each import and startup phase takes.
+
+    A phase measured inside another one (Config.preload() inside GameApp())
+    is recorded as nested under it, so its time is not counted twice.
+    """
+    __TIMINGS = []  # (label, seconds, background, parent label or None)
+    __LOCK = threading.Lock()
+    __OPEN = threading.local()  # Labels of the phases being measured on this thread, outermost first
+
+    @classmethod
+    def record(cls, label, seconds, background=False, parent=None):
+        with cls.__LOCK:
+            cls.__TIMINGS.append((label, seconds, background, parent))
+
+    @classmethod
+    @contextmanager
+    def measure(cls, label, background=False):
+        """Time the body of a with-block under the given label."""
+        stack = cls.__OPEN.__dict__.setdefault('labels', [])
+        parent = stack[-1] if stack else None
+        stack.append(label)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            stack.pop()
+            cls.record(label, time.perf_counter() - start, background, parent)
+
+    @classmethod
+    def import_module(cls, name, background=False):
+        """Import a module and record its cost (only what was not already loaded)."""
+        with cls.measure(f"import {name}", background):
+            return importlib.import_module(name)
+
+    @classmethod
+    def get_timings(cls):
+        with cls.__LOCK:
+            return list(cls.__TIMINGS)
+
+    @classmethod
+    def report(cls):
+        """Return a printable table of all recorded timings, slowest first.
+
+        Nested phases are listed indented under their parent. Only top-level
+        phases count towards the total, and background phases do not count
+        at all, since they do not delay the first frame.
+        """
+        timings = cls.get_timings()
+        total = sum(seconds for _, seconds, background, parent in timings if not background and parent is None)
+        children = {}
+        for timing in timings:
+            children.setdefault(timing[3], []).append(timing)
+
+        rows = []  # (indented label, seconds, background)
+
+        def add_rows(parent, depth):
+            for label, seconds, background, _ in sorted(children.get(parent, []), key=lambda item: item[1],
+                                                        reverse=True):
+                rows.append(('  ' * depth + label, seconds, background))
+                if label != parent:  # A phase nested in one with the same label would loop forever
+                    add_rows(label, depth + 1)
+
+        add_rows(None, 0)
+        width = max((len(label) for label, _, _ in rows), default=10) + len(' (background)')
+
+        lines = ["Startup timing report:"]
+        for label, seconds, background in rows:
+            if background:
+                lines.append(f"  {label + ' (background)':<{width}}  {seconds * 1000:8.1f} ms")
+                continue
+            share = (seconds / total * 100) if total else 0
+            lines.append(f"  {label:<{width}}  {seconds * 1000:8.1f} ms  {share:5.1f}%")
+        lines.append(f"  {'total':<{width}}  {total * 1000:8.1f} ms")
+        return "\n".join(lines)
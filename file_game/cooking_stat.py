@@ -1,11 +1,13 @@
 import tkinter as tk
 from tkinter import ttk
-import matplotlib.pyplot as plt
+from concurrent.futures import ThreadPoolExecutor
+import threading
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import pandas as pd
-import numpy as np
-import os
-import seaborn as sns
+from file_game.cooking_storage import Storage
+from file_game.cooking_aggregates import AggregateCache
+from file_game import cooking_charts
+from file_game.cooking_table import VirtualTable
 
 
 class StatsWindow:
@@ -14,6 +16,13 @@ class StatsWindow:
         self.root.title("Statistics Window")
         self.root.geometry("1000x630")
 
+        # Logs are read through the configured storage backend (CSV files or SQLite)
+        self.store = Storage.get_store()
+
+        # Totals are cached next to the logs, refreshed once by the first tab that needs them
+        self.aggregates = None
+        self.__aggregates_lock = threading.Lock()
+
         # Configure style tabs
         style = ttk.Style()
         style.configure("TNotebook", font=("Arial", 20))
@@ -22,24 +31,131 @@ class StatsWindow:
         self.font_topic = ("Arial", 14)
 
         # Notebook = Tabs
-        tab_control = ttk.Notebook(self.root)
+        self.__tab_control = ttk.Notebook(self.root)
+
+        # Tab title, loader (worker thread: data and figures), builder (Tk thread: widgets)
+        self.__tabs = [
+            ('Overall Stats', self.load_overall_stats, self.overall_stats_tab),
+            ('Keystroke Analysis', self.load_keystrokes, self.create_keystroke_tab),
+            ('Order Analysis', self.load_orders, self.create_order_per_dish_tab),
+            ('Mistakes', self.load_mistakes, self.create_mistake_tab),
+            ('Ingredients Used', self.load_ingredients_used, self.create_ingredients_used_tab),
+            ('Time per Dish', self.load_total_time_per_dish, self.create_total_time_per_dish_tab),
+        ]
+
+        # Tabs start as placeholders and are built the first time they are selected
+        self.__frames = []
+        for title, _, _ in self.__tabs:
+            tab = ttk.Frame(self.__tab_control)
+            self.__tab_control.add(tab, text=title)
+            ttk.Label(tab, text="Loading...", font=self.font_topic).pack(pady=40)
+            self.__frames.append(tab)
 
-        # Create tabs
-        self.overall_stats_tab(tab_control)
-        self.create_keystroke_tab(tab_control)
-        self.create_order_per_dish_tab(tab_control)
-        self.create_mistake_tab(tab_control)
-        self.create_ingredients_used_tab(tab_control)
-        self.create_total_time_per_dish_tab(tab_control)
+        self.__executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stats-loader")
+        self.__loading = {}  # Tab index -> future of its loader
+        self.__built = set()
 
-        tab_control.pack(expand=1, fill="both")
+        self.__tab_control.bind("<<NotebookTabChanged>>", self.__on_tab_changed)
+        self.__tab_control.pack(expand=1, fill="both")
+        self.root.after_idle(self.__on_tab_changed)
 
         self.root.mainloop()
+        self.__executor.shutdown(wait=False, cancel_futures=True)
+
+    def __on_tab_changed(self, event=None):
+        index = self.__tab_control.index('current')
+        if index in self.__loading or index in self.__built:
+            return
+
+        _, loader, _ = self.__tabs[index]
+        self.__loading[index] = self.__executor.submit(loader)
+        if len(self.__loading) == 1:
+            self.root.after(50, self.__poll_loaders)
+
+    def __poll_loaders(self):
+        """Build the tabs whose data is ready; Tk widgets may only be touched from this thread."""
+        for index, future in list(self.__loading.items()):
+            if not future.done():
+                continue
+            del self.__loading[index]
+            self.__built.add(index)
+
+            tab = self.__frames[index]
+            for child in tab.winfo_children():
+                child.destroy()  # Remove the placeholder
+
+            try:
+                data = future.result()
+            except Exception as e:
+                ttk.Label(tab, text=f"Error loading data: {str(e)}", foreground="red", wraplength=800).pack(pady=10)
+                continue
+            _, _, builder = self.__tabs[index]
+            builder(tab, data)
+
+        if self.__loading:
+            self.root.after(50, self.__poll_loaders)
+
+    def get_aggregates(self):
+        """Cached totals, with rows added since the last opening folded in on first use."""
+        with self.__aggregates_lock:
+            if self.aggregates is None:
+                self.aggregates = AggregateCache(self.store).refresh()
+            return self.aggregates
+
+    # Loaders run on the worker thread: they read the logs and make the figures but create no widgets
+
+    def load_overall_stats(self):
+        # Everything on this tab comes from the cached aggregates
+        aggregates = self.get_aggregates()
+        return {
+            'overview': aggregates.get_overview(cooking_charts.DISH_COLUMNS),
+            'figure': cooking_charts.overview_figure(aggregates.get('order_per_session'), aggregates.get('mistake'),
+                                                     aggregates.get('keystroke_per_dish')),
+        }
+
+    def load_keystrokes(self):
+        df = self.store.read('keystroke_per_dish')
+        return {'df': df, 'figure': cooking_charts.keystroke_figure(df, self.get_aggregates().get_keystroke_stats())}
+
+    def load_orders(self):
+        df = self.store.read('order_per_session')
+        # Convert timestamps
+        df['session_start'] = pd.to_datetime(df['session_start'])
+        df['session_end'] = pd.to_datetime(df['session_end'])
+        df['duration_sec'] = (df['session_end'] - df['session_start']).dt.total_seconds()
+        return {'df': df, 'figure': cooking_charts.order_figure(df)}
+
+    def load_mistakes(self):
+        df = self.store.read('mistake')
+
+        # Occurrences per mistake type, from the cached aggregates
+        mistake_counts = pd.Series(self.get_aggregates().get('mistake')['types']).sort_values(ascending=False)
+        return {'df': df, 'figure': cooking_charts.mistake_figure(mistake_counts)}
+
+    def load_ingredients_used(self):
+        df = self.store.read('ingredient_used')
+
+        # Quantities taken per ingredient, from the cached aggregates
+        total_taken = pd.Series(self.get_aggregates().get('ingredient_used')['taken'], dtype=int).sort_index()
+        figure = cooking_charts.ingredient_figure(total_taken) if not total_taken.empty else None
+        return {'df': df, 'total_taken': total_taken, 'figure': figure}
+
+    def load_total_time_per_dish(self):
+        aggregates = self.get_aggregates()
+        stats = pd.DataFrame(aggregates.get_prep_time_stats(),
+                             columns=['dish_type', 'count', 'mean', 'median', 'min', 'max', 'std'])
+        if stats.empty:
+            return {'stats': stats, 'figure': None}
+
+        # Rebuild the distribution for the box plot from the cached value counts
+        df = pd.DataFrame([(dish, seconds) for dish in stats['dish_type']
+                           for seconds in aggregates.get_prep_time_values(dish)],
+                          columns=['dish_type', 'preparation_time_seconds'])
+        return {'stats': stats, 'figure': cooking_charts.prep_time_figure(df)}
 
-    def overall_stats_tab(self, tab_control):
-        tab = ttk.Frame(tab_control)
-        tab_control.add(tab, text='Overall Stats')
+    # Builders run on the Tk thread once their loader has finished
 
+    def overall_stats_tab(self, tab, data):
         # Main container with scrollbar
         main_frame = ttk.Frame(tab)
         main_frame.pack(fill=tk.BOTH, expand=True)
@@ -60,45 +176,15 @@ class StatsWindow:
                   font=("Arial", 16, "bold")).pack(pady=20)
 
         try:
-            # Load all relevant data
-            base_path = os.path.dirname(__file__)
-            keystroke_csv_path = os.path.join(base_path, '..', 'game_data', 'keystroke_per_dish.csv')
-            order_csv_path = os.path.join(base_path, '..', 'game_data', 'order_per_session.csv')
-            mistake_csv_path = os.path.join(base_path, '..', 'game_data', 'mistake.csv')
-            ingredient_csv_path = os.path.join(base_path, '..', 'game_data', 'ingredient_used.csv')
-
-            order_df = pd.read_csv(order_csv_path, skipinitialspace=True)
-            mistake_df = pd.read_csv(mistake_csv_path, skipinitialspace=True)
-            ingredient_df = pd.read_csv(ingredient_csv_path, skipinitialspace=True)
-            keystroke_df = pd.read_csv(keystroke_csv_path, skipinitialspace=True)
-
-
-            # Calculate basic stats
-            total_sessions = len(order_df)
-            max_score = order_df['total_score'].max()
-            avg_score = order_df['total_score'].mean() if 'total_score' in order_df.columns else 0
-
-            # Calculate total orders safely
-            dish_columns = [col for col in
-                            ['sandwich', 'egg fried', 'chicken fried', 'lamb fried', 'chicken drumpstick fried']
-                            if col in order_df.columns]
-            total_orders = order_df[dish_columns].sum().sum() if dish_columns else 0
-
-            # Calculate time metrics safely
-            if all(col in order_df.columns for col in ['session_start', 'session_end']):
-                order_df['session_start'] = pd.to_datetime(order_df['session_start'])
-                order_df['session_end'] = pd.to_datetime(order_df['session_end'])
-                order_df['duration'] = (order_df['session_end'] - order_df['session_start']).dt.total_seconds()
-                total_time = order_df['duration'].sum()
-                avg_time = order_df['duration'].mean()
-            else:
-                total_time = 0
-                avg_time = 0
-
-            # Calculate other metrics safely
-            total_mistakes = len(mistake_df) if mistake_df is not None else 0
-            total_keystrokes = keystroke_df[
-                'total_key'].sum() if keystroke_df is not None and 'total_key' in keystroke_df.columns else 0
+            overview = data['overview']
+            total_sessions = overview['total_sessions']
+            max_score = overview['max_score']
+            avg_score = overview['avg_score']
+            total_orders = overview['total_orders']
+            total_time = overview['total_time']
+            avg_time = overview['avg_time']
+            total_mistakes = overview['total_mistakes']
+            total_keystrokes = overview['total_keystrokes']
 
             # Create stats frame
             stats_frame = ttk.Frame(content_frame, padding=10)
@@ -127,59 +213,8 @@ class StatsWindow:
                 ttk.Label(stats_frame, text=value_str, font=("Arial", 10)).grid(
                     row=i // 2, column=(i % 2) * 2 + 1, padx=10, pady=5, sticky="nsew")
 
-            # Add visualizations only if we have data
-            fig = plt.Figure(figsize=(10, 8))
-            gs = fig.add_gridspec(2, 2)
-
-            # Score distribution (if available)
-            ax1 = fig.add_subplot(gs[0, 0])
-            if 'total_score' in order_df.columns:
-                ax1.hist(order_df['total_score'], bins=10, color='skyblue', edgecolor='black')
-                ax1.set_title('Score Distribution per Session')
-                ax1.set_xlabel('Score')
-                ax1.set_ylabel('Frequency')
-            else:
-                ax1.text(0.5, 0.5, 'No score data available', ha='center', va='center')
-                ax1.set_axis_off()
-
-            # Time vs Score (if available)
-            ax2 = fig.add_subplot(gs[0, 1])
-            if all(col in order_df.columns for col in ['duration', 'total_score']):
-                ax2.scatter(order_df['duration'], order_df['total_score'], alpha=0.6)
-                ax2.set_title('Session Duration vs Score')
-                ax2.set_xlabel('Duration (seconds)')
-                ax2.set_ylabel('Score')
-            else:
-                ax2.text(0.5, 0.5, 'No duration/score data', ha='center', va='center')
-                ax2.set_axis_off()
-
-            # Mistake types (if available)
-            ax3 = fig.add_subplot(gs[1, 0])
-            if mistake_df is not None and 'mistake_type' in mistake_df.columns:
-                mistake_counts = mistake_df['mistake_type'].value_counts()
-                ax3.bar(mistake_counts.index, mistake_counts.values, color='salmon')
-                ax3.set_title('Mistake Types')
-                ax3.tick_params(axis='x', rotation=45)
-            else:
-                ax3.text(0.5, 0.5, 'No mistake data', ha='center', va='center')
-                ax3.set_axis_off()
-
-            # Keystroke distribution (if available)
-            ax4 = fig.add_subplot(gs[1, 1])
-            if keystroke_df is not None and all(col in keystroke_df.columns for col in ['up', 'down', 'left', 'right']):
-                keystroke_cols = [col for col in ['up', 'down', 'left', 'right'] if col in keystroke_df.columns]
-                if keystroke_cols:
-                    keystroke_totals = keystroke_df[keystroke_cols].sum()
-                    ax4.pie(keystroke_totals, labels=keystroke_totals.index, autopct='%1.1f%%')
-                    ax4.set_title('Keystroke Distribution')
-            else:
-                ax4.text(0.5, 0.5, 'No keystroke data', ha='center', va='center')
-                ax4.set_axis_off()
-
-            fig.tight_layout(pad=3.0)
-
             # Embed in tkinter
-            chart_canvas = FigureCanvasTkAgg(fig, master=content_frame)
+            chart_canvas = FigureCanvasTkAgg(data['figure'], master=content_frame)
             chart_canvas.draw()
             chart_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
@@ -201,22 +236,12 @@ class StatsWindow:
             bind_mousewheel(chart_canvas.get_tk_widget())
 
         except Exception as e:
-            error_msg = f"Error loading data: {str(e)}\n\nAvailable columns in order_per_session.csv:\n"
-            try:
-                if os.path.exists('order_per_session.csv'):
-                    test_df = pd.read_csv('order_per_session.csv')
-                    error_msg += f"{', '.join(test_df.columns)}"
-            except:
-                error_msg += "Could not read file"
-                ttk.Label(content_frame,
-                          text=error_msg,
-                          foreground="red",
-                          wraplength=800).pack()
-
-    def create_keystroke_tab(self, tab_control):
-        tab = ttk.Frame(tab_control)
-        tab_control.add(tab, text='Keystroke Analysis')
+            ttk.Label(content_frame,
+                      text=f"Error loading data: {str(e)}",
+                      foreground="red",
+                      wraplength=800).pack()
 
+    def create_keystroke_tab(self, tab, data):
         # Create main container with scrollbar
         main_frame = ttk.Frame(tab)
         main_frame.pack(fill=tk.BOTH, expand=True)
@@ -231,66 +256,10 @@ class StatsWindow:
         scrollable_frame = ttk.Frame(canvas)
         canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
 
-        base_path = os.path.dirname(__file__)
-        csv_path = os.path.join(base_path, '..', 'game_data', 'keystroke_per_dish.csv')
-
-        df = pd.read_csv(csv_path, skipinitialspace=True)
-        x = range(1, len(df) + 1)
-
-        # Create figure with custom grid layout
-        fig = plt.Figure(figsize=(10, 8), dpi=100)
-        gs = fig.add_gridspec(2, 2, width_ratios=[3, 1], height_ratios=[1, 1])
-
-        # Top-left: Total keystrokes trend
-        ax1 = fig.add_subplot(gs[0, 0])
-        ax1.plot(x, df['total_key'], marker='o', color='steelblue', linewidth=2)
-        ax1.set_ylabel('Total Keystrokes')
-        ax1.set_title('Total Keystrokes Trend')
-        ax1.set_xticks(x)
-        ax1.set_xticklabels(df['id'].astype(str), rotation=90)
-        ax1.xaxis.set_major_formatter(plt.NullFormatter())
-        ax1.grid(True, linestyle='--', alpha=0.6)
-
-        # Top-right: Statistics table
-        ax2 = fig.add_subplot(gs[0, 1])
-        ax2.axis('off')  # Hide axes for table
-
-        stats_data = [
-            ["Mean", f"{df['total_key'].mean():.2f}"],
-            ["Median", f"{df['total_key'].median():.2f}"],
-            ["Std Dev", f"{df['total_key'].std():.2f}"],
-            ["Min", f"{df['total_key'].min()}"],
-            ["Max", f"{df['total_key'].max()}"],
-            ["Total", f"{df['total_key'].sum()}"]
-        ]
-
-        table = ax2.table(
-            cellText=stats_data,
-            colLabels=["Statistic", "Value"],
-            loc='center',
-            cellLoc='center',
-            colWidths=[0.4, 0.4]
-        )
-        table.auto_set_font_size(False)
-        table.set_fontsize(10)
-        table.scale(1, 1.5)
-
-        # Bottom: Individual key trends (full width)
-        ax3 = fig.add_subplot(gs[1, :])
-        ax3.plot(x, df['up'], marker='o', label='Up', color='skyblue')
-        ax3.plot(x, df['down'], marker='o', label='Down', color='salmon')
-        ax3.plot(x, df['left'], marker='o', label='Left', color='lightgreen')
-        ax3.plot(x, df['right'], marker='o', label='Right', color='orange')
-        ax3.set_xlabel('Dish ID')
-        ax3.set_ylabel('Keystroke Count')
-        ax3.set_title('Keystroke Trends by Direction')
-        ax3.legend()
-        ax3.grid(True, linestyle='--', alpha=0.6)
-
-        fig.tight_layout(pad=3.0)
+        df = data['df']
 
         # Embed in tkinter
-        chart_canvas = FigureCanvasTkAgg(fig, master=scrollable_frame)
+        chart_canvas = FigureCanvasTkAgg(data['figure'], master=scrollable_frame)
         chart_canvas.draw()
         chart_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
@@ -304,15 +273,8 @@ class StatsWindow:
         table_frame = ttk.Frame(table_container)
         table_frame.pack(fill=tk.BOTH, expand=True)
 
-        tree = ttk.Treeview(table_frame, columns=list(df.columns), show='headings', height=8)
-
-        for col in df.columns:
-            tree.heading(col, text=col)
-            tree.column(col, anchor=tk.CENTER, width=120)
-
-        for _, row in df.iterrows():
-            tree.insert("", tk.END, values=list(row))
-
+        # Only the rows in view are handed to Tk, sorting and filtering happen on the DataFrame's arrays
+        tree = VirtualTable(table_frame, df, height=8, column_width=120)
         tree.pack(fill=tk.BOTH, expand=True)
 
         # Update scroll region
@@ -333,10 +295,7 @@ class StatsWindow:
         bind_mousewheel(scrollable_frame)
         bind_mousewheel(chart_canvas.get_tk_widget())
 
-    def create_order_per_dish_tab(self, tab_control):
-        tab = ttk.Frame(tab_control)
-        tab_control.add(tab, text='Order Analysis')
-
+    def create_order_per_dish_tab(self, tab, data):
         # Configure grid to expand
         tab.rowconfigure(0, weight=1)
         tab.columnconfigure(0, weight=1)
@@ -370,55 +329,14 @@ class StatsWindow:
         def _on_mousewheel(event):
             canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
 
-        # Universal mousewheel binding for scrollable_frame
-        def bind_mousewheel(widget):
-            widget.bind("<Enter>", lambda e: canvas.bind_all("<MouseWheel>", _on_mousewheel))
-            widget.bind("<Leave>", lambda e: canvas.unbind_all("<MouseWheel>"))
-
         # --- Content begins here ---
         label = ttk.Label(scrollable_frame, text="Order Patterns Across Sessions", font=self.font_topic)
         label.pack(pady=20)
 
-        # Load CSV
-        base_path = os.path.dirname(__file__)
-        csv_path = os.path.join(base_path, '..', 'game_data', 'order_per_session.csv')
-
-        df = pd.read_csv(csv_path, skipinitialspace=True)
-        # Convert timestamps
-        df['session_start'] = pd.to_datetime(df['session_start'])
-        df['session_end'] = pd.to_datetime(df['session_end'])
-        df['duration_sec'] = (df['session_end'] - df['session_start']).dt.total_seconds()
-
-        dish_columns = ['sandwich', 'egg fried', 'chicken fried', 'lamb fried', 'chicken drumpstick fried']
-
-        # Plot
-        fig, ax = plt.subplots(figsize=(10, 6))
-        markers = ['o', 's', 'D', '^', 'v']
-        colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd']
-
-        for i, dish in enumerate(dish_columns):
-            ax.scatter(
-                x=df['duration_sec'],
-                y=df[dish] * df['total_score'],
-                label=dish.title(),
-                marker=markers[i],
-                color=colors[i],
-                s=100,
-                alpha=0.7,
-                edgecolors='w'
-            )
-            z = np.polyfit(df['duration_sec'], df[dish] * df['total_score'], 1)
-            p = np.poly1d(z)
-            ax.plot(df['duration_sec'], p(df['duration_sec']), '--', alpha=0.3)
-
-        ax.set_title('Order Patterns by Session Duration', pad=20)
-        ax.set_xlabel('Session Duration (seconds)')
-        ax.set_ylabel('Order Value (Count × Score)')
-        ax.grid(True, linestyle=':', alpha=0.3)
-        ax.legend(title="Dish Types")
+        df = data['df']
 
         # Embed plot
-        canvas_plot = FigureCanvasTkAgg(fig, master=scrollable_frame)
+        canvas_plot = FigureCanvasTkAgg(data['figure'], master=scrollable_frame)
         canvas_plot.draw()
         canvas_plot.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
@@ -432,15 +350,8 @@ class StatsWindow:
         table_frame = ttk.Frame(table_container)
         table_frame.pack(fill=tk.BOTH, expand=True)
 
-        tree = ttk.Treeview(table_frame, columns=list(df.columns), show='headings', height=8)
-
-        for col in df.columns:
-            tree.heading(col, text=col)
-            tree.column(col, anchor=tk.CENTER, width=120)
-
-        for _, row in df.iterrows():
-            tree.insert("", tk.END, values=list(row))
-
+        # Only the rows in view are handed to Tk, sorting and filtering happen on the DataFrame's arrays
+        tree = VirtualTable(table_frame, df, height=8, column_width=120)
         tree.pack(fill=tk.BOTH, expand=True)
 
         # Universal mousewheel binding for scrollable_frame
@@ -452,10 +363,7 @@ class StatsWindow:
         bind_mousewheel(canvas_plot.get_tk_widget())
         bind_mousewheel(table_frame)
 
-    def create_mistake_tab(self, tab_control):
-        tab = ttk.Frame(tab_control)
-        tab_control.add(tab, text='Mistakes')
-
+    def create_mistake_tab(self, tab, data):
         # Create a canvas and scrollbar for the entire tab
         canvas = tk.Canvas(tab)
         scrollbar = ttk.Scrollbar(tab, orient="vertical", command=canvas.yview)
@@ -480,33 +388,14 @@ class StatsWindow:
         label.pack(pady=20)
 
         try:
-            # Load CSV relative to this script's location
-            base_path = os.path.dirname(__file__)
-            csv_path = os.path.join(base_path, '..', 'game_data', 'mistake.csv')
-
-            df = pd.read_csv(csv_path, skipinitialspace=True)
-
-            # Group by mistake type and count occurrences
-            mistake_counts = df['mistake_type'].value_counts()
+            df = data['df']
 
             # Create a frame for the plot to better control its size
             plot_frame = ttk.Frame(scrollable_frame)
             plot_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
-            # Plot with adjusted size
-            fig, ax = plt.subplots(figsize=(8, 5))  # Slightly shorter height
-            ax.bar(mistake_counts.index, mistake_counts.values, color='salmon', edgecolor='black')
-
-            ax.set_title('Mistakes Made', pad=15)
-            ax.set_xlabel('Mistake Type')
-            ax.set_ylabel('Count')
-
-            # Rotate x-axis labels if they're long
-            if any(len(str(x)) > 10 for x in mistake_counts.index):
-                plt.xticks(rotation=45, ha='right')
-
             # Show on Tkinter window
-            canvas_plot = FigureCanvasTkAgg(fig, master=plot_frame)
+            canvas_plot = FigureCanvasTkAgg(data['figure'], master=plot_frame)
             canvas_plot.draw()
             canvas_plot.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
@@ -523,29 +412,9 @@ class StatsWindow:
             table_frame = ttk.Frame(table_container)
             table_frame.pack(fill=tk.BOTH, expand=True)
 
-            # Create Treeview with adjusted height
-            tree = ttk.Treeview(table_frame, columns=list(df.columns), show='headings', height=8)
-
-            # Define column headers
-            for col in df.columns:
-                tree.heading(col, text=col)
-                tree.column(col, anchor=tk.CENTER, width=120)  # Slightly wider columns
-
-            # Insert rows into Treeview
-            for _, row in df.iterrows():
-                tree.insert("", tk.END, values=list(row))
-
-            # Scrollbars for the Treeview
-            vsb_tree = ttk.Scrollbar(table_frame, orient="vertical", command=tree.yview)
-            hsb_tree = ttk.Scrollbar(table_frame, orient="horizontal", command=tree.xview)
-            tree.configure(yscrollcommand=vsb_tree.set, xscrollcommand=hsb_tree.set)
-
-            # Grid layout for better control
-            tree.grid(row=0, column=0, sticky="nsew")
-            vsb_tree.grid(row=0, column=1, sticky="ns")
-            hsb_tree.grid(row=1, column=0, sticky="ew")
-            table_frame.grid_rowconfigure(0, weight=1)
-            table_frame.grid_columnconfigure(0, weight=1)
+            # Only the rows in view are handed to Tk, the table brings its own scrollbars
+            tree = VirtualTable(table_frame, df, height=8, column_width=120)
+            tree.pack(fill=tk.BOTH, expand=True)
 
             # Add some padding at the bottom to ensure everything is visible
             ttk.Frame(scrollable_frame, height=10).pack()
@@ -568,15 +437,10 @@ class StatsWindow:
             bind_mousewheel(scrollable_frame)
             bind_mousewheel(canvas_plot.get_tk_widget())
 
-        except FileNotFoundError:
-            ttk.Label(scrollable_frame, text="Error: File 'mistake.csv' not found.").pack(pady=10)
         except Exception as e:
             ttk.Label(scrollable_frame, text=f"Error: {str(e)}").pack(pady=10)
 
-    def create_ingredients_used_tab(self, tab_control):
-        tab = ttk.Frame(tab_control)
-        tab_control.add(tab, text='Ingredients Used')
-
+    def create_ingredients_used_tab(self, tab, data):
         tab.rowconfigure(0, weight=1)
         tab.columnconfigure(0, weight=1)
 
@@ -598,17 +462,8 @@ class StatsWindow:
         label.pack(pady=10)
 
         try:
-            # Load CSV relative to this script's location
-            base_path = os.path.dirname(__file__)
-            csv_path = os.path.join(base_path, '..', 'game_data', 'Ingredient_used.csv')
-
-            df = pd.read_csv(csv_path, skipinitialspace=True)
-
-            # Filter only 'Taken'
-            taken_df = df[df['action'].str.lower() == 'taken']
-
-            # Group and sum quantities
-            total_taken = taken_df.groupby('ingredient')['quantity'].sum()
+            df = data['df']
+            total_taken = data['total_taken']
 
             if total_taken.empty:
                 ttk.Label(scrollable_frame, text="No 'Taken' data to show.").pack(pady=10)
@@ -622,23 +477,7 @@ class StatsWindow:
             pie_frame = ttk.Frame(content_frame)
             pie_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
-            fig, ax = plt.subplots(figsize=(6, 6))  # Increased figure size
-
-            # Define pastel colors using the Pastel1 colormap
-            colors = sns.color_palette("pastel", n_colors=len(total_taken))
-
-            ax.pie(
-                total_taken.values,
-                labels=total_taken.index,
-                autopct='%1.1f%%',
-                startangle=90,
-                textprops={'fontsize': 10},  # Increased font size
-                colors=colors,
-                wedgeprops={'linewidth': 1, 'edgecolor': 'white'}  # Better visual separation
-            )
-            ax.set_title('Ingredients Taken', fontsize=12, pad=20)
-
-            canvas_pie = FigureCanvasTkAgg(fig, master=pie_frame)
+            canvas_pie = FigureCanvasTkAgg(data['figure'], master=pie_frame)
             canvas_pie.draw()
             canvas_pie.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
@@ -701,29 +540,9 @@ class StatsWindow:
             table_frame = ttk.Frame(table_container)
             table_frame.pack(fill=tk.BOTH, expand=True)
 
-            # Create Treeview with adjusted height
-            tree = ttk.Treeview(table_frame, columns=list(df.columns), show='headings', height=8)
-
-            # Define column headers
-            for col in df.columns:
-                tree.heading(col, text=col)
-                tree.column(col, anchor=tk.CENTER, width=100)  # Set minimum width
-
-            # Insert rows into Treeview
-            for _, row in df.iterrows():
-                tree.insert("", tk.END, values=list(row))
-
-            # Scrollbars for the Treeview
-            vsb_tree = ttk.Scrollbar(table_frame, orient="vertical", command=tree.yview)
-            hsb_tree = ttk.Scrollbar(table_frame, orient="horizontal", command=tree.xview)
-            tree.configure(yscrollcommand=vsb_tree.set, xscrollcommand=hsb_tree.set)
-
-            # Grid layout for better control
-            tree.grid(row=0, column=0, sticky="nsew")
-            vsb_tree.grid(row=0, column=1, sticky="ns")
-            hsb_tree.grid(row=1, column=0, sticky="ew")
-            table_frame.grid_rowconfigure(0, weight=1)
-            table_frame.grid_columnconfigure(0, weight=1)
+            # Only the rows in view are handed to Tk, the table brings its own scrollbars
+            tree = VirtualTable(table_frame, df, height=8, column_width=100)
+            tree.pack(fill=tk.BOTH, expand=True)
 
             # In on_configure
             def on_configure(event):
@@ -738,15 +557,10 @@ class StatsWindow:
 
             canvas.bind_all("<MouseWheel>", _on_mousewheel)
 
-        except FileNotFoundError:
-            ttk.Label(scrollable_frame, text="Error: File 'ingredient_used.csv' not found.").pack(pady=10)
         except Exception as e:
             ttk.Label(scrollable_frame, text=f"Error: {str(e)}").pack(pady=10)
 
-    def create_total_time_per_dish_tab(self, tab_control):
-        tab = ttk.Frame(tab_control)
-        tab_control.add(tab, text='Time per Dish')
-
+    def create_total_time_per_dish_tab(self, tab, data):
         tab.rowconfigure(0, weight=1)
         tab.columnconfigure(0, weight=1)
 
@@ -771,21 +585,12 @@ class StatsWindow:
                   font=("Arial", 16, "bold")).pack(pady=20)
 
         try:
-            # Load CSV relative to this script's location
-            base_path = os.path.dirname(__file__)
-            csv_path = os.path.join(base_path, '..', 'game_data', 'total_time_per_dish.csv')
+            stats = data['stats']
 
-            df = pd.read_csv(csv_path, skipinitialspace=True)
-
-            if df.empty:
+            if stats.empty:
                 ttk.Label(content_frame, text="No preparation time data available").pack()
                 return
 
-            # ---------- CALCULATE STATISTICS ----------
-            stats = df.groupby('dish_type')['preparation_time_seconds'].agg(
-                ['count', 'mean', 'median', 'min', 'max', 'std']
-            ).reset_index()
-
             stats.columns = [
                 'Dish Type', 'Count', 'Mean (s)', 'Median (s)',
                 'Min (s)', 'Max (s)', 'Std Dev'
@@ -795,23 +600,12 @@ class StatsWindow:
             stats['Median (s)'] = stats['Median (s)'].round(1)
             stats['Std Dev'] = stats['Std Dev'].round(1)
 
-            # ---------- CREATE BOX PLOT ----------
-            fig, ax = plt.subplots(figsize=(6, 5))
-            sns.boxplot(data=df, x='dish_type', y='preparation_time_seconds',
-                        ax=ax, palette="husl")
-            ax.set_title('Preparation Time Range by Dish Type')
-            ax.set_xlabel('')
-            ax.set_ylabel('Time (seconds)')
-            plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
-            ax.grid(True, alpha=0.3)
-            fig.tight_layout()
-
             # ========== Plot + Summary Table in One Horizontal Frame ==========
             viz_summary_frame = ttk.Frame(content_frame)
             viz_summary_frame.pack(fill=tk.BOTH, expand=True, pady=(10, 10))
 
             # Left: Boxplot
-            plot_canvas = FigureCanvasTkAgg(fig, master=viz_summary_frame)
+            plot_canvas = FigureCanvasTkAgg(data['figure'], master=viz_summary_frame)
             plot_canvas.draw()
             plot_widget = plot_canvas.get_tk_widget()
             plot_widget.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
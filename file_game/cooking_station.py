@@ -0,0 +1,72 @@
+import csv
+
+from file_game.cooking_config import Config
+from file_game.cooking_tool import Pan, CuttingBoard, Plate, TrashBin
+
+
+class StationLayout:
+    """The stations placed in the kitchen, built from a layout file.
+
+    Each row of the file (type, x, y, capacity) becomes one instance, so a
+    layout can have any number of pans, boards, plates or bins. An empty
+    capacity keeps the station's default. The fridge and the serving pad
+    are single fixtures and stay in GameApp.
+    """
+    STATION_TYPES = {
+        'pan': Pan,
+        'cutting_board': CuttingBoard,
+        'plate': Plate,
+        'trash': TrashBin,
+    }
+    SUPPORTS_CAPACITY = {'pan', 'cutting_board', 'plate'}  # Types whose constructor takes a capacity
+
+    def __init__(self, file_name=None):
+        self.__file_name = file_name or Config.get_config('STATION_LAYOUT_FILE')
+        self.__stations = []  # (type, station) in file order, which is also the drawing order
+
+        for station_type, x, y, capacity in self.__read_layout():
+            station_class = self.STATION_TYPES.get(station_type)
+            if station_class is None:
+                print(f"Unknown station type in {self.__file_name}: {station_type}")
+                continue
+            if capacity is not None and station_type not in self.SUPPORTS_CAPACITY:
+                print(f"Station type {station_type} has no capacity, ignoring it")
+                capacity = None
+            station = station_class(x, y) if capacity is None else station_class(x, y, capacity)
+            self.__stations.append((station_type, station))
+
+    def __read_layout(self):
+        rows = []
+        try:
+            with open(self.__file_name, 'r', newline='') as file:
+                for row in csv.DictReader(file):
+                    try:
+                        capacity = (row.get('capacity') or '').strip()
+                        rows.append((row['type'].strip(), int(row['x']), int(row['y']),
+                                     int(capacity) if capacity else None))
+                    except (KeyError, ValueError, AttributeError) as e:
+                        print(f"Skipping bad station row {row}: {e}")
+        except FileNotFoundError:
+            print(f"Station layout not found: {self.__file_name}")
+        return rows
+
+    def get_stations(self, station_type=None):
+        """Every station, or only those of one type."""
+        return [station for kind, station in self.__stations if station_type is None or kind == station_type]
+
+    def get_layout(self):
+        """[(type, station)] in file order."""
+        return list(self.__stations)
+
+    def get_rects(self):
+        """Area covered by each station, e.g. for the zombies' obstacle map."""
+        return [station.get_rect() for station_type, station in self.__stations]
+
+    def clear(self):
+        for station_type, station in self.__stations:
+            if hasattr(station, 'clear'):
+                station.clear()
+
+    def draw(self, screen):
+        """Draw every station; returns the rects drawn, for the dirty-rect renderer."""
+        return [station.draw(screen) for station_type, station in self.__stations]
@@ -0,0 +1,393 @@
+import argparse
+import csv
+import os
+import sqlite3
+import threading
+
+from file_game.cooking_config import Config
+
+# Log name -> CSV file under the data directory
+LOG_FILES = {
+    'ingredient_used': "ingredient_used.csv",
+    'keystroke_per_dish': "keystroke_per_dish.csv",
+    'mistake': "mistake.csv",
+    'order_per_session': "order_per_session.csv",
+    'total_time_per_dish': "total_time_per_dish.csv",
+}
+
+# Column names found in older logs -> the names the game writes today
+LEGACY_COLUMNS = {
+    'chicken drumpstick fried': 'chicken drumstick fried',
+}
+
+
+def log_name(file_name):
+    """'game_data/Ingredient_used.csv' -> 'ingredient_used'"""
+    return os.path.splitext(os.path.basename(file_name))[0].lower()
+
+
+def normalize_record(record):
+    """Strip padded column names and map legacy ones, as found in the older CSVs."""
+    normalized = {}
+    for key, value in record.items():
+        if key is None:
+            continue
+        key = key.strip()
+        normalized[LEGACY_COLUMNS.get(key, key)] = value.strip() if isinstance(value, str) else value
+    return normalized
+
+
+def normalize_columns(df):
+    df.columns = [LEGACY_COLUMNS.get(col.strip(), col.strip()) for col in df.columns]
+    return df
+
+
+class CsvStore:
+    """The original storage: one flat CSV file per log."""
+
+    def __init__(self, data_dir=None):
+        self.__data_dir = data_dir or Config.get_config('DATA_DIR')
+
+    def write(self, file_name, fieldnames, records, session_id=None):
+        """Append records; the header is written if the file is new or empty.
+
+        Only the log name of file_name is used; the file is the one read() reads, under the data directory.
+        """
+        name = log_name(file_name)
+        if name not in LOG_FILES:
+            raise ValueError(f"Unknown log: {file_name}")
+        path = os.path.join(self.__data_dir, LOG_FILES[name])
+        needs_header = not os.path.exists(path) or os.path.getsize(path) == 0
+        with open(path, 'a', newline='') as csv_file:
+            writer = csv.DictWriter(csv_file, fieldnames=fieldnames)
+            if needs_header:
+                writer.writeheader()
+            writer.writerows(records)
+
+    def read(self, name):
+        """Whole log as a DataFrame."""
+        import pandas as pd
+
+        path = os.path.join(self.__data_dir, LOG_FILES[name])
+        return normalize_columns(pd.read_csv(path, skipinitialspace=True))
+
+    def get_source(self):
+        return "csv:" + os.path.abspath(self.__data_dir)
+
+    def read_new(self, name, watermark=None):
+        """Records appended since the watermark, as (records, new watermark, reset).
+
+        The watermark is the byte offset read up to plus the bytes just before
+        it. If the file shrank or those bytes changed, the file was rewritten
+        (e.g. compacted) and it is read again from the start with reset=True.
+        """
+        path = os.path.join(self.__data_dir, LOG_FILES[name])
+        if not os.path.exists(path):
+            return [], None, watermark is not None
+
+        size = os.path.getsize(path)
+        with open(path, 'rb') as csv_file:
+            reset = watermark is None or size < watermark['offset']
+            if not reset:
+                start = max(0, watermark['offset'] - len(watermark['tail']))
+                csv_file.seek(start)
+                reset = csv_file.read(watermark['offset'] - start).decode('utf-8', 'replace') != watermark['tail']
+            if reset:
+                csv_file.seek(0)
+                offset = 0
+                header = None
+            else:
+                offset = watermark['offset']
+                header = watermark['header']
+            data = csv_file.read()
+
+        # Only whole lines, a row the writer is still appending is picked up next time
+        data = data[:data.rfind(b'\n') + 1]
+        lines = data.decode('utf-8', 'replace').splitlines()
+        if header is None and lines:
+            header = [LEGACY_COLUMNS.get(col.strip(), col.strip()) for col in next(csv.reader([lines[0]]))]
+            lines = lines[1:]
+
+        records = [dict(zip(header, (value.strip() for value in row)))
+                   for row in csv.reader(lines) if row]
+        offset += len(data)
+        if offset == 0:
+            return [], None, reset
+        with open(path, 'rb') as csv_file:
+            csv_file.seek(max(0, offset - 64))
+            tail = csv_file.read(offset - max(0, offset - 64)).decode('utf-8', 'replace')
+        return records, {'offset': offset, 'tail': tail, 'header': header}, reset
+
+
+class SqliteStore:
+    """Normalized SQLite storage for the game_data logs.
+
+    read() returns the same columns as the CSV files, so StatsWindow does not
+    care which store it is given. Mistakes, keystrokes and dish times also
+    record the session they happened in, which the CSVs never did.
+    """
+    __SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            id INTEGER PRIMARY KEY,
+            session_id INTEGER,
+            session_start TEXT,
+            session_end TEXT,
+            total_score INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS orders (
+            id INTEGER PRIMARY KEY,
+            session_ref INTEGER NOT NULL REFERENCES sessions(id),
+            dish TEXT NOT NULL,
+            quantity INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS dishes (
+            id INTEGER PRIMARY KEY,
+            session_id INTEGER,
+            timestamp TEXT,
+            dish_type TEXT,
+            preparation_time_seconds REAL
+        );
+        CREATE TABLE IF NOT EXISTS mistakes (
+            id INTEGER PRIMARY KEY,
+            session_id INTEGER,
+            timestamp TEXT,
+            mistake_type TEXT,
+            info TEXT
+        );
+        CREATE TABLE IF NOT EXISTS keystrokes (
+            id INTEGER PRIMARY KEY,
+            session_id INTEGER,
+            keystroke_id INTEGER,
+            timestamp TEXT,
+            up INTEGER,
+            down INTEGER,
+            "left" INTEGER,
+            "right" INTEGER,
+            total_key INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS ingredient_events (
+            id INTEGER PRIMARY KEY,
+            session_id INTEGER,
+            event_id INTEGER,
+            timestamp TEXT,
+            ingredient TEXT,
+            action TEXT,
+            quantity INTEGER
+        );
+        CREATE INDEX IF NOT EXISTS idx_sessions_session_id ON sessions(session_id);
+        CREATE INDEX IF NOT EXISTS idx_sessions_start ON sessions(session_start);
+        CREATE INDEX IF NOT EXISTS idx_orders_session_ref ON orders(session_ref);
+        CREATE INDEX IF NOT EXISTS idx_dishes_session_id ON dishes(session_id);
+        CREATE INDEX IF NOT EXISTS idx_dishes_timestamp ON dishes(timestamp);
+        CREATE INDEX IF NOT EXISTS idx_mistakes_session_id ON mistakes(session_id);
+        CREATE INDEX IF NOT EXISTS idx_mistakes_timestamp ON mistakes(timestamp);
+        CREATE INDEX IF NOT EXISTS idx_keystrokes_session_id ON keystrokes(session_id);
+        CREATE INDEX IF NOT EXISTS idx_keystrokes_timestamp ON keystrokes(timestamp);
+        CREATE INDEX IF NOT EXISTS idx_ingredient_events_session_id ON ingredient_events(session_id);
+        CREATE INDEX IF NOT EXISTS idx_ingredient_events_timestamp ON ingredient_events(timestamp);
+    """
+
+    # Log name -> select list giving the log's CSV columns in file order
+    __COLUMNS = {
+        'ingredient_used': "session_id, event_id AS id, timestamp, ingredient, action, quantity",
+        'keystroke_per_dish': 'timestamp, up, down, "left", "right", total_key, keystroke_id AS id',
+        'mistake': "timestamp, mistake_type, info",
+        'total_time_per_dish': "timestamp, session_id, dish_type, preparation_time_seconds",
+    }
+
+    # Log name -> table holding its rows
+    TABLES = {
+        'ingredient_used': 'ingredient_events',
+        'keystroke_per_dish': 'keystrokes',
+        'mistake': 'mistakes',
+        'order_per_session': 'sessions',
+        'total_time_per_dish': 'dishes',
+    }
+
+    def __init__(self, db_file=None):
+        self.__db_file = db_file or Config.get_config('SQLITE_FILE')
+        self.__local = threading.local()  # sqlite connections may not be shared between threads
+
+    def get_db_file(self):
+        return self.__db_file
+
+    def connect(self):
+        """This thread's connection, opened in WAL mode so readers never block the game's writer."""
+        connection = getattr(self.__local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.__db_file, timeout=5.0)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(self.__SCHEMA)
+            self.__local.connection = connection
+        return connection
+
+    def write(self, file_name, fieldnames, records, session_id=None):
+        """Insert a batch of log records in one transaction."""
+        name = log_name(file_name)
+        records = [normalize_record(record) for record in records]
+        connection = self.connect()
+        with connection:
+            if name == 'order_per_session':
+                self.__write_sessions(connection, records, session_id)
+            elif name == 'ingredient_used':
+                connection.executemany(
+                    "INSERT INTO ingredient_events (session_id, event_id, timestamp, ingredient, action, quantity) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [(r.get('session_id') or session_id, r.get('id'), r.get('timestamp'),
+                      r.get('ingredient'), r.get('action'), r.get('quantity')) for r in records])
+            elif name == 'keystroke_per_dish':
+                connection.executemany(
+                    'INSERT INTO keystrokes (session_id, keystroke_id, timestamp, up, down, "left", "right", total_key) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    [(session_id, r.get('id'), r.get('timestamp'), r.get('up'), r.get('down'),
+                      r.get('left'), r.get('right'), r.get('total_key')) for r in records])
+            elif name == 'mistake':
+                connection.executemany(
+                    "INSERT INTO mistakes (session_id, timestamp, mistake_type, info) VALUES (?, ?, ?, ?)",
+                    [(session_id, r.get('timestamp'), r.get('mistake_type'), r.get('info')) for r in records])
+            elif name == 'total_time_per_dish':
+                connection.executemany(
+                    "INSERT INTO dishes (session_id, timestamp, dish_type, preparation_time_seconds) "
+                    "VALUES (?, ?, ?, ?)",
+                    [(r.get('session_id') or session_id, r.get('timestamp'), r.get('dish_type'),
+                      r.get('preparation_time_seconds')) for r in records])
+            else:
+                raise ValueError(f"Unknown log: {file_name}")
+
+    def __write_sessions(self, connection, records, session_id):
+        # One sessions row per record, the per-dish columns become orders rows
+        summary = ('session_start', 'session_end', 'total_score')
+        for record in records:
+            cursor = connection.execute(
+                "INSERT INTO sessions (session_id, session_start, session_end, total_score) VALUES (?, ?, ?, ?)",
+                (session_id, record.get('session_start'), record.get('session_end'), record.get('total_score')))
+            connection.executemany(
+                "INSERT INTO orders (session_ref, dish, quantity) VALUES (?, ?, ?)",
+                [(cursor.lastrowid, dish, quantity or 0) for dish, quantity in record.items() if dish not in summary])
+
+    def read(self, name):
+        """Whole log as a DataFrame with the same columns as its CSV file."""
+        import pandas as pd
+
+        connection = self.connect()
+        if name != 'order_per_session':
+            table = self.TABLES[name]
+            return pd.read_sql_query(f"SELECT {self.__COLUMNS[name]} FROM {table} ORDER BY {table}.id", connection)
+
+        sessions = pd.read_sql_query(
+            "SELECT id, session_start, session_end, total_score FROM sessions ORDER BY id", connection)
+        orders = pd.read_sql_query("SELECT session_ref, dish, quantity FROM orders ORDER BY id", connection)
+        dishes = list(pd.unique(orders['dish']))
+        wide = orders.pivot_table(index='session_ref', columns='dish', values='quantity',
+                                  aggfunc='sum', fill_value=0)
+        df = sessions.join(wide.reindex(columns=dishes), on='id').drop(columns='id')
+        df[dishes] = df[dishes].fillna(0).astype(int)
+        return df
+
+    def get_source(self):
+        return "sqlite:" + os.path.abspath(self.__db_file)
+
+    def read_new(self, name, watermark=None):
+        """Rows inserted since the watermark (the last rowid read), as (records, new watermark, reset)."""
+        last_id = watermark['rowid'] if watermark else 0
+        connection = self.connect()
+        connection.row_factory = sqlite3.Row
+        try:
+            if name == 'order_per_session':
+                rows = connection.execute(
+                    "SELECT id, session_start, session_end, total_score FROM sessions WHERE id > ? ORDER BY id",
+                    (last_id,)).fetchall()
+                records = {row['id']: {key: row[key] for key in row.keys() if key != 'id'} for row in rows}
+                for order in connection.execute(
+                        "SELECT session_ref, dish, quantity FROM orders WHERE session_ref > ? ORDER BY id",
+                        (last_id,)):
+                    if order['session_ref'] in records:
+                        records[order['session_ref']][order['dish']] = order['quantity']
+                ids = list(records)
+                records = list(records.values())
+            else:
+                table = self.TABLES[name]
+                query = (f"SELECT {table}.id AS _rowid, {self.__COLUMNS[name]} FROM {table} "
+                         f"WHERE {table}.id > ? ORDER BY {table}.id")
+                records = [dict(row) for row in connection.execute(query, (last_id,))]
+                ids = [record.pop('_rowid') for record in records]
+        finally:
+            connection.row_factory = None
+
+        # A database that lost rows (recreated or cleared) is read again from the start
+        if watermark and not ids:
+            highest = connection.execute(f"SELECT MAX(id) FROM {self.TABLES[name]}").fetchone()[0] or 0
+            if highest < last_id:
+                records, watermark, _ = self.read_new(name)
+                return records, watermark, True
+        if ids:
+            last_id = ids[-1]
+        return records, {'rowid': last_id}, False
+
+    def count(self, name):
+        row = self.connect().execute(f"SELECT COUNT(*) FROM {self.TABLES[name]}").fetchone()
+        return row[0]
+
+    def import_csv(self, data_dir=None, force=False):
+        """Copy the CSV logs into the database.
+
+        Logs whose table already has rows are skipped unless force is set, so
+        running the import twice does not duplicate history.
+        """
+        data_dir = data_dir or Config.get_config('DATA_DIR')
+        imported = {}
+        for name, csv_name in LOG_FILES.items():
+            path = os.path.join(data_dir, csv_name)
+            if not os.path.exists(path) or (self.count(name) and not force):
+                continue
+            with open(path, 'r', newline='') as csv_file:
+                reader = csv.DictReader(csv_file, skipinitialspace=True)
+                rows = list(reader)
+            if rows:
+                self.write(csv_name, reader.fieldnames, rows)
+            imported[name] = len(rows)
+        return imported
+
+
+class Storage:
+    """Hands out the storage backend selected by Config 'STORAGE_BACKEND'."""
+    __store = None
+    __LOCK = threading.Lock()
+
+    @classmethod
+    def get_store(cls):
+        with cls.__LOCK:
+            if cls.__store is None:
+                cls.__store = cls.create_store(Config.get_config('STORAGE_BACKEND'))
+            return cls.__store
+
+    @classmethod
+    def create_store(cls, backend, data_dir=None):
+        """A new store; data_dir points it at another log directory (a database file inside it for SQLite)."""
+        if backend == 'csv':
+            return CsvStore(data_dir)
+        if backend == 'sqlite':
+            store = SqliteStore(os.path.join(data_dir, "cooking.db") if data_dir else None)
+            is_new = not os.path.exists(store.get_db_file())
+            if is_new:
+                # Carry the existing CSV history over the first time the database is used
+                print(f"Importing CSV logs into {store.get_db_file()}: {store.import_csv(data_dir)}")
+            return store
+        raise ValueError(f"Unknown storage backend: {backend}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import the game_data CSV logs into the SQLite store.")
+    parser.add_argument('--data-dir', default=None, help="directory holding the CSV logs")
+    parser.add_argument('--db', default=None, help="SQLite database file")
+    parser.add_argument('--force', action='store_true', help="import logs even if their table already has rows")
+    args = parser.parse_args()
+
+    store = SqliteStore(args.db)
+    for name, rows in store.import_csv(args.data_dir, force=args.force).items():
+        print(f"{name}: {rows} rows imported")
+
+
+if __name__ == '__main__':
+    main()
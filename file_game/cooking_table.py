@@ -0,0 +1,189 @@
+import tkinter as tk
+from tkinter import ttk
+import numpy as np
+import pandas as pd
+
+
+class VirtualTable(ttk.Frame):
+    """Treeview that only holds the rows currently on screen.
+
+    The rows live in one NumPy array per column. Sorting and filtering only
+    produce a new array of row positions, and scrolling rewrites the values
+    of the few Treeview items in place, so the cost of a scroll does not
+    depend on how many rows the log has.
+    """
+
+    def __init__(self, master, df, height=8, column_width=120, filterable=True):
+        super().__init__(master)
+        self.__columns = list(df.columns)
+        self.__data = [df[col].to_numpy() for col in self.__columns]
+        # Dates are formatted only for the rows on screen, as '2025-04-02 00:16:10' rather than ISO with ns
+        self.__date_columns = [i for i, col in enumerate(self.__columns)
+                               if pd.api.types.is_datetime64_any_dtype(df[col])]
+        self.__row_count = len(df)
+
+        self.__view = np.arange(self.__row_count)  # Row positions shown, after filter and sort
+        self.__mask = None  # Rows matching the filter, None when not filtering
+        self.__sorted = {}  # Column -> argsort of the full column, computed on first use
+        self.__factors = {}  # Column -> (codes, lower-cased distinct values), built on the first filter
+        self.__sort_column = None
+        self.__sort_ascending = True
+        self.__first = 0
+        self.__height = height
+        self.__filter_job = None
+
+        row = 0
+        if filterable:
+            filter_frame = ttk.Frame(self)
+            filter_frame.grid(row=row, column=0, columnspan=2, sticky="ew", pady=(0, 5))
+            ttk.Label(filter_frame, text="Filter:").pack(side=tk.LEFT)
+            self.__filter_var = tk.StringVar()
+            self.__filter_var.trace_add('write', self.__on_filter_changed)
+            ttk.Entry(filter_frame, textvariable=self.__filter_var, width=30).pack(side=tk.LEFT, padx=5)
+            self.__count_label = ttk.Label(filter_frame)
+            self.__count_label.pack(side=tk.RIGHT)
+            row += 1
+        else:
+            self.__count_label = None
+
+        self.__tree = ttk.Treeview(self, columns=self.__columns, show='headings', height=height)
+        for col in self.__columns:
+            self.__tree.heading(col, text=col, command=lambda c=col: self.sort_by(c))
+            self.__tree.column(col, anchor=tk.CENTER, width=column_width)
+
+        # The only items the Treeview ever holds, refilled on every scroll
+        self.__items = [self.__tree.insert("", tk.END, values=()) for _ in range(height)]
+
+        self.__scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        hsb = ttk.Scrollbar(self, orient="horizontal", command=self.__tree.xview)
+        self.__tree.configure(xscrollcommand=hsb.set)
+
+        # The tree keeps its requested height, stretching it would show rows that have no items
+        self.__tree.grid(row=row, column=0, sticky="ew")
+        self.__scrollbar.grid(row=row, column=1, sticky="ns")
+        hsb.grid(row=row + 1, column=0, sticky="ew")
+        self.grid_columnconfigure(0, weight=1)
+
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.__tree.bind(sequence, self.__on_mousewheel)
+
+        self.__refresh()
+
+    def get_view(self):
+        """Row positions currently shown, in display order."""
+        return self.__view
+
+    def get_visible_rows(self):
+        rows = self.__view[self.__first:self.__first + self.__height]
+        visible = []
+        for row in rows:
+            values = [column[row] for column in self.__data]
+            for i in self.__date_columns:
+                values[i] = str(pd.Timestamp(values[i]))
+            visible.append(tuple(values))
+        return visible
+
+    def yview(self, *args):
+        """Scrollbar command: ('moveto', fraction) or ('scroll', n, 'units'|'pages')."""
+        total = len(self.__view)
+        if args[0] == 'moveto':
+            self.__first = int(float(args[1]) * total)
+        elif args[0] == 'scroll':
+            step = self.__height if args[2] == 'pages' else 1
+            self.__first += int(args[1]) * step
+        self.__refresh()
+
+    def sort_by(self, column):
+        """Sort on a column, clicking the same heading again reverses the order."""
+        if self.__sort_column == column:
+            self.__sort_ascending = not self.__sort_ascending
+        else:
+            self.__sort_column = column
+            self.__sort_ascending = True
+
+        for col in self.__columns:
+            arrow = ""
+            if col == column:
+                arrow = " ▲" if self.__sort_ascending else " ▼"
+            self.__tree.heading(col, text=col + arrow)
+        self.__update_view()
+
+    def set_filter(self, text):
+        """Show only rows where some column contains text (case-insensitive)."""
+        text = text.strip().lower()
+        if not text:
+            self.__mask = None
+        else:
+            # Match against each column's distinct values, then map the matches back to rows
+            mask = np.zeros(self.__row_count, dtype=bool)
+            for i in range(len(self.__columns)):
+                codes, uniques = self.__factorize(i)
+                matched = uniques.str.contains(text, regex=False).to_numpy()
+                if matched.any():
+                    mask |= matched[codes]
+            self.__mask = mask
+        self.__update_view()
+
+    def __factorize(self, i):
+        if i not in self.__factors:
+            codes, uniques = pd.factorize(self.__data[i], use_na_sentinel=False)
+            uniques = pd.Series(uniques)
+            if i in self.__date_columns:
+                uniques = pd.to_datetime(uniques)
+            self.__factors[i] = (codes, uniques.astype(str).str.lower())
+        return self.__factors[i]
+
+    def __on_filter_changed(self, *args):
+        # Wait for a pause in typing before filtering
+        if self.__filter_job is not None:
+            self.after_cancel(self.__filter_job)
+        self.__filter_job = self.after(150, self.__apply_filter)
+
+    def __apply_filter(self):
+        self.__filter_job = None
+        self.set_filter(self.__filter_var.get())
+
+    def __sorted_rows(self, column):
+        if column not in self.__sorted:
+            values = self.__data[self.__columns.index(column)]
+            try:
+                order = np.argsort(values, kind='stable')
+            except TypeError:
+                order = np.argsort(values.astype(str), kind='stable')  # Mixed types in an object column
+            self.__sorted[column] = order
+        return self.__sorted[column]
+
+    def __update_view(self):
+        if self.__sort_column is None:
+            view = np.arange(self.__row_count)
+        else:
+            view = self.__sorted_rows(self.__sort_column)
+            if not self.__sort_ascending:
+                view = view[::-1]
+        if self.__mask is not None:
+            view = view[self.__mask[view]]
+        self.__view = view
+        self.__first = 0
+        self.__refresh()
+
+    def __on_mousewheel(self, event):
+        if event.num == 4 or getattr(event, 'delta', 0) > 0:
+            self.yview('scroll', -3, 'units')
+        else:
+            self.yview('scroll', 3, 'units')
+        return "break"  # Do not also scroll the surrounding canvas
+
+    def __refresh(self):
+        total = len(self.__view)
+        self.__first = max(0, min(self.__first, total - self.__height))
+
+        rows = self.get_visible_rows()
+        for i, item in enumerate(self.__items):
+            self.__tree.item(item, values=rows[i] if i < len(rows) else ())
+
+        if total:
+            self.__scrollbar.set(self.__first / total, min(1.0, (self.__first + self.__height) / total))
+        else:
+            self.__scrollbar.set(0.0, 1.0)
+        if self.__count_label is not None:
+            self.__count_label.configure(text=f"{total} of {self.__row_count} rows")
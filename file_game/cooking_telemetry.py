@@ -0,0 +1,145 @@
+import atexit
+import threading
+from collections import deque
+
+from file_game.cooking_config import Config
+from file_game.cooking_session import SessionSequence
+from file_game.cooking_storage import Storage
+
+
+class Telemetry:
+    """Buffers game_data log records in memory and writes them on a background thread.
+
+    The frame thread only ever appends to an in-memory ring buffer. A writer
+    thread hands it to the storage backend when FLUSH_SIZE records are
+    waiting, every FLUSH_SECONDS, on flush() and at interpreter exit.
+    """
+    __BUFFER = deque(maxlen=Config.get_config('TELEMETRY_BUFFER_SIZE'))
+    __LOCK = threading.Lock()
+    __WAKE = threading.Event()
+    __WRITTEN = threading.Condition()
+
+    __thread = None
+    __enabled = True
+    __closing = False
+    __logged = 0  # Records accepted by log()
+    __written = 0  # Records written to disk (or dropped)
+    __dropped = 0
+
+    @classmethod
+    def set_enabled(cls, enabled):
+        """Turn logging on or off, e.g. for headless simulations. Session and row ids
+        are only persisted while logging is on."""
+        cls.__enabled = enabled
+        SessionSequence.set_persistent(enabled)
+
+    @classmethod
+    def log(cls, file_name, fieldnames, record):
+        """Queue one record for a game_data log, tagged with the running session."""
+        if not cls.__enabled:
+            return
+
+        session_id = SessionSequence.current_session_id()
+        with cls.__LOCK:
+            if len(cls.__BUFFER) == cls.__BUFFER.maxlen:
+                # The ring buffer overwrites its oldest record, count it as done so flush() does not wait on it
+                cls.__dropped += 1
+                cls.__mark_written(1)
+                if cls.__dropped == 1:
+                    print("Warning: telemetry buffer full, dropping oldest records")
+            cls.__BUFFER.append((file_name, tuple(fieldnames), dict(record), session_id))
+            cls.__logged += 1
+            pending = len(cls.__BUFFER)
+
+        cls.__ensure_thread()
+        if pending >= Config.get_config('TELEMETRY_FLUSH_SIZE'):
+            cls.__WAKE.set()
+
+    @classmethod
+    def flush(cls, wait=True, timeout=5.0):
+        """Ask the writer to write everything logged so far, optionally waiting until it is on disk."""
+        if cls.__thread is None:
+            return True
+
+        with cls.__LOCK:
+            target = cls.__logged
+        cls.__WAKE.set()
+
+        if not wait:
+            return True
+        with cls.__WRITTEN:
+            return cls.__WRITTEN.wait_for(lambda: cls.__written >= target, timeout)
+
+    @classmethod
+    def close(cls):
+        """Write all pending records and stop the writer thread."""
+        if cls.__thread is None:
+            return
+        cls.__closing = True
+        cls.__WAKE.set()
+        cls.__thread.join(timeout=5.0)
+        if not cls.__thread.is_alive():
+            # Records logged while the writer was finishing up, e.g. from other threads
+            while cls.__write_pending():
+                pass
+        cls.__thread = None
+        cls.__closing = False
+
+    @classmethod
+    def get_stats(cls):
+        with cls.__LOCK:
+            return {'logged': cls.__logged, 'written': cls.__written,
+                    'dropped': cls.__dropped, 'pending': len(cls.__BUFFER)}
+
+    @classmethod
+    def __ensure_thread(cls):
+        if cls.__thread is not None:
+            return
+        with cls.__LOCK:
+            if cls.__thread is None:
+                cls.__thread = threading.Thread(target=cls.__run, name="telemetry-writer", daemon=True)
+                cls.__thread.start()
+                atexit.register(cls.close)
+
+    @classmethod
+    def __run(cls):
+        while True:
+            cls.__WAKE.wait(Config.get_config('TELEMETRY_FLUSH_SECONDS'))
+            cls.__WAKE.clear()
+            closing = cls.__closing  # Read before writing, anything logged during the write is still pending
+            cls.__write_pending()
+            if closing:
+                while cls.__write_pending():
+                    pass
+                return
+
+    @classmethod
+    def __write_pending(cls):
+        """Write and remove everything in the buffer; returns how many records that was."""
+        with cls.__LOCK:
+            batch = list(cls.__BUFFER)
+            cls.__BUFFER.clear()
+        SessionSequence.save()  # The ids in this batch are on disk before any row that uses them
+        if not batch:
+            return 0
+
+        # Group by file while keeping each file's rows in logging order
+        by_file = {}
+        for file_name, fieldnames, record, session_id in batch:
+            by_file.setdefault((file_name, fieldnames, session_id), []).append(record)
+
+        store = Storage.get_store()
+        for (file_name, fieldnames, session_id), records in by_file.items():
+            try:
+                store.write(file_name, fieldnames, records, session_id)
+            except Exception as e:
+                print(f"Error writing telemetry to {file_name}: {e}")
+
+        cls.__mark_written(len(batch))
+        return len(batch)
+
+    @classmethod
+    def __mark_written(cls, count):
+        with cls.__WRITTEN:
+            cls.__written += count
+            cls.__WRITTEN.notify_all()
@@ -1,13 +1,19 @@
 from file_game.cooking_config import Config
+from file_game.cooking_clock import GameClock
 from file_game.cooking_ingredients import Ingredients
 from file_game.cooking_menu import Menu
+from file_game.cooking_recipe import RecipeBook
+from file_game.cooking_scheduler import CookingScheduler
+from file_game.cooking_telemetry import Telemetry
+from file_game.cooking_session import SessionSequence
 import pygame as pg
-import os
-import csv
 from datetime import datetime
 
 
 class Fridge:
+    __slots__ = ('__position', '__ingredients', '__selected_ingredient', 'is_open', '__dropped_ingredients',
+                 '__select_index', '__usage_data', '__csv_file', '__session_id')
+
     def __init__(self, x, y, chef):
         self.__position = (x, y)
         self.__ingredients = {}
@@ -18,19 +24,10 @@ class Fridge:
         self.__select_index = 0
         self.__usage_data = []  # Stores ingredient usage records
         self.__csv_file = "game_data/ingredient_used.csv"
-        self.__initialize_csv()
-        self.__session_id = self.__get_next_session_id()
-
-    def __initialize_csv(self):
-        """Create CSV file with headers if it doesn't exist"""
-        if not os.path.exists(self.__csv_file):
-            with open(self.__csv_file, 'w', newline='') as file:
-                writer = csv.writer(file)
-                writer.writerow(["session_id", "id",
-                                "timestamp", "ingredient", "action", "quantity"])
+        self.__session_id = SessionSequence.current_session_id()
 
     def __record_usage(self, ingredient, action, quantity=1):
-        """Record ingredient usage to memory and CSV"""
+        """Record ingredient usage to memory and queue it for the CSV"""
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
         record = {
@@ -44,17 +41,15 @@ class Fridge:
 
         self.__usage_data.append(record)
 
-        # Append to CSV file
-        with open(self.__csv_file, 'a', newline='') as file:
-            writer = csv.DictWriter(file, fieldnames=record.keys())
-            writer.writerow(record)
+        # Written to the CSV file by the telemetry thread
+        Telemetry.log(self.__csv_file, record.keys(), record)
 
     def reset(self):
         """Reset fridge to initial state and create new session"""
         self.is_open = False
         self.__select_index = 0
         self.__ingredients.clear()
-        self.__session_id = self.__get_next_session_id()
+        self.__session_id = SessionSequence.current_session_id()
 
         ingredients_to_add = [
             ("lamb", 1),
@@ -122,9 +117,9 @@ class Fridge:
                 if self.__ingredients[ingredient_type] <= 0:
                     del self.__ingredients[ingredient_type]
 
-                # Record usage and create a new ingredient to return
+                # Record usage and hand out an ingredient from the pool
                 self.__record_usage(ingredient_type, "Taken")
-                return Ingredients(*self.__position, ingredient_type)
+                return Ingredients.acquire(*self.__position, ingredient_type)
 
         return None
 
@@ -137,16 +132,13 @@ class Fridge:
         else:
             # Add new ingredient with quantity 1
             self.__ingredients[ingredient_type] = 1
-            # Set position to the corner of the screen
-            corner_position = (10, 10)  # Top-left corner with a small margin
-            ingredient.set_position(corner_position)
+        Ingredients.release(ingredient)  # The fridge only keeps counts
 
     def draw(self, screen):
         """Draws the fridge and its ingredients if open."""
         fridge_x, fridge_y = self.__position
-        fridge_image = pg.image.load("images/fridge.png")
-        fridge_image = pg.transform.scale(fridge_image, (150, 150))
-        screen.blit(fridge_image, (fridge_x, fridge_y))
+        fridge_image = Config.get_asset("images/fridge.png", self.get_rect().size)
+        drawn = [screen.blit(fridge_image, (fridge_x, fridge_y))]
 
         if self.is_open:
             # Start positions in the corner
@@ -169,18 +161,12 @@ class Fridge:
                 current_x = x_start + (i % items_per_row) * 50
                 current_y = y_start + (i // items_per_row) * 50
 
-                # Create a temporary ingredient for display
-                example_ingredient = Ingredients(
-                    current_x, current_y, ingredient_type
-                )
-
-                # Draw the ingredient icon
-                example_ingredient.draw_at(screen, current_x, current_y)
+                # Draw the ingredient icon, shared by every ingredient of this type
+                drawn.append(screen.blit(Ingredients.get_kind(ingredient_type).image, (current_x, current_y)))
 
                 # Draw quantity next to it
-                font = pg.font.SysFont('Arial', 18, bold=True)
-                quantity_text = font.render(f"x{quantity}", True, Config.get_config("BLACK"))
-                screen.blit(quantity_text, (current_x + 30, current_y + 5))
+                quantity_text = Config.render_text(f"x{quantity}", Config.get_config("BLACK"), 'Arial', 18, bold=True)
+                drawn.append(screen.blit(quantity_text, (current_x + 30, current_y + 5)))
 
                 # Draw highlight rectangle for selected ingredient
                 if i == self.__select_index:
@@ -188,163 +174,124 @@ class Fridge:
                         current_x, current_y,
                         Config.get_config('GRID_SIZE_W') + 15, Config.get_config('GRID_SIZE_W') + 15
                     )
-                    pg.draw.rect(screen, (0, 0, 0), highlight_rect, 3)
+                    drawn.append(pg.draw.rect(screen, (0, 0, 0), highlight_rect, 3))
+
+        return drawn
 
     def get_position(self):
         """Returns the position of the fridge."""
         return self.__position
 
-    def __get_next_session_id(self):
-        if not os.path.exists(self.__csv_file):
-            return 1
+    def get_rect(self):
+        return pg.Rect(self.__position, (150, 150))
 
-        session_ids = []
-        with open(self.__csv_file, 'r') as file:
-            reader = csv.DictReader(file)  # <-- This ensures rows are dictionaries
-            for row in reader:
-                sid = row.get('session_id', '').strip()
-                if sid.isdigit():
-                    session_ids.append(int(sid))
 
-        return max(session_ids, default=0) + 1
+class CookingSlot:
+    """One item on a tool: the ingredient, when its current step started (for the
+    progress bar), the pending Recipe (None once done) and its scheduler event."""
+    __slots__ = ('ingredient', 'start_time', 'recipe', 'event')
+
+    def __init__(self, ingredient, start_time=0, recipe=None, event=None):
+        self.ingredient = ingredient
+        self.start_time = start_time
+        self.recipe = recipe
+        self.event = event
 
 
 class Equipments:
-    def __init__(self, x, y, image_path):
+    __slots__ = ('__position', '__ingredients', '__capacity', '__image_path', '__tool', '__loop_counts')
+
+    # Loop sound -> items cooking with it on every tool. Config.get_sound() hands out one shared Sound
+    # and Sound.stop() stops all of its channels, so it is only stopped when nothing uses it any more.
+    __LOOP_COUNTS = {}
+
+    def __init__(self, x, y, image_path, tool, capacity=None):
         self.__position = (x, y)
-        self.__ingredients = []
+        self.__ingredients = []  # CookingSlot per item on the tool
+        self.__capacity = capacity  # Most items the tool holds at once, None for no limit
         self.__image_path = image_path
+        self.__tool = tool  # Name of this tool in the recipe file
 
-        # Tracking cooking sound
-        self.__is_cooking = False
-        self.__cooking_sound_playing = False
-
+        # Looping sound played while something on the tool is cooking
+        self.__loop_counts = {}  # Loop sound -> number of items cooking with it on this tool
 
     def clear(self):
-        return self.__ingredients.clear()
+        for item in self.__ingredients:
+            CookingScheduler.cancel(item.event)
+            Ingredients.release(item.ingredient)
+        self.__ingredients.clear()
+        for sound, count in list(self.__loop_counts.items()):
+            self.__change_loop_count(sound, -count)
 
     def add_ingredient(self, ingredient):
-        """Adds an ingredient to the cooking tool and starts the timer."""
-        start_time = pg.time.get_ticks()  # Start time when the ingredient is added
-        self.__ingredients.append([ingredient, start_time, False])
+        """Adds an ingredient to the cooking tool and schedules when it will be done.
+        Returns False if the tool is full."""
+        if self.__capacity is not None and len(self.__ingredients) >= self.__capacity:
+            return False
+        item = CookingSlot(ingredient)
+        self.__ingredients.append(item)
+        self.__start_recipe(item)
+        return True
+
+    def __start_recipe(self, item):
+        recipe = RecipeBook.get_recipe(self.__tool, item.ingredient.get_type())
+        item.start_time = GameClock.get_ticks()
+        item.recipe = recipe
+        item.event = None
+        if recipe is None:
+            return  # Already done, or nothing this tool can make from it
+
+        item.event = CookingScheduler.schedule(recipe.duration * 1000, self.__finish_recipe, item)
+        if recipe.loop_sound:
+            self.__change_loop_count(recipe.loop_sound, 1)
+
+    def __finish_recipe(self, item):
+        """Scheduler callback: the item's recipe is done."""
+        recipe = item.recipe
+        item.ingredient.set_type(recipe.output)
+        if recipe.sound:
+            Config.get_sound(recipe.sound).play()
+        self.__start_recipe(item)  # In case the output has a recipe of its own on this tool
+        if recipe.loop_sound:
+            # After the next recipe started, so a loop it shares keeps playing without a gap
+            self.__change_loop_count(recipe.loop_sound, -1)
 
     def cook_ingredients(self):
-        """Cooks ingredients based on real-time duration."""
-        transformed_items = []
-        current_time = pg.time.get_ticks()
-        new_ingredients = []
-
-        # Check if there are ingredients being cooked
-        self.__is_cooking = any(
-            ingredient_data[0].get_type() in ["egg", "lamb", "chicken", "chicken sliced", "fish", "pork"]
-            for ingredient_data in self.__ingredients
-        )
-
-        # Handle cooking sound
-        if self.__is_cooking:
-            if not self.__cooking_sound_playing:
-                Config.get_sound('pan_cooking').play(-1)  # -1 for looping
-                self.__cooking_sound_playing = True
+        """Runs the cooking events that are due. The timers live in CookingScheduler, which the
+        game loop already runs every update; this only makes a placement take effect at once."""
+        CookingScheduler.run_due()
+
+    def __change_loop_count(self, sound, delta):
+        """Count items cooking with a loop sound, starting it with the first and stopping it after the last."""
+        if not delta:
+            return
+        count = self.__loop_counts.get(sound, 0) + delta
+        if count > 0:
+            self.__loop_counts[sound] = count
         else:
-            if self.__cooking_sound_playing:
-                Config.get_sound('pan_cooking').stop()
-                self.__cooking_sound_playing = False
-
-        for ingredient_data in self.__ingredients:
-            # Safely unpack the data regardless of length
-            ingredient = ingredient_data[0]
-            start_time = ingredient_data[1]
-            sound_played = ingredient_data[2] if len(ingredient_data) >= 3 else False
-            elapsed_time = (current_time - start_time) / 1000
-            transformed = None
-
-            # FRYING LOGIC (primarily for Pan)
-            if isinstance(self, Pan):
-                # Check if this ingredient is newly transformed and needs sound
-                newly_transformed = False
-                self.__is_cooking = True
-
-                if ingredient.get_type() == "egg" and elapsed_time >= 0:
-                    transformed = Ingredients(*ingredient.get_position(), "egg fried")
-                    newly_transformed = True
-                elif ingredient.get_type() == "lamb" and elapsed_time >= 8:
-                    transformed = Ingredients(*ingredient.get_position(), "lamb fried")
-                    newly_transformed = True
-                elif ingredient.get_type() == "chicken" and elapsed_time >= 8:
-                    transformed = Ingredients(*ingredient.get_position(), "chicken fried")
-                    newly_transformed = True
-                elif ingredient.get_type() == "chicken sliced" and elapsed_time >= 8:
-                    transformed = Ingredients(*ingredient.get_position(), "chicken drumstick fried")
-                    newly_transformed = True
-                elif ingredient.get_type() == "fish" and elapsed_time >= 8:
-                    transformed = Ingredients(*ingredient.get_position(), "fish fried")
-                    newly_transformed = True
-                elif ingredient.get_type() == "pork" and elapsed_time >= 8:
-                    transformed = Ingredients(*ingredient.get_position(), "pork fried")
-                    newly_transformed = True
-
-                # Play sound only if newly transformed and sound not played yet
-                if newly_transformed and not sound_played:
-                    Config.get_sound("finish_cooking").play()
-                    sound_played = True
-
-            # SLICING LOGIC (primarily for CuttingBoard)
-            elif isinstance(self, CuttingBoard):
-                if ingredient.get_type() == "tomato" and elapsed_time >= 0:
-                    Config.get_sound("cutting").play()
-                    transformed = Ingredients(*ingredient.get_position(), "tomato sliced")
-                elif ingredient.get_type() == "lettuce" and elapsed_time >= 0:
-                    Config.get_sound("cutting").play()
-                    transformed = Ingredients(*ingredient.get_position(), "lettuce sliced")
-                elif ingredient.get_type() == "cheese" and elapsed_time >= 0:
-                    Config.get_sound("cutting").play()
-                    transformed = Ingredients(*ingredient.get_position(), "cheese sliced")
-                elif ingredient.get_type() == "chicken" and elapsed_time >= 0:
-                    Config.get_sound("cutting").play()
-                    transformed = Ingredients(*ingredient.get_position(), "chicken sliced")
-                elif ingredient.get_type() == "bread" and elapsed_time >= 0:
-                    Config.get_sound("cutting").play()
-                    transformed = Ingredients(*ingredient.get_position(), "bread sliced")
-                elif ingredient.get_type() == "chicken to slice" and elapsed_time >= 0:
-                    Config.get_sound("cutting").play()
-                    transformed = Ingredients(*ingredient.get_position(), "chicken sliced")
-
-            if transformed:
-                transformed_items.append((ingredient, transformed))
-                new_ingredients.append([transformed, start_time, True])  # Mark sound as played
-            else:
-                new_ingredients.append([ingredient, start_time, sound_played])
-
-        self.__ingredients = new_ingredients
+            self.__loop_counts.pop(sound, None)
+
+        loop_counts = Equipments.__LOOP_COUNTS
+        before = loop_counts.get(sound, 0)
+        after = max(before + delta, 0)
+        loop_counts[sound] = after
+        if before == 0 and after > 0:
+            Config.get_sound(sound).play(-1)  # -1 for looping
+        elif before > 0 and after == 0:
+            Config.get_sound(sound).stop()
 
     def get_cooked_ingredients(self):
         """Returns cooked ingredients and removes them from the tool."""
-        for item in self.__ingredients[:]:
-            ingredient = item[0]  # Access the first element directly
-            if "cooked" in ingredient.get_type() or "fried" in ingredient.get_type():
-                self.__ingredients.remove(item)  # Remove from the pan
-                # Check if no more ingredients are being cooked
-                if not any(
-                        i[0].get_type() in ["egg", "lamb", "chicken", "chicken sliced", "fish", "pork"]
-                        for i in self.__ingredients):
-                    self.__is_cooking = False
-                    if self.__cooking_sound_playing:
-                        Config.get_sound('pan_cooking').stop()
-                        self.__cooking_sound_playing = False
+        for item in self.__ingredients:
+            ingredient = item.ingredient
+            if item.recipe is None and RecipeBook.is_product(ingredient.get_type()):
+                self.__ingredients.remove(item)
                 return ingredient  # Return only one ingredient
-
-            if "sliced" in ingredient.get_type():
-                self.__ingredients.remove(item)  # Remove from the cutting board
-                return ingredient
         return None
 
     def is_ready_to_pick(self):
         """Checks if all ingredients are cooked and ready to be picked."""
-        for item in self.__ingredients:
-            ingredient = item[0]  # Access the first element directly
-            if ingredient.get_type() in ["egg", "lamb", "chicken"]:
-                return False
-        return True
+        return all(item.recipe is None for item in self.__ingredients)
 
     def take_tool(self):
         """Picks up cooked ingredients but keeps the pan in place."""
@@ -354,30 +301,18 @@ class Equipments:
     def draw(self, screen):
         """Draws the tool and its ingredients."""
         tool_x, tool_y = self.__position
-        tool_image = pg.image.load(self.__image_path)
-        tool_image = pg.transform.scale(tool_image, (90, 90))
-        screen.blit(tool_image, (tool_x, tool_y))
+        tool_image = Config.get_asset(self.__image_path, self.get_rect().size)
+        drawn = screen.blit(tool_image, (tool_x, tool_y))
 
         # Draw all ingredients on the tool
-        for ingredient_data in self.__ingredients:
-            ingredient = ingredient_data[0]
-            start_time = ingredient_data[1]
-            ingredient.draw_at(screen, tool_x + 14, tool_y + 25)
-
-            if not isinstance(self, CuttingBoard):
-                current_time = pg.time.get_ticks()
-                elapsed_time = (current_time - start_time) / 1000
-
-                ingredient_type = ingredient.get_type()
-                total_time = 0
-                if ingredient_type == "egg":
-                    total_time = 0
-                elif ingredient_type in ["lamb", "chicken", "chicken sliced", "fish", "pork"]:
-                    total_time = 8
-                else:
-                    continue
-
-                progress = min(max(elapsed_time / total_time, 0), 1)
+        for item in self.__ingredients:
+            drawn.union_ip(item.ingredient.draw_at(screen, tool_x + 14, tool_y + 25))
+            recipe = item.recipe
+
+            # Progress bar for anything that takes time to cook
+            if recipe is not None and recipe.duration > 0:
+                elapsed_time = (GameClock.get_ticks() - item.start_time) / 1000
+                progress = min(max(elapsed_time / recipe.duration, 0), 1)
 
                 # Bar background (red)
                 pg.draw.rect(screen, Config.get_config("RED"), (tool_x + 7, tool_y, 50, 5), border_radius=3)
@@ -386,46 +321,60 @@ class Equipments:
                 pg.draw.rect(screen, Config.get_config("GREEN"), (tool_x + 7, tool_y, 50 * progress, 5),
                              border_radius=3)
 
+        return drawn
+
     def set_position(self, new_position):
         self.__position = new_position
 
     def get_position(self):
         return self.__position
 
+    def get_rect(self):
+        return pg.Rect(self.__position, (90, 90))
+
 
 class Pan(Equipments):
-    def __init__(self, x, y):
-        super().__init__(x, y, "images/pan.png")
+    __slots__ = ()
+
+    def __init__(self, x, y, capacity=None):
+        super().__init__(x, y, "images/pan.png", 'pan', capacity)
 
     def fry_ingredients(self):
         return self.cook_ingredients()  # Adjust frying logic if needed
 
     def put_ingredient_in_pan(self, ingredient):
-        self.add_ingredient(ingredient)
+        return self.add_ingredient(ingredient)
 
 
 class CuttingBoard(Equipments):
-    def __init__(self, x, y):
-        super().__init__(x, y, "images/cutting.png")
+    __slots__ = ()
+
+    def __init__(self, x, y, capacity=None):
+        super().__init__(x, y, "images/cutting.png", 'cutting_board', capacity)
 
     def put_ingredient_in_cutting_board(self, ingredient):
-        self.add_ingredient(ingredient)
+        return self.add_ingredient(ingredient)
 
     def cut_ingredients(self):
         return self.cook_ingredients()
 
 
 class Plate:
-    def __init__(self, x, y):
+    __slots__ = ('__position', '__ingredients', '__capacity')
+
+    def __init__(self, x, y, capacity=5):
         self.__position = (x, y)
         self.__ingredients = []  # List to store ingredients on the plate
+        self.__capacity = capacity
 
     def clear(self):
+        for ingredient in self.__ingredients:
+            Ingredients.release(ingredient)
         return self.__ingredients.clear()
 
     def add_ingredient(self, ingredient):
         """Add an ingredient to the plate."""
-        if len(self.__ingredients) < 5:  # Limit the number of ingredients on the plate
+        if len(self.__ingredients) < self.__capacity:  # Limit the number of ingredients on the plate
             self.__ingredients.append(ingredient)
             self.check_and_transform()
             return True  # Ingredient added successfully
@@ -447,20 +396,22 @@ class Plate:
     def check_and_transform(self):
         """Check if the plate contains a complete dish and transform it."""
         if self.is_complete_menu():
-            self.__ingredients.clear()
-            sandwich = Ingredients(*self.__position, "sandwich")
+            self.clear()
+            sandwich = Ingredients.acquire(*self.__position, "sandwich")
             self.__ingredients.append(sandwich)
 
     def get_position(self):
         """Get the position of the plate."""
         return self.__position
 
+    def get_rect(self):
+        return pg.Rect(self.__position, (80, 80))
+
     def draw(self, screen):
         """Draw the plate and its ingredients on the screen."""
         plate_x, plate_y = self.__position
-        plate_image = pg.image.load("images/plate.png")
-        plate_image = pg.transform.scale(plate_image, (80, 80))  # Plate size
-        screen.blit(plate_image, (plate_x, plate_y))
+        plate_image = Config.get_asset("images/plate.png", self.get_rect().size)  # Plate size
+        drawn = screen.blit(plate_image, (plate_x, plate_y))
 
         # Draw ingredients on the plate in a grid-like layout
         for i, ingredient in enumerate(self.__ingredients):
@@ -468,13 +419,14 @@ class Plate:
             col = i % 2
             ingredient_x = plate_x + 20  # Adjust spacing as needed
             ingredient_y = plate_y + 10 + row
-            screen.blit(ingredient.images, (ingredient_x, ingredient_y))
+            drawn.union_ip(screen.blit(ingredient.images, (ingredient_x, ingredient_y)))
+        return drawn
 
     def pick_up_plate(self):
         if not self.__ingredients:  # Don't pick up empty plates
             return None
 
-        new_plate = Plate(*self.__position)
+        new_plate = Plate(*self.__position, self.__capacity)
         new_plate.__ingredients = self.__ingredients.copy()
         self.__ingredients.clear()  # Clear the original plate
         return new_plate
@@ -494,26 +446,32 @@ class Plate:
         # Update position for drawing
         self.__position = (x, y)
         # Use the existing draw method
-        self.draw(screen)
+        drawn = self.draw(screen)
         # Restore the original position
         self.__position = original_position
+        return drawn
 
 class TrashBin:
+    __slots__ = ('__position', '__menu', '__image', '__throw')
+
     def __init__(self, x, y):
         self.__position = (x, y)
         self.__menu = Menu()
-        self.__image = pg.image.load("images/trashbin.png")
-        self.__image = pg.transform.scale(self.__image, (100, 100))
+        self.__image = Config.get_asset("images/trashbin.png", (100, 100))
         self.__throw = []
 
     def draw(self, screen):
-        screen.blit(self.__image, self.__position)
+        return screen.blit(self.__image, self.__position)
 
     def get_position(self):
         return self.__position
 
+    def get_rect(self):
+        return pg.Rect(self.__position, self.__image.get_size())
+
     def throw_into_bin(self, ingredient):
         """Throw an ingredient into the trash bin."""
         self.__throw.append(ingredient.get_type())
         Config.get_sound("trash").play()
         self.__menu.log_mistake("throw away", f"served: {ingredient.get_type()}")
+        Ingredients.release(ingredient)
@@ -1,4 +1,5 @@
 from file_game.cooking_config import *
+from file_game.cooking_clock import GameClock
 
 
 class KitchenMap:
@@ -14,9 +15,13 @@ class KitchenMap:
         self.__sidebar_width = 220
         self.__line_color = Config.get_config('BLACK')
 
+        # Static layers are composited once and rebuilt only when the window or layout changes
+        self.__background = None
+        self.__background_built_for = None
+
         Config.get_sound("game_start").play(fade_ms=5000)
 
-    def draw_tiles(self):
+    def draw_tiles(self, surface):
         window_width = Config.get_config('WIN_SIZE_W')
         window_height = Config.get_config('WIN_SIZE_H')
 
@@ -26,79 +31,108 @@ class KitchenMap:
                     color = Config.get_config('PASTEL_BROWN')
                 else:
                     color = Config.get_config('PASTEL_GRAY')
-                pg.draw.rect(self.__screen, color, (x, y, self.__tile_size, self.__tile_size))
+                pg.draw.rect(surface, color, (x, y, self.__tile_size, self.__tile_size))
 
         for y in range(0, window_height, self.__tile_size):
-            pg.draw.line(self.__screen, self.__grid_color, (0, y), (window_width, y), 4)  # Line width set to 4
+            pg.draw.line(surface, self.__grid_color, (0, y), (window_width, y), 4)  # Line width set to 4
 
         for x in range(0, window_width, self.__tile_size):
-            pg.draw.line(self.__screen, self.__grid_color, (x, 0), (x, window_height), 4)  # Line width set to 4
+            pg.draw.line(surface, self.__grid_color, (x, 0), (x, window_height), 4)  # Line width set to 4
 
-    def draw_menu_block(self):
-        window_width = Config.get_config('WIN_SIZE_W')
+    def draw_menu_block(self, surface):
         window_height = Config.get_config('WIN_SIZE_H')
 
-        pg.draw.rect(self.__screen, self.__sidebar_color,
+        pg.draw.rect(surface, self.__sidebar_color,
                      (0, 0, self.__sidebar_width, window_height))  # Sidebar on the left
 
-        pg.draw.line(self.__screen, self.__line_color,
+        pg.draw.line(surface, self.__line_color,
                      (self.__sidebar_width, 0), (self.__sidebar_width, window_height), 4)  # Line width set to 4
 
-    def draw_wall(self):
+    def draw_wall(self, surface):
         wall_width = Config.get_config('WIN_SIZE_W')
         wall_height = 100
 
         wall_color = Config.get_config('GRAY_BLUE')
-        pg.draw.rect(self.__screen, wall_color, (0, 0, wall_width, wall_height))
-
-        blooddrip = pg.image.load('images/Decoration/blooddrip.png')
-        blooddrip = pg.transform.scale(blooddrip, (100, 100))
-        self.__screen.blit(blooddrip, (500, 10))
-
-    def draw_counter_top(self):
-        counter_top_image = pg.image.load("images/countertop.png")
-        counter_top_image = pg.transform.scale(counter_top_image, (Config.get_config('WIN_SIZE_W') - 300, 80))
-
-        counter_position = (350, 70)
-        self.__screen.blit(counter_top_image, counter_position)
-
-        counter_top_image2 = pg.image.load("images/countertop.png")
-        counter_top_image2 = pg.transform.rotate(counter_top_image2,90)
-        counter_top_image2 = pg.transform.scale(counter_top_image2, (100, Config.get_config('WIN_SIZE_H') - 200))
-
-        counter_position2 = (935, 150)
-        self.__screen.blit(counter_top_image2, counter_position2)
-
-    def draw_stove(self):
-        stove_image = pg.image.load('images/stove.png')
-        stove_image = pg.transform.scale(stove_image, (100, 100))
-
-        stove_position = (490, 60)
-        self.__screen.blit(stove_image, stove_position)
+        pg.draw.rect(surface, wall_color, (0, 0, wall_width, wall_height))
+
+        blooddrip = Config.get_asset('images/Decoration/blooddrip.png', (100, 100))
+        surface.blit(blooddrip, (500, 10))
+
+    def get_counter_rects(self):
+        """The back counter and the serving counter on the right."""
+        return [pg.Rect(350, 70, Config.get_config('WIN_SIZE_W') - 300, 80),
+                pg.Rect(935, 150, 100, Config.get_config('WIN_SIZE_H') - 200)]
+
+    def get_stove_rect(self):
+        return pg.Rect(490, 60, 100, 100)
+
+    def get_obstacle_rects(self):
+        """Furniture drawn into the background that zombies have to walk around."""
+        return self.get_counter_rects() + [self.get_stove_rect()]
+
+    def draw_counter_top(self, surface):
+        counter_rect, counter_rect2 = self.get_counter_rects()
+        counter_top_image = Config.get_asset("images/countertop.png", counter_rect.size)
+        surface.blit(counter_top_image, counter_rect.topleft)
+
+        counter_top_image2 = Config.get_asset("images/countertop.png", counter_rect2.size, rotate=90)
+        surface.blit(counter_top_image2, counter_rect2.topleft)
+
+    def draw_stove(self, surface):
+        stove_rect = self.get_stove_rect()
+        stove_image = Config.get_asset('images/stove.png', stove_rect.size)
+        surface.blit(stove_image, stove_rect.topleft)
+
+    def __background_key(self):
+        """Config values the pre-composited background depends on."""
+        return (
+            self.__screen.get_size(),
+            Config.get_config('WIN_SIZE_W'),
+            Config.get_config('WIN_SIZE_H'),
+            self.__tile_size,
+            self.__sidebar_width,
+        )
+
+    def build_background(self):
+        """Composite the static kitchen layers into a single surface."""
+        background = pg.Surface(self.__screen.get_size()).convert()
+        background.fill(self.__background_color)
+        self.draw_tiles(background)
+        self.draw_wall(background)
+        self.draw_counter_top(background)
+        self.draw_stove(background)
+        self.draw_menu_block(background)
+
+        self.__background = background
+        self.__background_built_for = self.__background_key()
+
+    def invalidate_background(self):
+        """Force the background to be rebuilt on the next update."""
+        self.__background = None
+
+    def get_background(self):
+        if self.__background is None or self.__background_built_for != self.__background_key():
+            self.build_background()
+        return self.__background
 
     def update(self):
-        """Update the map by drawing tiles."""
-        self.__screen.fill(self.__background_color)
-        self.draw_tiles()
-        self.draw_wall()
-        self.draw_counter_top()
-        self.draw_stove()
-        self.draw_menu_block()
+        """Update the map by blitting the cached background."""
+        self.__screen.blit(self.get_background(), (0, 0))
 
 
 class GameUI:
     game_over = False
 
     def __init__(self):
-        self.__start_time = pg.time.get_ticks()
+        self.__start_time = GameClock.get_ticks()
         self.__game_time = 240  # Game time in seconds
 
     def reset(self):
-        self.__start_time = pg.time.get_ticks()
+        self.__start_time = GameClock.get_ticks()
         GameUI.game_over = False
 
     def update_time(self):
-        elapsed_time = (pg.time.get_ticks() - self.__start_time) // 1000
+        elapsed_time = (GameClock.get_ticks() - self.__start_time) // 1000
         remaining_time = self.__game_time - elapsed_time
 
         if remaining_time <= 0:
@@ -114,19 +148,13 @@ class GameUI:
         seconds = remaining_time % 60
         time_text = f"{minutes:02}: {seconds:02}"
 
-        font = pg.font.SysFont(None, 48)
-        timer_surface = font.render(time_text, True, Config.get_config('BLACK'))  # White color
-        screen.blit(timer_surface, (10, 550))  # Draw timer at top-left corner
+        timer_surface = Config.render_text(time_text, Config.get_config('BLACK'), size=48)
+        return screen.blit(timer_surface, (10, 550))  # Draw timer at top-left corner
 
     @staticmethod
     def draw_game_over(screen, final_score=0):
         """Display Game Over message with final score"""
         if GameUI.game_over:
-            # Setup fonts
-            large_font = pg.font.SysFont('Arial', 72, bold=True)
-            medium_font = pg.font.SysFont('Arial', 48)
-            button_font = pg.font.SysFont('Arial', 42)
-
             screen_width = Config.get_config('WIN_SIZE_W')
             screen_height = Config.get_config('WIN_SIZE_H')
 
@@ -146,12 +174,12 @@ class GameUI:
             pg.draw.rect(screen, Config.get_config('BLACK'), panel_rect, 3, border_radius=15)
 
             # Game Over text
-            game_over_text = large_font.render("GAME OVER", True, Config.get_config('RED'))
+            game_over_text = Config.render_text("GAME OVER", Config.get_config('RED'), 'Arial', 72, bold=True)
             text_rect = game_over_text.get_rect(center=(screen_width // 2, screen_height // 3))
             screen.blit(game_over_text, text_rect)
 
             # Final Score text
-            score_text = medium_font.render(f"Final Score: {final_score}", True, Config.get_config('BLACK'))
+            score_text = Config.render_text(f"Final Score: {final_score}", Config.get_config('BLACK'), 'Arial', 48)
             score_rect = score_text.get_rect(center=(screen_width // 2, screen_height // 2))
             screen.blit(score_text, score_rect)
 
@@ -164,27 +192,46 @@ class GameUI:
             restart_button_rect = pg.Rect(button_x, screen_height // 2 + 80, button_width, button_height)
             pg.draw.rect(screen, (50, 200, 50), restart_button_rect, border_radius=10)
             pg.draw.rect(screen, Config.get_config('BLACK'), restart_button_rect, 2, border_radius=10)
-            restart_text = button_font.render("Restart", True, Config.get_config('WHITE'))
+            restart_text = Config.render_text("Restart", Config.get_config('WHITE'), 'Arial', 42)
             screen.blit(restart_text, restart_text.get_rect(center=restart_button_rect.center))
 
             # Exit button (red)
             exit_button_rect = pg.Rect(button_x, screen_height // 2 + 160, button_width, button_height)
             pg.draw.rect(screen, (200, 50, 50), exit_button_rect, border_radius=10)
             pg.draw.rect(screen, Config.get_config('BLACK'), exit_button_rect, 2, border_radius=10)
-            exit_text = button_font.render("Exit", True, Config.get_config('WHITE'))
+            exit_text = Config.render_text("Exit", Config.get_config('WHITE'), 'Arial', 42)
             screen.blit(exit_text, exit_text.get_rect(center=exit_button_rect.center))
 
             pg.display.flip()
 
             return restart_button_rect, exit_button_rect
 
+    @staticmethod
+    def draw_loading(screen, done, total):
+        """Display a progress bar while assets are being preloaded."""
+        pg.event.pump()  # Keep the window responsive while loading
+
+        screen_width = Config.get_config('WIN_SIZE_W')
+        screen_height = Config.get_config('WIN_SIZE_H')
+        screen.fill(Config.get_config('BACKGROUND'))
+
+        loading_text = Config.render_text("Loading...", Config.get_config('BLACK'), size=48)
+        screen.blit(loading_text, loading_text.get_rect(center=(screen_width // 2, screen_height // 2 - 40)))
+
+        # Progress bar
+        bar_rect = pg.Rect(screen_width // 2 - 200, screen_height // 2, 400, 30)
+        progress = done / total if total else 1
+        pg.draw.rect(screen, Config.get_config('PASTEL_GRAY'), bar_rect, border_radius=8)
+        pg.draw.rect(screen, Config.get_config('GREEN'),
+                     (bar_rect.x, bar_rect.y, int(bar_rect.width * progress), bar_rect.height), border_radius=8)
+        pg.draw.rect(screen, Config.get_config('BLACK'), bar_rect, 2, border_radius=8)
+
+        pg.display.flip()
+
     @staticmethod
     def draw_start_game(screen):
         """Display start screen with buttons centered."""
         if not GameUI.game_over:
-            font = pg.font.SysFont(None, 72)
-            button_font = pg.font.SysFont(None, 50)
-
             screen_width = Config.get_config('WIN_SIZE_W')
             screen_height = Config.get_config('WIN_SIZE_H')
 
@@ -199,17 +246,17 @@ class GameUI:
             exit_button_rect = pg.Rect(button_x, screen_height // 2 + 170, button_width, button_height)
 
             # Fill background
-            background_image = pg.image.load("images/Background.png")
+            background_image = Config.get_asset("images/Background.png")
             screen.blit(background_image, (0, 0))
 
             # Game title text
-            title_text = pg.image.load('images/title.png')
+            title_text = Config.get_asset('images/title.png')
             screen.blit(title_text, (200, 0))
 
             # Draw buttons
-            start_text = pg.image.load('images/start.png')
-            stat_text = pg.image.load('images/stat.png')
-            exit_text = pg.image.load('images/exit.png')
+            start_text = Config.get_asset('images/start.png')
+            stat_text = Config.get_asset('images/stat.png')
+            exit_text = Config.get_asset('images/exit.png')
 
             screen.blit(start_text, start_text.get_rect(center=restart_button_rect.center))
             screen.blit(stat_text, stat_text.get_rect(center=stat_button_rect.center))
@@ -1,19 +1,25 @@
 import pygame as pg
 from file_game.cooking_config import Config
+from file_game.cooking_clock import GameClock
 import random
+import numpy as np
 
 
 class Zombie:
+    __slots__ = ('__position', '__image', '__zombie_rect', '__previous_position', '__speed', '__chasing',
+                 '__last_attack_time', '__spawn_time', '__delay_time', 'screen')
+
     def __init__(self, delay_time=3000):
         self.__position = (self.spawn_offscreen(Config.get_config('WIN_SIZE_W'), Config.get_config('WIN_SIZE_H')))
 
-        self.__image = pg.transform.scale(pg.image.load("images/Zombie_1/Walk_still.png"), (30,70))
+        self.__image = Config.get_asset("images/Zombie_1/Walk_still.png", (30, 70))
         self.__zombie_rect = self.__image.get_rect(topleft=self.__position)
+        self.__previous_position = self.__position  # Where the last simulation step started
         self.__speed = 2
         self.__chasing = False
         self.__last_attack_time = 0
 
-        self.__spawn_time = pg.time.get_ticks()
+        self.__spawn_time = GameClock.get_ticks()
         self.__delay_time = delay_time
 
     def reset(self):
@@ -21,8 +27,9 @@ class Zombie:
         self.__speed = 2
         self.__chasing = False
         self.__zombie_rect = self.__image.get_rect(topleft=self.__position)
+        self.__previous_position = self.__position
 
-        self.__spawn_time = pg.time.get_ticks()
+        self.__spawn_time = GameClock.get_ticks()
         self.__delay_time = 3000
 
     def spawn_offscreen(self, screen_width, screen_height):
@@ -40,13 +47,14 @@ class Zombie:
 
     def move_towards(self, target_x, target_y):
         """Move towards a given (x, y) target."""
+        self.__previous_position = self.__zombie_rect.topleft
 
         dx = target_x - self.__zombie_rect.x
         dy = target_y - self.__zombie_rect.y
         distance = max(0.1, (dx**2 + dy**2) ** 0.5)  # Prevent division by zero
 
         # Normalize direction and apply speed
-        current_time = pg.time.get_ticks()
+        current_time = GameClock.get_ticks()
         if current_time - self.__spawn_time < self.__delay_time:
             return
 
@@ -62,7 +70,7 @@ class Zombie:
         self.attack(player)
 
     def attack(self, player):
-        current_time = pg.time.get_ticks()
+        current_time = GameClock.get_ticks()
         if current_time - self.__last_attack_time >= 1000:
             if self.__zombie_rect.colliderect(player.get_rect()):
                 player.take_damage(10)
@@ -77,6 +85,127 @@ class Zombie:
     def set_screen(self, screen):
         self.screen = screen
 
-    def draw(self):
+    def draw(self, alpha=1.0):
+        """Draw the zombie, interpolated by alpha between the last two simulation steps."""
         if self.screen:
-            self.screen.blit(self.__image, self.__zombie_rect)
+            (prev_x, prev_y), (x, y) = self.__previous_position, self.__zombie_rect.topleft
+            position = (round(prev_x + (x - prev_x) * alpha), round(prev_y + (y - prev_y) * alpha))
+            return self.screen.blit(self.__image, position)
+
+
+class ZombieHorde:
+    """Every zombie of a session, stored as NumPy arrays and moved in one vectorized step.
+
+    Row i of each array is zombie i: position, the position at the start of
+    the last step (for interpolated drawing), spawn time, spawn delay and
+    last attack time. step() chases, masks zombies still waiting to spawn
+    and checks attack cooldowns for the whole horde without a Python loop
+    per zombie.
+    """
+
+    def __init__(self, count=None):
+        self.__count = Config.get_config('ZOMBIE_COUNT') if count is None else count
+        self.__size = Config.get_config('ZOMBIE_SIZE')
+        self.__image = Config.get_asset("images/Zombie_1/Walk_still.png", self.__size)
+        self.__rng = None  # Drawn from random in reset(), so random.seed() makes spawns reproducible
+        self.screen = None
+
+        self.__positions = np.zeros((self.__count, 2))
+        self.__previous_positions = np.zeros((self.__count, 2))
+        self.__speeds = np.full(self.__count, float(Config.get_config('ZOMBIE_SPEED')))
+        self.__spawn_times = np.zeros(self.__count, dtype=np.int64)
+        self.__delays = np.zeros(self.__count, dtype=np.int64)
+        self.__last_attack_times = np.zeros(self.__count, dtype=np.int64)
+        self.reset()
+
+    def reset(self):
+        """Respawn the whole horde off screen; zombie i starts chasing after SPAWN_DELAY + i * SPAWN_STAGGER."""
+        self.__rng = np.random.default_rng(random.getrandbits(64))
+        self.__positions[:] = self.spawn_offscreen(Config.get_config('WIN_SIZE_W'), Config.get_config('WIN_SIZE_H'))
+        self.__previous_positions[:] = self.__positions
+        self.__spawn_times[:] = GameClock.get_ticks()
+        self.__delays[:] = (Config.get_config('ZOMBIE_SPAWN_DELAY') +
+                            np.arange(self.__count) * Config.get_config('ZOMBIE_SPAWN_STAGGER'))
+        self.__last_attack_times[:] = 0
+
+    def spawn_offscreen(self, screen_width, screen_height):
+        """Random positions just outside each side of the screen, one row per zombie."""
+        count = self.__count
+        side = self.__rng.integers(0, 4, count)  # 0 left, 1 right, 2 top, 3 bottom
+        along_x = self.__rng.integers(0, screen_width + 1, count)
+        along_y = self.__rng.integers(0, screen_height + 1, count)
+
+        positions = np.empty((count, 2))
+        positions[:, 0] = np.select([side == 0, side == 1], [-50, screen_width + 50], along_x)
+        positions[:, 1] = np.select([side == 2, side == 3], [-50, screen_height + 50], along_y)
+        return positions
+
+    def step(self, player, grid=None, flow_field=None):
+        """Move every spawned zombie towards the player and let those touching it attack.
+        With a FlowField (already updated for the player), zombies walk to their next
+        waypoint around obstacles; those on the player's tile or without a path head
+        straight for the player. With a SpatialGrid, the new positions are filed in it
+        as the 'zombie' layer. Returns the number of zombies that hit the player this step."""
+        current_time = GameClock.get_ticks()
+        positions = self.__positions
+        self.__previous_positions[:] = positions
+        width, height = self.__size
+
+        target = np.asarray(player.get_position(), dtype=float)
+        if flow_field is not None:
+            # Waypoints are tile centres, so steer the middle of the zombie onto them
+            half_size = np.array((width / 2, height / 2))
+            waypoints, on_path = flow_field.sample(positions + half_size)
+            target = np.where(on_path[:, None], waypoints - half_size, target)
+        else:
+            on_path = np.zeros(self.__count, dtype=bool)
+
+        # Direction to the target, scaled to each zombie's speed. Only the final approach to the
+        # player is clamped so nobody overshoots; waypoints move on as soon as a tile is reached.
+        delta = target - positions
+        distance = np.maximum(np.hypot(delta[:, 0], delta[:, 1]), 0.1)  # Prevent division by zero
+        scale = self.__speeds / distance
+        scale = np.where(on_path, scale, np.minimum(scale, 1.0))
+
+        # Zombies still inside their spawn delay stay where they are
+        spawned = current_time - self.__spawn_times >= self.__delays
+        positions += delta * (scale * spawned)[:, None]
+
+        # Overlap with the player's rect, for the zombies whose attack has cooled down
+        rect = player.get_rect()
+        # One vectorized test over the horde is cheaper than a grid lookup for a single rect
+        touching = ((positions[:, 0] < rect.right) & (positions[:, 0] + width > rect.left) &
+                    (positions[:, 1] < rect.bottom) & (positions[:, 1] + height > rect.top))
+        hits = touching & (current_time - self.__last_attack_times >= Config.get_config('ZOMBIE_ATTACK_COOLDOWN'))
+
+        if grid is not None:
+            grid.set_layer('zombie', positions, width, height)
+
+        hit_count = int(np.count_nonzero(hits))
+        if hit_count:
+            self.__last_attack_times[hits] = current_time
+            player.take_damage(Config.get_config('ZOMBIE_DAMAGE') * hit_count)
+        return hit_count
+
+    def get_positions(self):
+        """(N, 2) array of zombie top-left corners. Read only."""
+        return self.__positions
+
+    def get_count(self):
+        return self.__count
+
+    def get_nbytes(self):
+        """Bytes held by the per-zombie arrays."""
+        return sum(array.nbytes for array in (self.__positions, self.__previous_positions, self.__speeds,
+                                              self.__spawn_times, self.__delays, self.__last_attack_times))
+
+    def set_screen(self, screen):
+        self.screen = screen
+
+    def draw(self, alpha=1.0):
+        """Draw the horde, interpolated by alpha between the last two simulation steps."""
+        if not self.screen or not self.__count:
+            return None
+        previous = self.__previous_positions
+        drawn_at = np.rint(previous + (self.__positions - previous) * alpha).astype(int).tolist()
+        return self.screen.blits([(self.__image, position) for position in drawn_at])
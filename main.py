@@ -1,5 +1,15 @@
+from file_game.cooking_startup import StartupTimer
+
+# Import game modules one by one so the startup report shows where the time goes
+for module_name in ('pygame', 'file_game.cooking_config', 'file_game.cooking_ui', 'file_game.cooking_ingredients',
+                    'file_game.cooking_menu', 'file_game.cooking_tool', 'file_game.cooking_chef',
+                    'file_game.cooking_zombie', 'file_game.cooking_served', 'file_game.cooking_groceries',
+                    'file_game.cooking_app'):
+    StartupTimer.import_module(module_name)
+
 from file_game.cooking_app import *
 
 if __name__ == '__main__':
-    app = GameApp()
+    with StartupTimer.measure('GameApp()'):
+        app = GameApp()
     app.run()